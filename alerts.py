@@ -0,0 +1,229 @@
+import os
+import queue
+import smtplib
+import threading
+import time
+from datetime import datetime
+from email.message import EmailMessage
+
+import requests
+
+import metrics
+
+# --- Signal-Change Alerts ---
+# Turns the stream of strategy results into transition events (Hold -> Buy,
+# Buy -> Sell, ...) per (symbol, strategy, interval). A new signal has to be
+# seen `confirm` times in a row before it counts, which absorbs flapping
+# around an EMA crossover, and `cooldown` seconds must pass between two
+# alerts for the same key. Events are queued to one worker thread per sink
+# and delivered in batches, so a slow SMTP server or webhook never blocks the
+# polling loop that publishes them.
+# Sinks are configured from the environment (see sinks_from_env) or passed in.
+
+
+class Debouncer:
+    def __init__(self, confirm=2, cooldown=0, clock=time.monotonic):
+        self.confirm = max(1, confirm)
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = {}
+
+    # Returns (previous, new) when `signal` is a confirmed transition, else None.
+    # The first signal seen for a key is the baseline, not a transition.
+    def observe(self, key, signal):
+        now = self.clock()
+        state = self.state.get(key)
+        if state is None:
+            self.state[key] = {"signal": signal, "pending": None, "count": 0, "emitted": None}
+            return None
+        if signal == state["signal"]:
+            state["pending"], state["count"] = None, 0
+            return None
+        if signal == state["pending"]:
+            state["count"] += 1
+        else:
+            state["pending"], state["count"] = signal, 1
+        if state["count"] < self.confirm:
+            return None
+        if state["emitted"] is not None and now - state["emitted"] < self.cooldown:
+            return None
+        previous = state["signal"]
+        state.update(signal=signal, pending=None, count=0, emitted=now)
+        return previous, signal
+
+
+# --- Sinks ---
+# A sink is anything with send(events) (or a plain callable) taking a list of event dicts
+class WebhookSink:
+    def __init__(self, url, timeout=10, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+
+    def send(self, events):
+        payload = [{**event, "Time": event["Time"].isoformat()} for event in events]
+        response = self.session.post(self.url, json={"events": payload}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class SMTPSink:
+    def __init__(self, host, port=25, sender="alerts@localhost", recipients=(), username=None, password=None,
+                 starttls=False, timeout=10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def send(self, events):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        if len(events) == 1:
+            message["Subject"] = f"{events[0]['Symbol']}: {events[0]['From']} -> {events[0]['To']}"
+        else:
+            message["Subject"] = f"{len(events)} signal changes"
+        message.set_content("\n".join(format_event(event) for event in events))
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+
+
+def format_event(event):
+    return (f"{event['Time']:%Y-%m-%d %H:%M:%S} {event['Symbol']} {event['Strategy']} ({event['Interval']}): "
+            f"{event['From']} -> {event['To']} | Target: {event['Target Price']} | Stop-Loss: {event['Stop Loss']}")
+
+
+# ALERT_WEBHOOK_URL and/or ALERT_SMTP_HOST + ALERT_EMAIL_TO (comma separated)
+def sinks_from_env(environ=os.environ):
+    sinks = []
+    if environ.get("ALERT_WEBHOOK_URL"):
+        sinks.append(WebhookSink(environ["ALERT_WEBHOOK_URL"]))
+    if environ.get("ALERT_SMTP_HOST") and environ.get("ALERT_EMAIL_TO"):
+        sinks.append(SMTPSink(
+            environ["ALERT_SMTP_HOST"], int(environ.get("ALERT_SMTP_PORT", 25)),
+            sender=environ.get("ALERT_EMAIL_FROM", "alerts@localhost"),
+            recipients=[r.strip() for r in environ["ALERT_EMAIL_TO"].split(",") if r.strip()],
+            username=environ.get("ALERT_SMTP_USER"), password=environ.get("ALERT_SMTP_PASSWORD"),
+            starttls=environ.get("ALERT_SMTP_STARTTLS", "").lower() in ("1", "true", "yes")))
+    return sinks
+
+
+# Queue + thread per sink; collects up to `batch_size` events or `flush_seconds` before sending
+class _SinkWorker:
+    def __init__(self, sink, batch_size, flush_seconds, max_queue):
+        self.sink = sink
+        self.send = getattr(sink, "send", sink)
+        self.name = type(sink).__name__
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue = queue.Queue(max_queue)
+        self.thread = threading.Thread(target=self._run, name=f"alerts-{self.name}", daemon=True)
+        self.thread.start()
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            metrics.count("alerts.dropped")
+            print(f"Error queueing alert for {self.name}: queue full")
+
+    def _run(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                self.queue.task_done()
+                return
+            batch = [event]
+            stop = False
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    event = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if event is None:
+                    stop = True
+                    break
+                batch.append(event)
+            try:
+                with metrics.span(f"alerts.send.{self.name}"):
+                    self.send(batch)
+                metrics.count("alerts.sent", len(batch))
+            except Exception as e:
+                metrics.count("alerts.failed", len(batch))
+                print(f"Error sending {len(batch)} alert(s) via {self.name}: {e}")
+            for _ in range(len(batch) + stop):
+                self.queue.task_done()
+            if stop:
+                return
+
+
+class AlertBus:
+    def __init__(self, sinks=(), confirm=2, cooldown=0, batch_size=50, flush_seconds=5, max_queue=10_000):
+        self.debouncer = Debouncer(confirm, cooldown)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_queue = max_queue
+        self.workers = []
+        self.subscribers = []
+        self._lock = threading.Lock()
+        for sink in sinks:
+            self.add_sink(sink)
+
+    def add_sink(self, sink):
+        with self._lock:
+            self.workers.append(_SinkWorker(sink, self.batch_size, self.flush_seconds, self.max_queue))
+
+    # In-process listeners (e.g. a UI feed), called synchronously with each event
+    def subscribe(self, callback):
+        with self._lock:
+            self.subscribers.append(callback)
+
+    # Feed one strategy result; returns the event if it was a confirmed transition
+    def publish(self, symbol, strategy, interval, result):
+        signal, target_price, stop_loss = result
+        with self._lock:
+            change = self.debouncer.observe((symbol, strategy, interval), signal)
+            if change is None:
+                return None
+            event = {
+                "Time": datetime.now(), "Symbol": symbol, "Strategy": strategy, "Interval": interval,
+                "From": change[0], "To": change[1], "Target Price": target_price, "Stop Loss": stop_loss,
+            }
+            workers, subscribers = list(self.workers), list(self.subscribers)
+        metrics.count("alerts.published")
+        for worker in workers:
+            worker.put(event)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in alert subscriber: {e}")
+        return event
+
+    # Block until everything queued so far has been handed to the sinks
+    def flush(self):
+        for worker in list(self.workers):
+            worker.queue.join()
+
+    def close(self):
+        with self._lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.queue.put(None)
+        for worker in workers:
+            worker.thread.join()
+
+
+# Process-wide bus the scheduler publishes to
+bus = AlertBus(sinks_from_env())
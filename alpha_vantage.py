@@ -0,0 +1,145 @@
+import codecs
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+# --- Alpha Vantage Time-Series Ingestion ---
+# Turns TIME_SERIES_* payloads into a date-sorted OHLCV frame with typed
+# columns. All numeric strings are converted in one NumPy call and all dates
+# in another, instead of per-row float() and list appends, and the
+# newest-first order Alpha Vantage uses is flipped once so slicing by date
+# works on a monotonic index.
+# parse_time_series_stream() decodes the payload entry by entry from text or
+# byte chunks (e.g. response.iter_content), so a full-size output never has
+# to be held as a nested dict.
+
+# "4. close" -> "Close"
+COLUMN_NAMES = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "adjusted close": "Adj Close",
+    "volume": "Volume",
+    "dividend amount": "Dividend",
+    "split coefficient": "Split",
+}
+
+_ENTRY_KEY = re.compile(r'\s*,?\s*"([^"]+)"\s*:\s*')
+_BLOCK = 50_000
+
+
+def column_name(field):
+    name = field.split(". ", 1)[-1]
+    return COLUMN_NAMES.get(name, name.title())
+
+
+def _series_key(payload):
+    for key in payload:
+        if key.startswith("Time Series"):
+            return key
+    return None
+
+
+# Flat list of numeric strings -> (rows, columns) float array in one pass
+def _to_float_block(values, columns):
+    return np.array(values, dtype=float).reshape(-1, columns)
+
+
+def _to_frame(dates, blocks, fields):
+    index = pd.DatetimeIndex(np.array(dates, dtype="datetime64[s]"), name="Date")
+    values = np.concatenate(blocks) if blocks else np.empty((0, len(fields)))
+    if len(index) > 1 and not index.is_monotonic_increasing:
+        if index.is_monotonic_decreasing:
+            index, values = index[::-1], values[::-1]
+        else:
+            order = np.argsort(index.asi8, kind="stable")
+            index, values = index[order], values[order]
+    return pd.DataFrame(np.ascontiguousarray(values), index=index, columns=[column_name(f) for f in fields])
+
+
+# Already-decoded payload (dict) -> OHLCV frame, or None for error/limit responses
+def parse_time_series(payload):
+    key = _series_key(payload)
+    if key is None:
+        return None
+    series = payload[key]
+    if not series:
+        return _to_frame([], [], [])
+    fields = list(next(iter(series.values())))
+    values = [value for entry in series.values() for value in entry.values()]
+    if len(values) != len(series) * len(fields):
+        raise ValueError("Alpha Vantage entries do not all have the same fields")
+    return _to_frame(list(series), [_to_float_block(values, len(fields))], fields)
+
+
+# Incremental decode from an iterable of str/bytes chunks
+def parse_time_series_stream(chunks):
+    chunks = iter(chunks)
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    decoder = json.JSONDecoder()
+    state = {"buf": "", "pos": 0}
+
+    def more():
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        if isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk)
+        state["buf"] = state["buf"][state["pos"]:] + chunk
+        state["pos"] = 0
+        return True
+
+    # Skip "Meta Data" up to the opening brace of the time series object
+    while True:
+        buf = state["buf"]
+        start = buf.find('"Time Series')
+        brace = buf.find("{", start) if start >= 0 else -1
+        if brace >= 0:
+            state["pos"] = brace + 1
+            break
+        # Keep enough tail that a header split across chunks is still found
+        state["pos"] = max(0, len(buf) - 64) if start < 0 else start
+        if not more():
+            return None
+
+    dates, blocks, values, fields = [], [], [], None
+    while True:
+        buf, pos = state["buf"], state["pos"]
+        match = _ENTRY_KEY.match(buf, pos)
+        if match is not None and match.end() < len(buf):
+            try:
+                entry, end = decoder.raw_decode(buf, match.end())
+            except json.JSONDecodeError:
+                if not more():
+                    raise
+                continue
+            if fields is None:
+                fields = list(entry)
+            elif len(entry) != len(fields):
+                raise ValueError("Alpha Vantage entries do not all have the same fields")
+            dates.append(match.group(1))
+            values.extend(entry.values())
+            state["pos"] = end
+            if len(values) >= _BLOCK * len(fields):
+                blocks.append(_to_float_block(values, len(fields)))
+                values = []
+            continue
+
+        rest = buf[pos:].lstrip()
+        if rest.startswith("}"):
+            break
+        if not more():
+            raise ValueError("Alpha Vantage time series ended unexpectedly")
+
+    if values:
+        blocks.append(_to_float_block(values, len(fields)))
+    return _to_frame(dates, blocks, fields or [])
+
+
+# Rows between start and end (either may be None) on the sorted index
+def slice_range(frame, start=None, end=None):
+    return frame.loc[pd.Timestamp(start) if start is not None else None:
+                     pd.Timestamp(end) if end is not None else None]
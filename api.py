@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs
+
+import metrics
+from memo import memoize
+from resample import INTERVALS, max_days
+from strategies import PROFILES, STRATEGIES
+
+# --- Signal API ---
+# Plain ASGI app serving the same registered strategies as the Streamlit
+# scripts to any number of HTTP clients:
+#   GET /signals/BTC-USD?strategy=intraday&interval=1d&days=30
+#   GET /signals?symbols=BTC-USD,GC=F,BTC/XAU&strategy=Long-term
+#   GET /bars/GC=F?interval=1h&days=30&points=1200
+#   GET /stream?symbols=BTC-USD,GC=F&strategy=intraday   (Server-Sent Events)
+#   GET /health
+# Bars are cached process-wide per (symbol, interval, days) for
+# MARKET_API_REFRESH seconds, and concurrent requests for the same key share
+# one in-flight fetch, so hundreds of clients polling a symbol cost about one
+# upstream fetch per refresh. Strategy results are memoized by data
+# fingerprint, and each stream topic is polled by one task however many
+# clients listen, with an event pushed only when the result changes.
+#   uvicorn api:app --host 0.0.0.0 --port 8000     or     python api.py --port 8000
+
+REFRESH_SECONDS = float(os.environ.get("MARKET_API_REFRESH", "60"))
+HEARTBEAT_SECONDS = 15
+MAX_DAYS = 3650
+
+# Run on a copy so the shared cached bars never get indicator columns added
+_strategies = {name: memoize(lambda data, func=func: func(data.copy()), name) for name, func in STRATEGIES.items()}
+
+
+# Registered name ("gold_intraday") or script label ("Long-term") within `profile`
+def resolve_strategy(name, profile="default"):
+    if name in STRATEGIES:
+        return name
+    labels = PROFILES.get(profile, {})
+    if name in labels:
+        return labels[name]
+    raise ValueError(f"Unknown strategy: {name}")
+
+
+class BarFeed:
+    def __init__(self, fetch=None, ttl=REFRESH_SECONDS, maxsize=1024):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # key -> (fetched at, version, bars)
+        self.in_flight = {}
+        self._versions = itertools.count(1)
+
+    def _fetch(self, symbol, interval, days):
+        fetch = self.fetch
+        if fetch is None:
+            from data import get_resampled_data as fetch
+        end = datetime.now()
+        return fetch(symbol, end - timedelta(days=days), end, interval)
+
+    # (version, bars); one fetch per key per `ttl`, concurrent callers await the same
+    # one, and a failed refresh keeps serving the previous bars
+    async def get(self, symbol, interval="1d", days=30):
+        key = (symbol, interval, days)
+        entry = self.entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            metrics.count("api.bars.hit")
+            return entry[1], entry[2]
+        task = self.in_flight.get(key)
+        if task is not None:
+            metrics.count("api.bars.coalesced")
+        else:
+            metrics.count("api.bars.fetch")
+            # The fetch is a task of its own, so a caller that is cancelled (an SSE
+            # poll on unsubscribe) neither aborts it nor leaves the others waiting
+            task = self.in_flight[key] = asyncio.ensure_future(self._refresh(key, entry))
+            # Retrieve the exception even if every caller is gone, so it is not logged as lost
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return await asyncio.shield(task)
+
+    async def _refresh(self, key, entry):
+        symbol, interval, days = key
+        try:
+            try:
+                bars = await asyncio.get_running_loop().run_in_executor(
+                    None, self._fetch, symbol, interval, days)
+            except Exception as e:
+                if entry is None:
+                    raise
+                print(f"Error refreshing {symbol} bars, serving cached: {e}")
+                bars = None
+            if (bars is None or bars.empty) and entry is not None and not entry[2].empty:
+                value = entry[1], entry[2]
+            else:
+                value = next(self._versions), bars
+            self.entries[key] = (time.monotonic(), *value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return value
+        finally:
+            del self.in_flight[key]
+
+
+class SignalService:
+    def __init__(self, fetch=None, ttl=REFRESH_SECONDS):
+        self.feed = BarFeed(fetch, ttl)
+        self.topics = {}  # (symbol, strategy, interval, days) -> {"queues", "last", "task"}
+        self.responses = OrderedDict()
+
+    async def bars(self, symbol, interval="1d", days=30):
+        version, bars = await self.feed.get(symbol, interval, days)
+        if bars is None or bars.empty:
+            raise LookupError(f"No data for {symbol}")
+        return version, bars
+
+    async def signal(self, symbol, strategy="intraday", interval="1d", days=30):
+        _, bars = await self.bars(symbol, interval, days)
+        signal, target_price, stop_loss = _strategies[strategy](bars)
+        return {
+            "Symbol": symbol, "Strategy": strategy, "Interval": interval,
+            "Bar": bars.index[-1].isoformat(), "Price": float(bars["Close"].iloc[-1]),
+            "Signal": signal, "Target Price": target_price, "Stop Loss": stop_loss,
+        }
+
+    # Serialized bars, rendered once per fetched version; `points` downsamples as the charts do
+    async def bars_json(self, symbol, interval="1d", days=30, points=None):
+        version, bars = await self.bars(symbol, interval, days)
+        key = (symbol, interval, days, points, version)
+        body = self.responses.get(key)
+        if body is not None:
+            metrics.count("api.render.hit")
+            return body
+        import chart
+
+        frame = bars[[column for column in ("Open", "High", "Low", "Close", "Volume") if column in bars]]
+        if points:
+            frame = frame.loc[chart.cache.get(symbol, bars, points).index]
+        body = (f'{{"Symbol": {json.dumps(symbol)}, "Interval": {json.dumps(interval)}, '
+                f'"Count": {len(bars)}, "Bars": {frame.to_json(orient="split", date_format="iso")}}}').encode()
+        self.responses[key] = body
+        while len(self.responses) > 256:
+            self.responses.popitem(last=False)
+        return body
+
+    # --- Streaming topics ---
+    def subscribe(self, key, queue):
+        topic = self.topics.get(key)
+        if topic is None:
+            topic = self.topics[key] = {"queues": set(), "last": None}
+            topic["task"] = asyncio.create_task(self._poll(key, topic))
+        topic["queues"].add(queue)
+        if topic["last"] is not None:
+            _offer(queue, topic["last"])
+
+    def unsubscribe(self, key, queue):
+        topic = self.topics.get(key)
+        if topic is None:
+            return
+        topic["queues"].discard(queue)
+        if not topic["queues"]:
+            topic["task"].cancel()
+            del self.topics[key]
+
+    async def _poll(self, key, topic):
+        while True:
+            try:
+                result = await self.signal(*key)
+            except Exception as e:
+                print(f"Error streaming {key[0]} {key[1]}: {e}")
+                result = None
+            if result is not None and result != topic["last"]:
+                topic["last"] = result
+                metrics.count("api.stream.event")
+                for queue in topic["queues"]:
+                    _offer(queue, result)
+            await asyncio.sleep(self.feed.ttl)
+
+    def close(self):
+        for topic in self.topics.values():
+            topic["task"].cancel()
+        self.topics.clear()
+
+
+# Slow clients lose their oldest pending event rather than growing the queue
+def _offer(queue, item):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+def _query(scope):
+    return {name: values[-1] for name, values in parse_qs(scope.get("query_string", b"").decode()).items()}
+
+
+def _options(query):
+    strategy = resolve_strategy(query.get("strategy", "intraday"), query.get("profile", "default"))
+    interval = query.get("interval", "1d")
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval: {interval}")
+    days = int(query.get("days", 30))
+    limit = min(MAX_DAYS, max_days(interval) or MAX_DAYS)
+    if not 1 <= days <= limit:
+        raise ValueError(f"days must be between 1 and {limit} for {interval} bars")
+    return strategy, interval, days
+
+
+def _symbols(query):
+    symbols = [symbol.strip() for symbol in query.get("symbols", "").split(",") if symbol.strip()]
+    if not symbols:
+        raise ValueError("symbols is required, e.g. ?symbols=BTC-USD,GC=F")
+    return symbols
+
+
+async def _send(send, status, body, content_type=b"application/json"):
+    if not isinstance(body, bytes):
+        body = json.dumps(body, default=str).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _disconnected(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+class SignalAPI:
+    def __init__(self, service=None):
+        self.service = service or SignalService()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+        if scope["method"] != "GET":
+            return await _send(send, 405, {"Error": "Only GET is supported"})
+
+        path = scope["path"].rstrip("/") or "/"
+        query = _query(scope)
+        metrics.count("api.request")
+        try:
+            if path == "/health":
+                return await _send(send, 200, {"Status": "ok", "Topics": len(self.service.topics),
+                                               "Cached": len(self.service.feed.entries)})
+            if path == "/stream":
+                return await self._stream(receive, send, _symbols(query), _options(query))
+            if path == "/signals":
+                return await self._signals(send, _symbols(query), _options(query))
+            if path.startswith("/signals/"):
+                strategy, interval, days = _options(query)
+                return await _send(send, 200, await self.service.signal(path[9:], strategy, interval, days))
+            if path.startswith("/bars/"):
+                _, interval, days = _options(query)
+                points = int(query["points"]) if query.get("points") else None
+                return await _send(send, 200, await self.service.bars_json(path[6:], interval, days, points))
+            return await _send(send, 404, {"Error": f"Not found: {path}"})
+        except ValueError as e:
+            return await _send(send, 400, {"Error": str(e)})
+        except LookupError as e:
+            return await _send(send, 404, {"Error": str(e)})
+        except Exception as e:
+            print(f"Error serving {path}: {e}")
+            return await _send(send, 500, {"Error": str(e)})
+
+    async def _signals(self, send, symbols, options):
+        results = await asyncio.gather(*(self.service.signal(symbol, *options) for symbol in symbols),
+                                       return_exceptions=True)
+        rows = [{"Symbol": symbol, "Error": str(result)} if isinstance(result, Exception) else result
+                for symbol, result in zip(symbols, results)]
+        return await _send(send, 200, rows)
+
+    # One event per result change of every requested symbol, comments as keep-alive
+    async def _stream(self, receive, send, symbols, options):
+        queue = asyncio.Queue(maxsize=100)
+        keys = [(symbol, *options) for symbol in symbols]
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache"), (b"x-accel-buffering", b"no")]})
+        for key in keys:
+            self.service.subscribe(key, queue)
+        metrics.count("api.stream.open")
+        gone = asyncio.ensure_future(_disconnected(receive))
+        try:
+            while True:
+                item = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({item, gone}, timeout=HEARTBEAT_SECONDS,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if gone in done:
+                    item.cancel()
+                    return
+                if item in done:
+                    chunk = f"event: signal\ndata: {json.dumps(item.result(), default=str)}\n\n".encode()
+                else:
+                    item.cancel()
+                    chunk = b": keep-alive\n\n"
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        except OSError:
+            return
+        finally:
+            gone.cancel()
+            for key in keys:
+                self.service.unsubscribe(key, queue)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.service.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+# Process-wide app: every connection shares one bar cache and one set of stream topics
+app = SignalAPI()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve signals, target / stop-loss levels and bars over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--refresh", type=float, default=REFRESH_SECONDS, help="Seconds bars are reused for")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    app.service.feed.ttl = args.refresh
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
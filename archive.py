@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within the process
+    fcntl = None
+
+# --- Memory-Mapped Bar Archive ---
+# Append-only history shared by every process on the machine. Each
+# (symbol, interval) is one flat file of fixed-size records (time + OHLCV)
+# sorted by time, so the time column is the index: readers np.memmap the
+# file read-only and binary-search it, and every process maps the same page
+# cache pages instead of holding its own copy. Opening is O(1) in file size.
+# Only closed bars are appended; a record once written never changes.
+#   python archive.py BTC-USD GC=F --interval 1m --days 7
+
+ARCHIVE_DIR = os.environ.get(
+    "MARKET_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bar_archive"),
+)
+
+RECORD = np.dtype([("time", "<i8"), ("Open", "<f8"), ("High", "<f8"), ("Low", "<f8"),
+                   ("Close", "<f8"), ("Volume", "<f8")])
+COLUMNS = RECORD.names[1:]
+
+_lock = threading.Lock()
+
+
+# Record time of a bound: tz-aware archives store UTC, so a naive bound
+# (datetime.now(), a date from the UI) is taken as local time and converted to
+# UTC; naive archives store wall-clock times, compared as they are
+def _time_value(ts, tz):
+    ts = pd.Timestamp(ts)
+    if tz is None:
+        return (ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts).value
+    if ts.tzinfo is None:
+        ts = pd.Timestamp(ts.to_pydatetime().astimezone())
+    return ts.value
+
+
+# Read-only window over an archive file; slicing and columns are views, not copies
+class ArchiveView:
+    def __init__(self, records, tz=None):
+        self.records = records
+        self.tz = tz
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def time(self):
+        return self.records["time"]
+
+    def __getitem__(self, column):
+        return self.records[column]
+
+    def _position(self, ts, side):
+        return int(np.searchsorted(self.records["time"], _time_value(ts, self.tz), side))
+
+    def slice(self, start=None, end=None):
+        lo = 0 if start is None else self._position(start, "left")
+        hi = len(self) if end is None else self._position(end, "right")
+        return ArchiveView(self.records[lo:hi], self.tz)
+
+    def tail(self, n):
+        return ArchiveView(self.records[-n:], self.tz)
+
+    # Copy into a regular OHLCV frame (strategies add columns to what they get)
+    def to_frame(self):
+        index = pd.DatetimeIndex(np.asarray(self.records["time"]).view("datetime64[ns]"), name="Date")
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return pd.DataFrame({column: np.array(self.records[column]) for column in COLUMNS}, index=index)
+
+
+class Archive:
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+
+    def _paths(self, symbol, interval):
+        name = "".join(c if c.isalnum() or c in "-_" else "_" for c in symbol)
+        base = os.path.join(self.root, f"{name}__{interval}")
+        return base + ".bars", base + ".json"
+
+    def _meta(self, symbol, interval):
+        meta_path = self._paths(symbol, interval)[1]
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def last_time(self, symbol, interval="1d"):
+        view = self.open(symbol, interval)
+        if view is None or len(view) == 0:
+            return None
+        return int(view.time[-1])
+
+    # Append bars newer than the last stored one (and older than `until`, to
+    # leave a still-forming bar out); returns the number of records written
+    def append(self, symbol, bars, interval="1d", until=None):
+        if bars is None or bars.empty:
+            return 0
+        bars_path, meta_path = self._paths(symbol, interval)
+        index = pd.DatetimeIndex(bars.index)
+        tz = str(index.tz) if index.tz is not None else None
+        times = (index.tz_convert("UTC").tz_localize(None) if tz else index).as_unit("ns").asi8
+
+        os.makedirs(self.root, exist_ok=True)
+        with _lock, open(bars_path, "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                size = f.seek(0, os.SEEK_END)
+                count = size // RECORD.itemsize
+                if size % RECORD.itemsize:
+                    # Torn write from a crashed appender: drop the partial record
+                    f.truncate(count * RECORD.itemsize)
+                    f.seek(0, os.SEEK_END)
+                keep = np.ones(len(times), dtype=bool)
+                if count:
+                    last = np.memmap(bars_path, dtype=RECORD, mode="r", offset=(count - 1) * RECORD.itemsize,
+                                     shape=(1,))["time"][0]
+                    keep &= times > last
+                if until is not None:
+                    keep &= times < _time_value(until, tz)
+                keep &= bars["Close"].notna().to_numpy()
+                if not keep.any():
+                    return 0
+
+                records = np.zeros(int(keep.sum()), dtype=RECORD)
+                records["time"] = times[keep]
+                for column in COLUMNS:
+                    if column in bars:
+                        records[column] = bars[column].to_numpy(dtype=float)[keep]
+                    else:
+                        records[column] = np.nan
+                if np.any(np.diff(records["time"]) <= 0):
+                    raise ValueError(f"Bars for {symbol} are not sorted by time")
+                f.write(records.tobytes())
+                f.flush()
+                if count == 0 and not os.path.exists(meta_path):
+                    with open(meta_path, "w") as meta:
+                        json.dump({"symbol": symbol, "interval": interval, "tz": tz}, meta)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        metrics.count("archive.appended", len(records))
+        return len(records)
+
+    # Map the archive read-only; records appended later need a new open()
+    def open(self, symbol, interval="1d"):
+        bars_path = self._paths(symbol, interval)[0]
+        if not os.path.exists(bars_path):
+            return None
+        count = os.path.getsize(bars_path) // RECORD.itemsize
+        tz = self._meta(symbol, interval).get("tz")
+        if count == 0:
+            return ArchiveView(np.zeros(0, dtype=RECORD), tz)
+        return ArchiveView(np.memmap(bars_path, dtype=RECORD, mode="r", shape=(count,)), tz)
+
+    def read(self, symbol, start=None, end=None, interval="1d"):
+        view = self.open(symbol, interval)
+        if view is None:
+            return None
+        return view.slice(start, end).to_frame()
+
+
+# Fill the archive from the bar cache / provider, keeping the forming bar out
+def update_archive(archive, symbol, start, end, interval="1d"):
+    from data import get_price_data
+    from resample import INTERVALS
+
+    view = archive.open(symbol, interval)
+    if view is not None and len(view) and int(view.time[-1]) > _time_value(start, view.tz):
+        # Resume at the last record, as a naive time in the bars' own zone (how
+        # the bar cache reads naive bounds)
+        last = pd.Timestamp(int(view.time[-1]))
+        start = last if view.tz is None else last.tz_localize("UTC").tz_convert(view.tz).tz_localize(None)
+    bars = get_price_data(symbol, start=start, end=end, interval=interval)
+    until = pd.Timestamp.now(tz="UTC").floor(INTERVALS.get(interval, interval))
+    return archive.append(symbol, bars, interval, until=until)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append closed bars to the shared memory-mapped archive.")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--root", default=ARCHIVE_DIR)
+    args = parser.parse_args(argv)
+
+    archive = Archive(args.root)
+    end = datetime.now()
+    for symbol in args.symbols:
+        try:
+            added = update_archive(archive, symbol, end - timedelta(days=args.days), end, args.interval)
+            print(f"{symbol}: +{added} bars, {len(archive.open(symbol, args.interval))} archived")
+        except Exception as e:
+            print(f"Error archiving {symbol}: {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
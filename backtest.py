@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+from indicators import ema_array, rsi_array, atr_array
+from strategies import STRATEGY_PARAMS
+
+# --- Vectorized Backtester ---
+# Signal, target and stop-loss for every bar in one NumPy pass, then
+# target/stop-loss exits simulated over a bounded holding window.
+# Rule sets and their parameters come from the strategy registry.
+
+# Indicator line, reusing `cache` when many parameter sets share the same inputs
+def _line(cache, key, compute, *args):
+    if cache is None:
+        return compute(*args)
+    if key not in cache:
+        cache[key] = compute(*args)
+    return cache[key]
+
+
+# Direction (+1 Buy, -1 Sell, 0 Hold), target and stop-loss for every bar
+def signal_arrays(close, high, low, fast, slow, stop_loss_pct, profit_pct,
+                  rsi_period=None, atr_period=14, atr_threshold=None, cache=None):
+    fast_line = _line(cache, ("ema", fast), ema_array, close, fast)
+    slow_line = _line(cache, ("ema", slow), ema_array, close, slow)
+    buy = fast_line > slow_line
+    sell = fast_line < slow_line
+
+    if rsi_period:
+        rsi = _line(cache, ("rsi", rsi_period), rsi_array, close, rsi_period)
+        buy &= rsi > 50
+        sell &= rsi < 50
+    if atr_threshold:
+        atr = _line(cache, ("atr", atr_period), atr_array, high, low, close, atr_period)
+        active = atr >= close * atr_threshold
+        buy &= active
+        sell &= active
+
+    direction = buy.astype(np.int8) - sell.astype(np.int8)
+    target_price = close * (1 + direction * profit_pct)
+    stop_loss = close * (1 - direction * stop_loss_pct)
+    return direction, target_price, stop_loss
+
+
+# Frame with Signal / Target Price / Stop Loss per bar
+def signal_frame(data, strategy="intraday", **params):
+    close, high, low = ohlc_arrays(data)
+    direction, target_price, stop_loss = signal_arrays(close, high, low, **{**STRATEGY_PARAMS[strategy], **params})
+    return pd.DataFrame({
+        "Close": close,
+        "Signal": np.array(["Sell", "Hold", "Buy"])[direction + 1],
+        "Target Price": target_price,
+        "Stop Loss": stop_loss,
+    }, index=data.index)
+
+
+def ohlc_arrays(data):
+    close = data["Close"].to_numpy(dtype=float).ravel()
+    high = data["High"].to_numpy(dtype=float).ravel() if "High" in data else close
+    low = data["Low"].to_numpy(dtype=float).ravel() if "Low" in data else close
+    return close, high, low
+
+
+# First bar after each entry that touches its target or stop, within `max_holding` bars.
+# Returns (exit index, exit price, reason) per candidate; a bar touching both exits at the stop.
+def find_exits(entries, direction, target_price, stop_loss, close, high, low, max_holding=250, block=4096):
+    n = len(close)
+    exit_index = np.minimum(entries + max_holding, n - 1)
+    exit_price = close[exit_index]
+    reason = np.zeros(len(entries), dtype=np.int8)  # 0 timeout, 1 target, -1 stop
+
+    # Pad so every entry has a full window of following bars
+    pad = np.full(max_holding, np.nan)
+    future_high = np.lib.stride_tricks.sliding_window_view(np.concatenate((high[1:], pad)), max_holding)
+    future_low = np.lib.stride_tricks.sliding_window_view(np.concatenate((low[1:], pad)), max_holding)
+
+    long = direction[entries] > 0
+    # Most trades resolve quickly: scan a short window first, then the full one for the rest
+    pending = np.arange(len(entries))
+    for window in sorted({min(32, max_holding), max_holding}):
+        still_open = []
+        for s in range(0, len(pending), block):
+            pos = pending[s:s + block]
+            rows = entries[pos]
+            fh = future_high[rows, :window]
+            fl = future_low[rows, :window]
+            t = target_price[rows][:, None]
+            sl = stop_loss[rows][:, None]
+            is_long = long[pos][:, None]
+            # Longs exit up at the target and down at the stop; shorts the other way round
+            up = np.where(is_long, t, sl)
+            down = np.where(is_long, sl, t)
+            hit_up = fh >= up
+            hit_down = fl <= down
+            hit = hit_up | hit_down
+            first = hit.argmax(axis=1)
+            at = (np.arange(len(rows)), first)
+            any_hit = hit[at]
+            stopped = np.where(long[pos], hit_down[at], hit_up[at])
+
+            done = pos[any_hit]
+            exit_index[done] = rows[any_hit] + 1 + first[any_hit]
+            exit_price[done] = np.where(stopped[any_hit], stop_loss[rows[any_hit]], target_price[rows[any_hit]])
+            reason[done] = np.where(stopped[any_hit], -1, 1)
+            still_open.append(pos[~any_hit])
+        pending = np.concatenate(still_open) if still_open else pending[:0]
+    return exit_index, exit_price, reason
+
+
+def _max_drawdown(equity):
+    peak = np.maximum.accumulate(np.concatenate(([1.0], equity)))
+    return float(np.max(1 - np.concatenate(([1.0], equity)) / peak))
+
+
+# Headline numbers for a list of per-trade returns
+def summarize(pnl):
+    equity = np.cumprod(1 + pnl)
+    return {
+        "trades": len(pnl),
+        "total_return": float(equity[-1] - 1) if len(pnl) else 0.0,
+        "hit_rate": float(np.mean(pnl > 0)) if len(pnl) else 0.0,
+        "max_drawdown": _max_drawdown(equity) if len(pnl) else 0.0,
+    }
+
+
+# Simulate one position at a time: enter on a Buy/Sell bar when flat, leave on target/stop/timeout
+def run_backtest(close, high, low, direction, target_price, stop_loss, max_holding=250):
+    candidates = np.nonzero(direction)[0]
+    candidates = candidates[candidates < len(close) - 1]
+    if len(candidates) == 0:
+        return np.array([], dtype=int), np.array([], dtype=int), np.array([]), np.array([], dtype=np.int8)
+
+    exit_index, exit_price, reason = find_exits(
+        candidates, direction, target_price, stop_loss, close, high, low, max_holding)
+
+    # Chain non-overlapping trades; the walk is per trade, not per bar
+    taken = []
+    position = 0
+    while position < len(candidates):
+        taken.append(position)
+        position = np.searchsorted(candidates, exit_index[position], side="right")
+    taken = np.array(taken)
+
+    entries = candidates[taken]
+    side = direction[entries].astype(float)
+    pnl = side * (exit_price[taken] - close[entries]) / close[entries]
+    return entries, exit_index[taken], pnl, reason[taken]
+
+
+def backtest(data, strategy="intraday", max_holding=250, **params):
+    close, high, low = ohlc_arrays(data)
+    direction, target_price, stop_loss = signal_arrays(close, high, low, **{**STRATEGY_PARAMS[strategy], **params})
+    entries, exits, pnl, reason = run_backtest(close, high, low, direction, target_price, stop_loss, max_holding)
+
+    trades = pd.DataFrame({
+        "Entry": data.index[entries],
+        "Exit": data.index[exits],
+        "Side": np.where(direction[entries] > 0, "Buy", "Sell"),
+        "Entry Price": close[entries],
+        "Target Price": target_price[entries],
+        "Stop Loss": stop_loss[entries],
+        "Exit Reason": np.array(["Stop", "Timeout", "Target"])[reason + 1],
+        "PnL": pnl,
+    })
+    return summarize(pnl), trades
@@ -0,0 +1,183 @@
+import os
+import json
+import tempfile
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+import metrics
+
+# --- Local OHLCV Bar Store ---
+# Bars are kept on disk as one Parquet file per (symbol, interval) next to a
+# small JSON sidecar recording which time range has already been fetched.
+# Only the part of a request outside that range is asked from the provider.
+
+CACHE_DIR = os.environ.get(
+    "MARKET_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bar_cache"),
+)
+
+# One lock per cache file, shared by every BarCache in the process (Streamlit
+# builds a new one on each rerun). Held only while a file is read or written,
+# never across a provider call.
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path):
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+# Write through a uniquely named temp file in the same directory, then rename,
+# so readers never see half a file and concurrent writers never share a temp file
+def _replace(path, write):
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                               dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+# Default provider: Yahoo Finance (imported lazily so the cache works without it)
+def fetch_yahoo(symbol, start, end, interval="1d"):
+    import yfinance as yf
+
+    return yf.download(symbol, start=start, end=end, interval=interval,
+                       auto_adjust=True, progress=False)
+
+
+# yfinance returns (Price, Ticker) columns even for a single symbol
+def flatten_columns(frame):
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.copy()
+        frame.columns = frame.columns.get_level_values(0)
+    return frame
+
+
+# Make a timestamp comparable with the cached index (naive vs tz-aware)
+def _align(ts, index):
+    ts = pd.Timestamp(ts)
+    tz = getattr(index, "tz", None)
+    if tz is not None and ts.tzinfo is None:
+        return ts.tz_localize(tz)
+    if tz is None and ts.tzinfo is not None:
+        return ts.tz_convert(None)
+    return ts
+
+
+# Copy of the requested window; strategies add indicator columns to what they get
+def _slice(bars, start, end):
+    return bars.loc[_align(start, bars.index):_align(end, bars.index)].copy()
+
+
+class BarCache:
+    def __init__(self, fetch=fetch_yahoo, root=CACHE_DIR, refresh_seconds=60):
+        self.fetch = fetch
+        self.root = root
+        # Requests ending this close to the last fetched end are served from disk
+        self.refresh = pd.Timedelta(seconds=refresh_seconds)
+
+    def _paths(self, symbol, interval):
+        name = "".join(c if c.isalnum() or c in "-_" else "_" for c in symbol)
+        base = os.path.join(self.root, f"{name}__{interval}")
+        return base + ".parquet", base + ".json"
+
+    def load(self, symbol, interval="1d"):
+        bars_path, meta_path = self._paths(symbol, interval)
+        if not (os.path.exists(bars_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return pd.read_parquet(bars_path), meta
+
+    def _store(self, symbol, interval, bars, meta):
+        os.makedirs(self.root, exist_ok=True)
+        bars_path, meta_path = self._paths(symbol, interval)
+        _replace(bars_path, bars.to_parquet)
+
+        def write_meta(path):
+            with open(path, "w") as f:
+                json.dump(meta, f)
+
+        _replace(meta_path, write_meta)
+
+    def _fetch(self, symbol, start, end, interval):
+        frame = self.fetch(symbol, start, end, interval)
+        if frame is None or frame.empty:
+            return None
+        return flatten_columns(frame)
+
+    def get(self, symbol, start, end, interval="1d"):
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        lock = _lock_for(self._paths(symbol, interval)[0])
+        with lock:
+            bars, meta = self.load(symbol, interval)
+
+        if bars is None:
+            metrics.count("bar_cache.miss")
+            fetched = self._fetch(symbol, start, end, interval)
+            if fetched is None:
+                return pd.DataFrame()
+            parts, covered = [fetched], [start, end]
+        else:
+            covered = [pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])]
+            parts = []
+
+            # Missing head: history older than anything fetched so far
+            if start < covered[0]:
+                try:
+                    head = self._fetch(symbol, start, covered[0], interval)
+                    if head is not None:
+                        parts.append(head)
+                    covered[0] = start
+                except Exception as e:
+                    # Serve what is cached; the range stays uncovered and is retried next time
+                    print(f"Error fetching {symbol} history before {covered[0]}: {e}")
+
+            # Missing tail: re-fetch from the last stored bar, it may have been in progress
+            if end > covered[1] + self.refresh:
+                tail_start = bars.index[-1] if not bars.empty else covered[1]
+                try:
+                    tail = self._fetch(symbol, tail_start, end, interval)
+                    if tail is not None:
+                        parts.append(tail)
+                    covered[1] = end
+                except Exception as e:
+                    print(f"Error fetching {symbol} bars after {tail_start}: {e}")
+
+            changed = covered != [pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])]
+            metrics.count("bar_cache.partial" if changed else "bar_cache.hit")
+            if not changed:
+                return _slice(bars, start, end)
+
+        with lock:
+            # Another caller may have stored bars while these were being fetched:
+            # merge on top of the file as it is now rather than overwrite it
+            current, current_meta = self.load(symbol, interval)
+            if current is not None:
+                parts.insert(0, current)
+                current_start, current_end = pd.Timestamp(current_meta["start"]), pd.Timestamp(current_meta["end"])
+                if current_start <= covered[1] and covered[0] <= current_end:
+                    covered = [min(covered[0], current_start), max(covered[1], current_end)]
+            elif bars is not None:
+                parts.insert(0, bars)
+            bars = pd.concat(parts) if len(parts) > 1 else parts[0]
+            bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+            self._store(symbol, interval, bars, {
+                "start": covered[0].isoformat(),
+                "end": covered[1].isoformat(),
+                "updated": datetime.now().isoformat(),
+            })
+        return _slice(bars, start, end)
+
+    def clear(self, symbol, interval="1d"):
+        for path in self._paths(symbol, interval):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from strategies import STRATEGY_PARAMS
+
+# --- Watchlist Batch Mode ---
+# One grouped download for every symbol, then the registered strategy rules are
+# applied column-wise to a (time x symbol) Close panel in a single pass.
+
+
+# Download all symbols in one request and return the Close panel
+def get_close_panel(symbols, start, end, interval="1d"):
+    import yfinance as yf
+
+    data = yf.download(list(symbols), start=start, end=end, interval=interval,
+                       auto_adjust=True, group_by="column", progress=False)
+    if data.empty:
+        return pd.DataFrame(columns=list(symbols))
+    close = data["Close"]
+    if isinstance(close, pd.Series):
+        close = close.to_frame(symbols[0])
+    return close.reindex(columns=list(symbols))
+
+
+# EMA per column; NaN rows (e.g. weekends for futures next to BTC) are skipped
+def panel_ema(panel, span):
+    return panel.ewm(span=span, adjust=False, ignore_na=True).mean()
+
+
+# Signal, target and stop-loss arrays from fast/slow lines (same rules as the scripts)
+def _levels(price, fast, slow, stop_loss_pct, profit_pct):
+    buy = fast > slow
+    sell = fast < slow
+    signal = np.where(buy, "Buy", np.where(sell, "Sell", "Hold"))
+    direction = np.where(buy, 1.0, np.where(sell, -1.0, 0.0))
+    target_price = price * (1 + direction * profit_pct)
+    stop_loss = price * (1 - direction * stop_loss_pct)
+    return signal, np.round(target_price, 2), np.round(stop_loss, 2)
+
+
+# Fast/slow EMA rule from the strategy registry, last bar of every symbol at once
+def _ema_rule_signals(panel, name):
+    params = STRATEGY_PARAMS[name]
+    last = panel.ffill().iloc[-1].to_numpy(dtype=float)
+    fast = last if params["fast"] <= 1 else panel_ema(panel, params["fast"]).iloc[-1].to_numpy(dtype=float)
+    slow = panel_ema(panel, params["slow"]).iloc[-1].to_numpy(dtype=float)
+    return _levels(last, fast, slow, params["stop_loss_pct"], params["profit_pct"])
+
+
+# Intraday Strategy (EMA 3 & EMA 5) for every symbol at once
+def intraday_signals(panel):
+    return _ema_rule_signals(panel, "intraday")
+
+
+# Long-term Strategy (EMA 200) for every symbol at once
+def longterm_signals(panel):
+    return _ema_rule_signals(panel, "longterm")
+
+
+strategy_signals = {
+    "Intraday": intraday_signals,
+    "Long-term": longterm_signals,
+}
+
+
+# Signal table for the whole watchlist, one row per symbol
+def signal_table(panel, strategy_type="Intraday"):
+    panel = panel.dropna(axis=1, how="all")
+    signal, target_price, stop_loss = strategy_signals[strategy_type](panel)
+    return pd.DataFrame({
+        "Price": np.round(panel.ffill().iloc[-1].to_numpy(dtype=float), 2),
+        "Signal": signal,
+        "Target Price": target_price,
+        "Stop Loss": stop_loss,
+    }, index=panel.columns)
+
+
+def screen(symbols, start, end, strategy_type="Intraday"):
+    return signal_table(get_close_panel(symbols, start, end), strategy_type)
@@ -0,0 +1,233 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# --- Benchmark Suite ---
+# Offline benchmarks for indicator kernels, strategies, the vectorized
+# engines and Alpha Vantage ingestion on synthetic OHLCV data (no provider
+# calls). Reports best-of-N time, throughput and peak traced memory per
+# stage and size, and can save / compare against a baseline file:
+#   python bench.py --sizes 1000 100000 --save bench_results/baseline.json
+#   python bench.py --sizes 1000 100000 --compare bench_results/baseline.json
+#   python bench.py --memory 500 1576800   (3 years of minute bars, 500 symbols)
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_SYMBOLS = [1, 50, 500]
+
+
+# Geometric random walk with plausible High/Low/Open/Volume
+def synthetic_ohlcv(n, seed=0, freq="min", start="2015-01-01"):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    spread = close * rng.uniform(0.0002, 0.002, n)
+    return pd.DataFrame({
+        "Open": np.concatenate(([close[0]], close[:-1])),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(1, 10_000, n).astype(float),
+    }, index=pd.date_range(start, periods=n, freq=freq))
+
+
+def synthetic_panel(n, symbols, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, (n, symbols)), axis=0))
+    return pd.DataFrame(close, index=pd.date_range("2015-01-01", periods=n, freq="min"),
+                        columns=[f"SYM{i}" for i in range(symbols)])
+
+
+# Alpha Vantage TIME_SERIES_DAILY payload (newest first, values as strings)
+def synthetic_alpha_vantage(n, seed=0):
+    frame = synthetic_ohlcv(n, seed, freq="D", start="1990-01-01")
+    series = {}
+    for date, row in zip(frame.index[::-1].strftime("%Y-%m-%d"), frame.to_numpy()[::-1]):
+        series[date] = {
+            "1. open": f"{row[0]:.4f}", "2. high": f"{row[1]:.4f}", "3. low": f"{row[2]:.4f}",
+            "4. close": f"{row[3]:.4f}", "5. volume": f"{int(row[4])}",
+        }
+    return json.dumps({"Meta Data": {"2. Symbol": "XAUUSD=X"}, "Time Series (Daily)": series})
+
+
+# --- Stages ---
+# Each stage: name -> (setup(bars, symbols) -> args, run(*args), uses symbol dimension)
+def _stages():
+    import backtest
+    import batch
+    import chart
+    import indicators
+    from alpha_vantage import parse_time_series_stream
+    from compact import CompactBars, Scratch, compact_strategy
+    from data import parse_xau_usd_payload
+    from strategies import STRATEGIES, STRATEGY_PARAMS
+
+    frame = lambda n, k: (synthetic_ohlcv(n),)
+    stages = {
+        "indicator.ema": (frame, lambda d: indicators.ema(d["Close"], 30), False),
+        "indicator.compute_rsi": (frame, lambda d: indicators.compute_rsi(d["Close"], 14), False),
+        "indicator.compute_atr": (frame, lambda d: indicators.compute_atr(d, 14), False),
+        "indicator.compute_rsi_pandas": (frame, lambda d: indicators.compute_rsi_pandas(d["Close"], 14), False),
+        "indicator.compute_atr_pandas": (frame, lambda d: indicators.compute_atr_pandas(d, 14), False),
+        "indicator.rsi_wilder": (frame, lambda d: indicators.compute_rsi(d["Close"], 14, "wilder"), False),
+        "indicator.atr_wilder": (frame, lambda d: indicators.compute_atr(d, 14, "wilder"), False),
+        "indicator.rsi_into_wilder": (
+            lambda n, k: (synthetic_ohlcv(n)["Close"].to_numpy(), np.empty(n), np.empty((3, n))),
+            lambda close, out, work: indicators.rsi_into(close, 14, out, work, "wilder"), False),
+        "backtest.signal_arrays": (
+            lambda n, k: backtest.ohlc_arrays(synthetic_ohlcv(n)),
+            lambda c, h, l: backtest.signal_arrays(c, h, l, **STRATEGY_PARAMS["gold_intraday"]), False),
+        "backtest.backtest": (frame, lambda d: backtest.backtest(d, "intraday"), False),
+        "chart.lttb": (frame, lambda d: chart.downsample(d["Close"], 1200, "lttb"), False),
+        "chart.minmax": (frame, lambda d: chart.downsample(d["Close"], 1200, "minmax"), False),
+        "batch.signal_table": (lambda n, k: (synthetic_panel(n, k),), lambda p: batch.signal_table(p), True),
+        "ingest.alpha_vantage": (
+            lambda n, k: (synthetic_alpha_vantage(n),),
+            lambda payload: parse_xau_usd_payload(json.loads(payload), None, None), False),
+        "ingest.alpha_vantage_stream": (
+            lambda n, k: (synthetic_alpha_vantage(n),),
+            lambda payload: parse_time_series_stream(
+                payload[i:i + 65536] for i in range(0, len(payload), 65536)), False),
+    }
+    for name, strategy in STRATEGIES.items():
+        stages[f"strategy.{name}"] = (frame, lambda d, strategy=strategy: strategy(d), False)
+        stages[f"compact.{name}"] = (
+            lambda n, k: (CompactBars.from_frame(synthetic_ohlcv(n)), Scratch()),
+            lambda bars, scratch, name=name: compact_strategy(name, bars, scratch), False)
+    return stages
+
+
+def measure(setup, run, bars, symbols, repeat):
+    args = setup(bars, symbols)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(*args)
+        times.append(time.perf_counter() - start)
+
+    # Separate traced run: tracemalloc slows allocation-heavy code
+    gc.collect()
+    tracemalloc.start()
+    run(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {"seconds": best, "bars_per_second": bars * symbols / best if best else float("inf"),
+            "peak_mb": peak / 2**20}
+
+
+def run_suite(sizes, symbol_counts, repeat=3, only=None, max_cells=50_000_000):
+    results = []
+    for name, (setup, run, multi_symbol) in _stages().items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        for bars in sizes:
+            # Daily payloads beyond ~100 years of history are not meaningful
+            if name.startswith("ingest.") and bars > 100_000:
+                continue
+            for symbols in (symbol_counts if multi_symbol else [1]):
+                if bars * symbols > max_cells:
+                    continue
+                row = {"stage": name, "bars": bars, "symbols": symbols}
+                row.update(measure(setup, run, bars, symbols, repeat))
+                results.append(row)
+                print(f"{name:28s} bars={bars:>10,d} symbols={symbols:>4d} "
+                      f"{row['seconds'] * 1000:10.2f} ms {row['bars_per_second']:14,.0f} bars/s "
+                      f"{row['peak_mb']:9.1f} MB", flush=True)
+    return results
+
+
+# Resident bytes for a universe of minute bars: pandas frames after every
+# strategy has added its indicator columns vs float32 CompactBars + one scratch.
+# Measured on one symbol and scaled, since both grow linearly with symbols.
+def memory_report(symbols=500, bars=3 * 365 * 24 * 60):
+    from compact import CompactBars, Scratch, compact_strategy
+    from strategies import STRATEGIES
+
+    frame = synthetic_ohlcv(bars)
+    compact = CompactBars.from_frame(frame)
+    scratch = Scratch()
+    for name, strategy in STRATEGIES.items():
+        strategy(frame)
+        compact_strategy(name, compact, scratch)
+    frame_bytes = int(frame.memory_usage(deep=True).sum())
+    scratch_bytes = sum(buffer.nbytes for buffer in scratch.buffers.values())
+    report = {
+        "symbols": symbols, "bars": bars,
+        "pandas_mb": frame_bytes * symbols / 2**20,
+        "compact_mb": (compact.nbytes * symbols + scratch_bytes) / 2**20,
+    }
+    report["reduction"] = report["pandas_mb"] / report["compact_mb"]
+    print(f"{symbols} symbols x {bars:,d} bars: pandas {report['pandas_mb']:,.0f} MB "
+          f"({len(frame.columns)} columns), compact float32 {report['compact_mb']:,.0f} MB "
+          f"-> {report['reduction']:.1f}x smaller")
+    return report
+
+
+def environment():
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path, threshold=1.2):
+    with open(baseline_path) as f:
+        baseline = {(r["stage"], r["bars"], r["symbols"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (ratio = now / baseline):")
+    for row in results:
+        old = baseline.get((row["stage"], row["bars"], row["symbols"]))
+        if old is None:
+            continue
+        ratio = row["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        flag = "  REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"{row['stage']:28s} bars={row['bars']:>10,d} symbols={row['symbols']:>4d} "
+              f"time x{ratio:5.2f}  memory x{row['peak_mb'] / max(old['peak_mb'], 1e-9):5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks on synthetic OHLCV data.")
+    parser.add_argument("--sizes", nargs="*", type=int, default=DEFAULT_SIZES, help="Bars per series (up to 10M)")
+    parser.add_argument("--symbols", nargs="*", type=int, default=DEFAULT_SYMBOLS, help="Symbols for panel stages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="Run stages whose name contains any of these")
+    parser.add_argument("--max-cells", type=int, default=50_000_000, help="Skip bars x symbols above this")
+    parser.add_argument("--save", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression")
+    parser.add_argument("--memory", nargs=2, type=int, metavar=("SYMBOLS", "BARS"),
+                        help="Only report resident memory of pandas vs compact bars for this universe")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        memory_report(*args.memory)
+        return 0
+
+    results = run_suite(args.sizes, args.symbols, args.repeat, args.only, args.max_cells)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from memo import fingerprint
+
+# --- Chart Downsampling ---
+# A browser chart can't show more points than it has pixels, but
+# st.line_chart sends every bar it is given on every rerun. Long histories
+# are reduced on the server to at most MARKET_CHART_POINTS points (about
+# the width of a wide-layout chart). The reduction keeps the shape:
+#   lttb   - Largest-Triangle-Three-Buckets, one visually significant point per bucket
+#   minmax - the low and the high of each bucket, so no spike is lost
+# Reduced series are cached per (symbol, range, width), and the target /
+# stop-loss lines are drawn on the reduced index.
+
+MAX_POINTS = int(os.environ.get("MARKET_CHART_POINTS", "1200"))
+
+
+# Positions of the lowest and highest value in each of `buckets` equal slices (first and last kept)
+def minmax_indices(y, buckets):
+    n = len(y)
+    if n <= 2 * buckets + 2:
+        return np.arange(n)
+    inner = y[1:-1]
+    starts = np.arange(buckets) * (n - 2) // buckets
+    counts = np.diff(np.append(starts, n - 2))
+    keep = [[0], [n - 1]]
+    for reduce in (np.minimum, np.maximum):
+        # First position in each bucket holding the bucket's extreme
+        hits = np.flatnonzero(inner == np.repeat(reduce.reduceat(inner, starts), counts))
+        keep.append(hits[np.searchsorted(hits, starts)] + 1)
+    keep = np.concatenate(keep)
+    return np.unique(keep)
+
+
+# Largest-Triangle-Three-Buckets (Steinarsson, 2013): first, last and one point per bucket
+def lttb_indices(x, y, threshold):
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+# Series reduced to at most `points` values; shorter series are returned as they are
+def downsample(series, points=MAX_POINTS, method="lttb"):
+    series = series.dropna()
+    if len(series) <= points:
+        return series
+    y = series.to_numpy(dtype=float)
+    if method == "lttb":
+        index = series.index
+        if isinstance(index, pd.DatetimeIndex):
+            x = (index.asi8 - index.asi8[0]).astype(float)
+        else:
+            x = np.arange(len(y), dtype=float)
+        keep = lttb_indices(x, y, points)
+    elif method == "minmax":
+        keep = minmax_indices(y, max(1, (points - 2) // 2))
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return series.iloc[keep]
+
+
+class ChartCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Reduced Close of `data`; the key also fingerprints the latest bars, so a new bar is a new entry
+    def get(self, symbol, data, points=MAX_POINTS, method="lttb", column="Close"):
+        key = (symbol, data.index[0], data.index[-1], points, method, column, fingerprint(data))
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                metrics.count("chart.hit")
+                return self.entries[key]
+        metrics.count("chart.miss")
+        with metrics.span("chart.downsample"):
+            reduced = downsample(data[column], points, method)
+        with self._lock:
+            self.entries[key] = reduced
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return reduced
+
+
+# Process-wide, shared by every session
+cache = ChartCache()
+
+
+# Reduced price with flat target / stop-loss lines over the same index
+def chart_frame(symbol, data, target_price=None, stop_loss=None, points=MAX_POINTS, method="lttb"):
+    reduced = cache.get(symbol, data, points, method)
+    frame = reduced.to_frame("Close")
+    if target_price is not None:
+        frame["Target Price"] = float(target_price)
+    if stop_loss is not None:
+        frame["Stop Loss"] = float(stop_loss)
+    return frame
+
+
+# Drop-in for st.line_chart(data['Close'])
+def line_chart(symbol, data, target_price=None, stop_loss=None, points=MAX_POINTS, method="lttb"):
+    import streamlit as st
+
+    frame = chart_frame(symbol, data, target_price, stop_loss, points, method)
+    with metrics.span("chart.line_chart"):
+        st.line_chart(frame)
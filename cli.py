@@ -0,0 +1,111 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from strategies import STRATEGIES
+
+# --- Headless Signal Runner ---
+# Runs registered strategies over a list of symbols without Streamlit and
+# writes one row per (symbol, strategy). Suitable for cron, e.g.
+#   python cli.py --symbols-file watchlist.txt --days 365 -o signals.parquet
+# Data comes from the on-disk bar cache (topped up from Yahoo) or, with
+# --data-dir, from <SYMBOL>.csv / <SYMBOL>.parquet files only.
+
+
+def load_file_data(data_dir, symbol, start, end):
+    for ext, reader in ((".parquet", pd.read_parquet), (".csv", lambda p: pd.read_csv(p, index_col=0, parse_dates=True))):
+        path = os.path.join(data_dir, symbol + ext)
+        if os.path.exists(path):
+            data = reader(path).sort_index()
+            return data.loc[pd.Timestamp(start):pd.Timestamp(end)]
+    raise FileNotFoundError(f"No data file for {symbol} in {data_dir}")
+
+
+def run_symbol(symbol, strategy_names, start, end, interval="1d", data_dir=None):
+    rows = []
+    try:
+        if data_dir:
+            data = load_file_data(data_dir, symbol, start, end)
+        else:
+            from data import get_price_data
+
+            data = get_price_data(symbol, start, end, interval)
+        if data is None or data.empty:
+            raise ValueError("no data")
+    except Exception as e:
+        return [{"Symbol": symbol, "Strategy": name, "Error": str(e)} for name in strategy_names]
+
+    for name in strategy_names:
+        row = {"Symbol": symbol, "Strategy": name, "Bars": len(data), "Last Bar": data.index[-1]}
+        try:
+            signal, target_price, stop_loss = STRATEGIES[name](data.copy())
+            row.update({"Signal": signal, "Target Price": target_price, "Stop Loss": stop_loss})
+        except Exception as e:
+            row["Error"] = str(e)
+        rows.append(row)
+    return rows
+
+
+def write_results(results, output):
+    if output is None or output == "-":
+        results.to_csv(sys.stdout, index=False)
+    elif output.endswith(".json"):
+        results.to_json(output, orient="records", date_format="iso", indent=2)
+    elif output.endswith(".parquet"):
+        results.to_parquet(output, index=False)
+    else:
+        results.to_csv(output, index=False)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate trading signals without the Streamlit UI.")
+    parser.add_argument("--symbols", nargs="*", default=[], help="Symbols, e.g. BTC-USD GC=F")
+    parser.add_argument("--symbols-file", help="File with one symbol per line")
+    parser.add_argument("--strategies", nargs="*", default=["intraday", "longterm"], choices=sorted(STRATEGIES))
+    parser.add_argument("--days", type=int, default=90, help="Lookback when --start is not given")
+    parser.add_argument("--start", help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="End date (YYYY-MM-DD), default now")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--data-dir", help="Read <SYMBOL>.csv/.parquet from here instead of the provider")
+    parser.add_argument("--workers", type=int, default=1, help="Symbols processed in parallel")
+    parser.add_argument("-o", "--output", help="Output .csv, .json or .parquet (default: CSV on stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not symbols:
+        print("No symbols given (use --symbols or --symbols-file).", file=sys.stderr)
+        return 2
+
+    end_date = pd.Timestamp(args.end) if args.end else datetime.now()
+    start_date = pd.Timestamp(args.start) if args.start else end_date - timedelta(days=args.days)
+    jobs = [(symbol, args.strategies, start_date, end_date, args.interval, args.data_dir) for symbol in symbols]
+
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            batches = list(pool.map(run_symbol, *zip(*jobs)))
+    else:
+        batches = [run_symbol(*job) for job in jobs]
+
+    results = pd.DataFrame([row for rows in batches for row in rows])
+    if "Bars" in results:
+        results["Bars"] = results["Bars"].astype("Int64")
+    write_results(results, args.output)
+
+    failed = results["Error"].notna().sum() if "Error" in results else 0
+    if failed:
+        print(f"{failed} of {len(results)} signals failed.", file=sys.stderr)
+    return 1 if failed == len(results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+from indicators import ema_into, rsi_into, atr_into
+from strategies import STRATEGIES, STRATEGY_PARAMS, signal_from_values
+
+# --- Compact Bar Store ---
+# Optional array-backed alternative to keeping one pandas frame per symbol.
+# OHLCV lives in one (columns, bars) block, float32 by default, with int64
+# timestamps beside it. Strategies are evaluated through preallocated scratch
+# buffers that are reused from symbol to symbol, so nothing is added to (or
+# copied from) the caller's frame and memory stays at the stored bars.
+#   universe = {symbol: CompactBars.from_frame(frame) for symbol, frame in frames.items()}
+#   evaluate(universe, "intraday")
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class CompactBars:
+    def __init__(self, index, values, columns=COLUMNS):
+        self.index = index  # int64 ns since epoch
+        self.values = values  # (len(columns), bars); each column is contiguous
+        self.columns = tuple(columns)
+        self._positions = {name: i for i, name in enumerate(self.columns)}
+
+    @classmethod
+    def from_frame(cls, frame, dtype=np.float32):
+        columns = [c for c in COLUMNS if c in frame]
+        values = np.empty((len(columns), len(frame)), dtype=dtype)
+        for i, column in enumerate(columns):
+            values[i] = frame[column].to_numpy()
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_convert(None)
+        return cls(index.as_unit("ns").asi8.copy(), values, columns)
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    def __getitem__(self, column):
+        return self.values[self._positions[column]]
+
+    @property
+    def nbytes(self):
+        return self.index.nbytes + self.values.nbytes
+
+    # View of the bars between start and end (inclusive), no copy
+    def slice(self, start=None, end=None):
+        lo = 0 if start is None else np.searchsorted(self.index, pd.Timestamp(start).value, "left")
+        hi = len(self) if end is None else np.searchsorted(self.index, pd.Timestamp(end).value, "right")
+        return CompactBars(self.index[lo:hi], self.values[:, lo:hi], self.columns)
+
+    def tail(self, n):
+        return CompactBars(self.index[-n:], self.values[:, -n:], self.columns)
+
+    def to_frame(self, dtype=float):
+        return pd.DataFrame({c: self[c].astype(dtype) for c in self.columns},
+                            index=pd.DatetimeIndex(self.index.view("datetime64[ns]")))
+
+
+# Grow-only float64 buffers shared by every evaluation on one thread
+class Scratch:
+    def __init__(self):
+        self.buffers = {}
+
+    def get(self, name, *shape):
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape[:-1] != shape[:-1] or buffer.shape[-1] < shape[-1]:
+            grown = shape[:-1] + (max(shape[-1], 2 * (buffer.shape[-1] if buffer is not None else 0)),)
+            buffer = self.buffers[name] = np.empty(grown)
+        return buffer[..., :shape[-1]]
+
+
+def _last_ema(close, span, scratch):
+    if span <= 1:
+        return float(close[-1])
+    return float(ema_into(close, span, scratch.get("line", len(close)), scratch.get("ema", 3, 4096))[-1])
+
+
+# Latest signal of a registered strategy, same result as STRATEGIES[name](bars.to_frame()).
+# The in-place kernels assume no gaps; bars with a missing price go through the
+# frame strategy, as compute_rsi falls back to its pandas version.
+def compact_strategy(name, bars, scratch=None):
+    params = STRATEGY_PARAMS[name]
+    close = bars["Close"]
+    if any(np.isnan(bars[column]).any() for column in ("High", "Low", "Close") if column in bars.columns):
+        return STRATEGIES[name](bars.to_frame())
+    scratch = scratch or Scratch()
+    n = len(close)
+    fast = _last_ema(close, params["fast"], scratch)
+    slow = _last_ema(close, params["slow"], scratch)
+
+    rsi = atr = None
+    if params.get("rsi_period") or params.get("atr_threshold"):
+        work = scratch.get("work", 3, n)
+    if params.get("rsi_period"):
+        rsi = float(rsi_into(close, params["rsi_period"], scratch.get("line", n), work)[-1])
+    if params.get("atr_threshold"):
+        atr = float(atr_into(bars["High"], bars["Low"], close, params.get("atr_period", 14),
+                             scratch.get("line", n), work)[-1])
+    return signal_from_values(name, float(close[-1]), fast, slow, rsi, atr)
+
+
+# {symbol: CompactBars} -> {symbol: (signal, target, stop)} with one shared scratch
+def evaluate(universe, strategy="intraday", scratch=None):
+    scratch = scratch or Scratch()
+    results = {}
+    for symbol, bars in universe.items():
+        if len(bars) == 0:
+            continue
+        try:
+            results[symbol] = compact_strategy(strategy, bars, scratch)
+        except Exception as e:
+            print(f"Error running {strategy} strategy for {symbol}: {e}")
+    return results
@@ -0,0 +1,164 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+# --- Cross Rates ---
+# Derived pairs such as BTC/XAU are computed locally from USD legs that are
+# fetched (and cached) anyway, e.g. BTC-USD / XAUUSD=X, instead of asking a
+# provider for a symbol that doesn't exist or spending Alpha Vantage quota.
+# Legs are time-aligned (the slower leg carries its last price forward),
+# and the OHLC ratio is computed on whole arrays. CrossMatrix keeps every
+# A/B rate of a watchlist and updates one row and one column per tick.
+
+# Currency code -> (USD leg ticker, True if the ticker is quoted per USD, e.g. JPY=X)
+LEGS = {
+    "USD": (None, False),
+    "BTC": ("BTC-USD", False),
+    "ETH": ("ETH-USD", False),
+    "XAU": ("XAUUSD=X", False),
+    "XAG": ("XAGUSD=X", False),
+    "EUR": ("EURUSD=X", False),
+    "GBP": ("GBPUSD=X", False),
+    "AUD": ("AUDUSD=X", False),
+    "JPY": ("JPY=X", True),
+    "CHF": ("CHF=X", True),
+    "CAD": ("CAD=X", True),
+}
+
+COLUMNS = ("Open", "High", "Low", "Close")
+
+
+# "BTC/XAU" -> ("BTC", "XAU"); both codes must have a leg in LEGS
+def parse_pair(pair):
+    base, _, quote = pair.upper().partition("/")
+    for code in (base, quote):
+        if code not in LEGS:
+            raise ValueError(f"No USD leg known for {code!r} (pair {pair!r})")
+    return base, quote
+
+
+# Daily bars keep their calendar date, intraday bars are compared in UTC
+def _naive(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        return index
+    if (index == index.normalize()).all():
+        return index.tz_localize(None)
+    return index.tz_convert("UTC").tz_localize(None)
+
+
+# Put two frames on one index: the union of both bar times from the point where
+# both have started, the leg without a bar carrying its last value forward
+def align(first, second, columns=COLUMNS):
+    first, second = first[list(columns)], second[list(columns)]
+    first = first.set_axis(_naive(first.index).as_unit("ns"))
+    second = second.set_axis(_naive(second.index).as_unit("ns"))
+    index = first.index.union(second.index)
+    first = first[~first.index.duplicated(keep="last")].reindex(index).ffill()
+    second = second[~second.index.duplicated(keep="last")].reindex(index).ffill()
+    both = first["Close"].notna().to_numpy() & second["Close"].notna().to_numpy()
+    return first[both], second[both]
+
+
+# USD value of one unit of `code` as OHLC arrays; inverted legs swap High and Low
+def _usd_values(frame, inverted):
+    values = {column: frame[column].to_numpy(dtype=float) for column in COLUMNS}
+    if not inverted:
+        return values
+    return {"Open": 1.0 / values["Open"], "High": 1.0 / values["Low"],
+            "Low": 1.0 / values["High"], "Close": 1.0 / values["Close"]}
+
+
+# OHLC of base / quote on aligned bars. Open and Close are exact; a cross's
+# intrabar extremes aren't recoverable from its legs, so High / Low are the
+# widest of the open, close, high/high and low/low ratios.
+def cross_ohlc(base, quote, base_inverted=False, quote_inverted=False):
+    base, quote = align(base, quote)
+    b = _usd_values(base, base_inverted)
+    q = _usd_values(quote, quote_inverted)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.stack([b[column] / q[column] for column in COLUMNS])
+    frame = pd.DataFrame({
+        "Open": ratios[0],
+        "High": ratios.max(axis=0),
+        "Low": ratios.min(axis=0),
+        "Close": ratios[3],
+    }, index=base.index)
+    frame.index.name = "Date"
+    return frame
+
+
+# Bars of `pair` from its legs; `get_bars(symbol)` returns the leg's OHLC frame
+def cross_bars(pair, get_bars):
+    base, quote = parse_pair(pair)
+    (base_symbol, base_inverted), (quote_symbol, quote_inverted) = LEGS[base], LEGS[quote]
+    if base_symbol is None and quote_symbol is None:
+        raise ValueError(f"{pair} is not a cross")
+    legs = [get_bars(symbol) if symbol else None for symbol in (base_symbol, quote_symbol)]
+    for symbol, leg in zip((base_symbol, quote_symbol), legs):
+        if symbol and (leg is None or leg.empty):
+            raise ValueError(f"No bars for {symbol}")
+    # USD itself is a leg worth 1 on the other leg's bars
+    base_bars, quote_bars = legs
+    if base_bars is None:
+        base_bars = _ones(quote_bars)
+    if quote_bars is None:
+        quote_bars = _ones(base_bars)
+    metrics.count("crosses.bars")
+    return cross_ohlc(base_bars, quote_bars, base_inverted, quote_inverted)
+
+
+def _ones(frame):
+    return pd.DataFrame(1.0, index=frame.index, columns=list(COLUMNS))
+
+
+# Every A/B rate of a set of currency codes from their USD values.
+# Setting one code's value rewrites its row and column only (O(N), not O(N^2)).
+class CrossMatrix:
+    def __init__(self, codes):
+        self.codes = [code.upper() for code in codes]
+        if "USD" not in self.codes:
+            self.codes.append("USD")
+        self._positions = {code: i for i, code in enumerate(self.codes)}
+        n = len(self.codes)
+        self.usd = np.full(n, np.nan)
+        self.usd[self._positions["USD"]] = 1.0
+        self.rates = np.full((n, n), np.nan)
+        np.fill_diagonal(self.rates, 1.0)
+        self._lock = threading.Lock()
+
+    # Set the USD value of `code` (units of USD per one unit of `code`)
+    def update(self, code, usd_value):
+        i = self._positions[code.upper()]
+        with self._lock:
+            self.usd[i] = float(usd_value)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.rates[i, :] = self.usd[i] / self.usd
+                self.rates[:, i] = self.usd / self.usd[i]
+        metrics.count("crosses.update")
+
+    # Tick on a leg ticker, e.g. on_quote("JPY=X", 151.2); tickers outside the matrix are ignored
+    def on_quote(self, ticker, price):
+        for code, (symbol, inverted) in LEGS.items():
+            if symbol == ticker and code in self._positions:
+                self.update(code, 1.0 / float(price) if inverted else price)
+                return True
+        return False
+
+    # Seed from the last close of already-fetched leg bars {ticker: frame}
+    def seed(self, bars):
+        for ticker, frame in bars.items():
+            if frame is not None and not frame.empty:
+                self.on_quote(ticker, float(frame["Close"].dropna().iloc[-1]))
+
+    def rate(self, base, quote):
+        with self._lock:
+            return float(self.rates[self._positions[base.upper()], self._positions[quote.upper()]])
+
+    # Rows are the base currency, columns the quote currency
+    def frame(self):
+        with self._lock:
+            return pd.DataFrame(self.rates.copy(), index=self.codes, columns=self.codes)
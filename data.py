@@ -0,0 +1,211 @@
+import threading
+
+import pandas as pd
+
+from metrics import timed
+
+# --- Data Adapters ---
+# Historical bars and live quotes for the scripts, CLI and workers.
+# Provider modules (yfinance, requests) are only imported on first use.
+
+_bar_cache = None
+_archive = None
+_timeframes = {}
+_timeframes_lock = threading.Lock()
+_cross_matrices = {}
+
+
+def get_bar_cache():
+    global _bar_cache
+    if _bar_cache is None:
+        from bar_cache import BarCache
+        from providers import fetch_history
+
+        _bar_cache = BarCache(fetch=fetch_history)
+    return _bar_cache
+
+
+# Get historical data (served from the on-disk bar cache, providers with retries behind it)
+@timed("fetch.get_price_data")
+def get_price_data(symbol, start, end, interval="1d"):
+    if "/" in symbol:
+        return get_cross_data(symbol, start, end, interval)
+    try:
+        return get_bar_cache().get(symbol, start=start, end=end, interval=interval)
+    except Exception as e:
+        print(f"Error fetching {symbol} history: {e}")
+        return pd.DataFrame()
+
+
+def get_archive():
+    global _archive
+    if _archive is None:
+        from archive import Archive
+
+        _archive = Archive()
+    return _archive
+
+
+# Zero-copy view of archived bars (see archive.py); `refresh` appends newly closed bars first
+@timed("fetch.get_archived_bars")
+def get_archived_bars(symbol, start, end, interval="1d", refresh=True):
+    from archive import update_archive
+
+    archive = get_archive()
+    if refresh:
+        try:
+            update_archive(archive, symbol, start, end, interval)
+        except Exception as e:
+            print(f"Error updating archive for {symbol}: {e}")
+    view = archive.open(symbol, interval)
+    return None if view is None else view.slice(start, end)
+
+
+# One base-interval download per symbol, every coarser timeframe derived from it
+@timed("fetch.get_timeframes")
+def get_timeframes(symbol, start, end, base_interval=None, intervals=("5m", "15m", "1h", "1d")):
+    from resample import MultiTimeframe, base_interval_for
+
+    base_interval = base_interval or base_interval_for(start, end)
+    bars = get_price_data(symbol, start=start, end=end, interval=base_interval)
+    if bars is None or bars.empty:
+        return {}
+    with _timeframes_lock:
+        timeframes = _timeframes.setdefault((symbol, base_interval), MultiTimeframe(base_interval, intervals))
+        timeframes.update(bars)
+        return {interval: timeframes.get(interval, start, end) for interval in (base_interval, *intervals)}
+
+
+# Bars of `interval` derived from the shared base series; daily bars without an
+# explicit base (and intervals finer than the base) come straight from the cache
+def get_resampled_data(symbol, start, end, interval="1d", base_interval=None):
+    from resample import base_interval_for, interval_length
+
+    if interval == "1d" and base_interval is None:
+        return get_price_data(symbol, start=start, end=end, interval=interval)
+    base_interval = base_interval or base_interval_for(start, end)
+    if interval_length(interval) < interval_length(base_interval):
+        return get_price_data(symbol, start=start, end=end, interval=interval)
+    return get_timeframes(symbol, start, end, base_interval, (interval,)).get(interval)
+
+
+# Bars of a cross-rate leg; a leg accepts a stand-in from providers.ALTERNATES
+# (GC=F for XAUUSD=X), each cached under its own ticker
+def _leg_bars(symbol, start, end, interval="1d"):
+    from providers import ALTERNATES
+
+    for candidate in [symbol] + ALTERNATES.get(symbol, []):
+        bars = get_price_data(candidate, start=start, end=end, interval=interval)
+        if bars is not None and not bars.empty:
+            return bars
+    return bars
+
+
+# Derived pair such as "BTC/XAU" from its cached USD legs (see crosses.py)
+@timed("fetch.get_cross_data")
+def get_cross_data(pair, start, end, interval="1d"):
+    from crosses import cross_bars
+
+    try:
+        return cross_bars(pair, lambda symbol: _leg_bars(symbol, start, end, interval))
+    except Exception as e:
+        print(f"Error deriving {pair}: {e}")
+        return pd.DataFrame()
+
+
+# USD value of one unit of `code`: CoinGecko for coins, the latest cached daily close otherwise
+def _usd_value(code):
+    from datetime import datetime, timedelta
+    from crosses import LEGS
+    from providers import COIN_CODES
+
+    symbol, inverted = LEGS[code]
+    if symbol is None:
+        return 1.0
+    coins = {value: key for key, value in COIN_CODES.items()}
+    if code in coins:
+        price = get_live_price(coins[code])
+        if price:
+            return float(price)
+    end = datetime.now()
+    bars = _leg_bars(symbol, end - timedelta(days=7), end)
+    if bars is None or bars.empty:
+        return None
+    close = float(bars["Close"].dropna().iloc[-1])
+    return 1.0 / close if inverted else close
+
+
+# Live rate of a derived pair without an exchange-rate call
+@timed("fetch.get_cross_rate")
+def get_cross_rate(pair):
+    from crosses import parse_pair
+
+    try:
+        base, quote = parse_pair(pair)
+        base_value, quote_value = _usd_value(base), _usd_value(quote)
+        if not base_value or not quote_value:
+            return None
+        return base_value / quote_value
+    except Exception as e:
+        print(f"Error fetching {pair} rate: {e}")
+        return None
+
+
+# Watchlist cross matrix, seeded from the legs' cached daily closes; kept per
+# set of codes so live ticks (CrossMatrix.on_quote) can update it in place
+def get_cross_matrix(codes, start, end):
+    from crosses import LEGS, CrossMatrix
+
+    key = tuple(code.upper() for code in codes)
+    matrix = _cross_matrices.get(key)
+    if matrix is None:
+        matrix = _cross_matrices[key] = CrossMatrix(key)
+    legs = {LEGS[code][0]: _leg_bars(LEGS[code][0], start, end) for code in key if LEGS[code][0]}
+    matrix.seed(legs)
+    return matrix
+
+
+# Fetch live price from CoinGecko (Alpha Vantage exchange rate as fallback)
+@timed("fetch.get_live_price")
+def get_live_price(symbol):
+    import providers
+
+    try:
+        return providers.live_price(symbol)
+    except Exception as e:
+        print(f"Error fetching live price: {e}")
+        return None
+
+
+# Fetch live price from Alpha Vantage for BTC/XAU, XAU/USD, ETH/USD
+@timed("fetch.get_alpha_vantage_price")
+def get_alpha_vantage_price(from_currency, to_currency):
+    import providers
+
+    try:
+        return providers.exchange_rate(from_currency, to_currency)
+    except Exception as e:
+        print(f"Error fetching exchange rate from Alpha Vantage: {e}")
+        return None
+
+
+# Fetch historical data for XAU/USD (Alpha Vantage full OHLCV, Yahoo GC=F as fallback)
+@timed("fetch.get_xau_usd_data")
+def get_xau_usd_data(start, end):
+    import providers
+
+    try:
+        return providers.xau_usd_history(start, end)
+    except Exception as e:
+        print(f"Error fetching XAU/USD history: {e}")
+        return None
+
+
+# Alpha Vantage TIME_SERIES_DAILY JSON -> OHLCV frame between start and end
+def parse_xau_usd_payload(data, start, end):
+    from alpha_vantage import parse_time_series, slice_range
+
+    xau_data = parse_time_series(data)
+    if xau_data is None:
+        return None
+    return slice_range(xau_data, start, end)
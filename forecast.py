@@ -0,0 +1,279 @@
+import argparse
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from memo import fingerprint
+
+# --- Walk-Forward Forecasting ---
+# ARIMA models (statsmodels) on log closes, one per (symbol, interval). Fitted
+# models are kept per key and checked against a fingerprint of the bars:
+#   same bars            -> the cached fit is reused as it is
+#   new bars appended    -> they are filtered in with the current parameters
+#                           (results.append, no optimization); after
+#                           REFIT_EVERY such bars the parameters are re-estimated
+#                           starting from the previous ones
+#   anything else        -> full fit, warm-started when a previous fit exists
+# train() fits many symbols across a process pool, and forecast_levels() turns
+# the forecast into the same (signal, target, stop) output as the strategies.
+#   python forecast.py BTC-USD GC=F --days 730 --horizon 5 --workers 4
+#   python forecast.py BTC-USD --walk-forward --train 250
+
+ORDER = (1, 1, 1)
+REFIT_EVERY = 20
+MIN_BARS = 30
+
+
+def _log_close(data):
+    return np.log(data["Close"].to_numpy(dtype=float))
+
+
+# Fit log prices; `start_params` warm-starts the optimizer from an earlier fit
+def fit(log_values, order=ORDER, start_params=None):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return ARIMA(log_values, order=order).fit(start_params=start_params)
+
+
+# Results for known parameters: one Kalman filter pass, no optimization
+def filtered(log_values, order, params):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return ARIMA(log_values, order=order).filter(params)
+
+
+class ForecastModels:
+    def __init__(self, order=ORDER, refit_every=REFIT_EVERY, tail=256, maxsize=256):
+        self.order = tuple(order)
+        self.refit_every = refit_every
+        self.tail = tail
+        self.maxsize = maxsize
+        self.states = OrderedDict()  # (symbol, interval) -> fitted model and the bars it covers
+        self._lock = threading.Lock()
+
+    # Fingerprint of the last `tail` bars up to and including position `end`
+    def _tail_print(self, data, end):
+        return fingerprint(data.iloc[max(0, end + 1 - self.tail):end + 1], self.tail)
+
+    def _state(self, key):
+        with self._lock:
+            return self.states.get(key)
+
+    def _store(self, key, data, results, appended):
+        state = {
+            "fingerprint": fingerprint(data, self.tail), "tail": self._tail_print(data, len(data) - 1),
+            "end": data.index[-1], "results": results, "appended": appended,
+        }
+        with self._lock:
+            self.states[key] = state
+            self.states.move_to_end(key)
+            while len(self.states) > self.maxsize:
+                self.states.popitem(last=False)
+        return results
+
+    # Number of bars `data` has after the state's last bar, or None if the
+    # state's bars are not a prefix (a window that slid forward still counts)
+    def _appended_bars(self, state, data):
+        if state is None or state["end"] not in data.index:
+            return None
+        end = data.index.get_loc(state["end"])
+        if not isinstance(end, int) or self._tail_print(data, end) != state["tail"]:
+            return None
+        return len(data) - 1 - end
+
+    # Parameters to warm-start a fit for `symbol` from, if any
+    def warm_params(self, symbol, interval="1d"):
+        state = self._state((symbol, interval))
+        return None if state is None else np.asarray(state["results"].params)
+
+    def is_current(self, symbol, data, interval="1d"):
+        state = self._state((symbol, interval))
+        return state is not None and state["fingerprint"] == fingerprint(data, self.tail)
+
+    # Store parameters fitted elsewhere (e.g. in a worker process) for `data`
+    def install(self, symbol, data, params, interval="1d"):
+        return self._store((symbol, interval), data, filtered(_log_close(data), self.order, params), 0)
+
+    # Fitted model covering every bar of `data`
+    def results_for(self, symbol, data, interval="1d"):
+        if len(data) < MIN_BARS:
+            raise ValueError(f"{symbol}: {len(data)} bars, need at least {MIN_BARS}")
+        key = (symbol, interval)
+        state = self._state(key)
+        if state is not None and state["fingerprint"] == fingerprint(data, self.tail):
+            metrics.count("forecast.hit")
+            return state["results"]
+
+        new = self._appended_bars(state, data)
+        if new is not None and state["appended"] + new < self.refit_every:
+            metrics.count("forecast.append")
+            results = state["results"].append(_log_close(data.iloc[len(data) - new:]))
+            return self._store(key, data, results, state["appended"] + new)
+
+        start_params = None if state is None else np.asarray(state["results"].params)
+        metrics.count("forecast.fit" if start_params is None else "forecast.warm_fit")
+        with metrics.span("forecast.fit"):
+            results = fit(_log_close(data), self.order, start_params)
+        return self._store(key, data, results, 0)
+
+    # Price forecast for the next `horizon` bars with a (1 - alpha) interval
+    def forecast(self, symbol, data, horizon=5, alpha=0.2, interval="1d"):
+        prediction = self.results_for(symbol, data, interval).get_forecast(horizon)
+        bounds = np.exp(np.asarray(prediction.conf_int(alpha)))
+        return pd.DataFrame({
+            "Forecast": np.exp(np.asarray(prediction.predicted_mean)),
+            "Lower": bounds[:, 0],
+            "Upper": bounds[:, 1],
+        }, index=pd.RangeIndex(1, horizon + 1, name="Step"))
+
+
+# Process-wide models shared by every session
+models = ForecastModels()
+
+
+# Forecast as strategy output: Buy / Sell towards the forecast `horizon` bars
+# ahead, stop-loss at the far side of its interval (never past the close)
+def forecast_levels(symbol, data, horizon=5, alpha=0.2, store=None, interval="1d"):
+    try:
+        table = (store or models).forecast(symbol, data, horizon, alpha, interval)
+    except Exception as e:
+        print(f"Error forecasting {symbol}: {e}")
+        return None
+    close = float(data["Close"].iloc[-1])
+    last = table.iloc[-1]
+    target_price = float(last["Forecast"])
+    if round(target_price, 2) > round(close, 2):
+        return "Buy", round(target_price, 2), round(min(float(last["Lower"]), close), 2)
+    if round(target_price, 2) < round(close, 2):
+        return "Sell", round(target_price, 2), round(max(float(last["Upper"]), close), 2)
+    return "Hold", round(close, 2), round(close, 2)
+
+
+def _fit_job(symbol, log_values, order, start_params):
+    try:
+        return symbol, np.asarray(fit(log_values, order, start_params).params), None
+    except Exception as e:
+        return symbol, None, str(e)
+
+
+# Fit every {symbol: bars of `interval`} that changed since its last fit, `workers` processes at once
+def train(frames, workers=1, store=None, interval="1d"):
+    store = store or models
+    jobs = []
+    for symbol, data in frames.items():
+        if data is None or len(data) < MIN_BARS or store.is_current(symbol, data, interval):
+            continue
+        jobs.append((symbol, _log_close(data), store.order, store.warm_params(symbol, interval)))
+    if not jobs:
+        return []
+
+    with metrics.span("forecast.train"):
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                fitted = list(pool.map(_fit_job, *zip(*jobs)))
+        else:
+            fitted = [_fit_job(*job) for job in jobs]
+
+    trained = []
+    for symbol, params, error in fitted:
+        if error:
+            print(f"Error fitting {symbol}: {error}")
+            continue
+        store.install(symbol, frames[symbol], params, interval)
+        trained.append(symbol)
+    return trained
+
+
+# One-step-ahead (or `horizon`) forecasts over the bars after the first `train`,
+# using only data available at each step: new bars are appended to the model
+# and the parameters re-estimated (warm-started) every `refit_every` bars
+def walk_forward(close, order=ORDER, train=250, horizon=1, refit_every=REFIT_EVERY):
+    close = pd.Series(close).dropna()
+    log_values = np.log(close.to_numpy(dtype=float))
+    if len(log_values) < train + horizon:
+        raise ValueError(f"Need more than {train + horizon} bars, got {len(log_values)}")
+
+    results = fit(log_values[:train], order)
+    since_refit = 0
+    rows = []
+    for t in range(train, len(log_values) - horizon + 1):
+        predicted = float(np.exp(results.forecast(horizon)[-1]))
+        rows.append((close.index[t + horizon - 1], predicted, float(close.iloc[t + horizon - 1]),
+                     float(close.iloc[t - 1])))
+        since_refit += 1
+        if since_refit >= refit_every:
+            results = fit(log_values[:t + 1], order, results.params)
+            since_refit = 0
+        else:
+            results = results.append(log_values[t:t + 1])
+
+    table = pd.DataFrame(rows, columns=["Date", "Forecast", "Actual", "Previous"]).set_index("Date")
+    table["Error"] = table["Actual"] - table["Forecast"]
+    return table
+
+
+# MAE, MAPE and how often the forecast got the direction right
+def walk_forward_summary(table):
+    hit = np.sign(table["Forecast"] - table["Previous"]) == np.sign(table["Actual"] - table["Previous"])
+    return {
+        "Steps": len(table),
+        "MAE": round(float(table["Error"].abs().mean()), 4),
+        "MAPE %": round(float((table["Error"].abs() / table["Actual"]).mean() * 100), 3),
+        "Direction %": round(float(hit.mean() * 100), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit ARIMA models per symbol and print their forecasts.")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--order", nargs=3, type=int, default=list(ORDER), metavar=("P", "D", "Q"))
+    parser.add_argument("--horizon", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="Symbols fitted in parallel")
+    parser.add_argument("--walk-forward", action="store_true", help="Evaluate instead of forecasting")
+    parser.add_argument("--train", type=int, default=250, help="Initial training bars for --walk-forward")
+    args = parser.parse_args(argv)
+
+    from data import get_price_data
+
+    end = datetime.now()
+    frames = {symbol: get_price_data(symbol, start=end - timedelta(days=args.days), end=end,
+                                     interval=args.interval) for symbol in args.symbols}
+
+    if args.walk_forward:
+        rows = {}
+        for symbol, data in frames.items():
+            try:
+                rows[symbol] = walk_forward_summary(walk_forward(
+                    data["Close"], tuple(args.order), args.train, args.horizon))
+            except Exception as e:
+                print(f"Error evaluating {symbol}: {e}")
+        print(pd.DataFrame(rows).T.to_string())
+        return 0
+
+    store = ForecastModels(tuple(args.order))
+    train(frames, args.workers, store, args.interval)
+    for symbol, data in frames.items():
+        levels = forecast_levels(symbol, data, args.horizon, store=store, interval=args.interval)
+        if levels is None:
+            continue
+        print(f"\n{symbol}: close {float(data['Close'].iloc[-1]):.2f} -> {levels[0]} "
+              f"(target {levels[1]}, stop {levels[2]})")
+        print(store.forecast(symbol, data, args.horizon, interval=args.interval).round(2).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
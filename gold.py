@@ -1,132 +1,20 @@
+import uuid
 import streamlit as st
-import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
-from pycoingecko import CoinGeckoAPI
-import time
-import threading
-
-# --- Functions ---
-# Fetch live price from CoinGecko
-@st.cache_data(ttl=30)
-def get_live_price(symbol):
-    cg = CoinGeckoAPI()
-    coin_id = symbol.lower()
-    try:
-        data = cg.get_price(ids=coin_id, vs_currencies='usd')
-        return data[coin_id]['usd'] if coin_id in data else None
-    except Exception as e:
-        print(f"Error fetching live price from CoinGecko: {e}")
-        return None
-
-# Get historical data
-def get_price_data(symbol, start, end):
-    historical_data = yf.download(symbol, start=start, end=end, auto_adjust=True)
-    return historical_data
-
-# Compute RSI (Relative Strength Index)
-def compute_rsi(series, period=14):
-    delta = series.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-
-    # Handling NaN values during rolling mean calculation
-    avg_gain = gain.rolling(window=period, min_periods=1).mean()
-    avg_loss = loss.rolling(window=period, min_periods=1).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    
-    # Return only non-NaN RSI values
-    return rsi
-
-
-# Compute ATR (Average True Range)
-def compute_atr(data, period=14):
-    high = data['High']
-    low = data['Low']
-    close = data['Close']
-
-    # Calculate True Range (TR)
-    tr1 = high - low
-    tr2 = (high - close.shift()).abs()
-    tr3 = (low - close.shift()).abs()
-
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    # ATR with a rolling window
-    atr = tr.rolling(window=period, min_periods=1).mean()
-    
-    return atr
-
-
-# Intraday Strategy (EMA 10 & EMA 30 with RSI and ATR)
-# Intraday Strategy (EMA 10 & EMA 30 with RSI and ATR)
-def intraday_strategy(data, target_profit_percent=0.05, stop_loss_percent=0.03):
-    # Calculate indicators
-    data['EMA_10'] = data['Close'].ewm(span=10, adjust=False).mean()
-    data['EMA_30'] = data['Close'].ewm(span=30, adjust=False).mean()
-    data['RSI'] = compute_rsi(data['Close'], period=14)
-    data['ATR'] = compute_atr(data, period=14)
-
-    # Get latest values
-    latest_price = float(data['Close'].iloc[-1])
-    ema_10 = float(data['EMA_10'].iloc[-1])
-    ema_30 = float(data['EMA_30'].iloc[-1])
-    rsi = float(data['RSI'].iloc[-1])
-    atr = float(data['ATR'].iloc[-1])
-
-    # Signal logic
-    signal = ""
-    target_price = latest_price
-    stop_loss = latest_price
-
-    # Adjusted ATR threshold for small intraday moves
-    min_atr_threshold = latest_price * 0.0003  # e.g., 0.03%
-    if atr < min_atr_threshold:
-        return "Hold", round(latest_price, 2), round(latest_price, 2)
-
-    # Buy Signal
-    if ema_10 > ema_30 and rsi > 50:
-        signal = "Buy"
-        target_price = latest_price * (1 + target_profit_percent / 100)
-        stop_loss = latest_price * (1 - stop_loss_percent / 100)
-
-    # Sell Signal
-    elif ema_10 < ema_30 and rsi < 50:
-        signal = "Sell"
-        target_price = latest_price * (1 - target_profit_percent / 100)
-        stop_loss = latest_price * (1 + stop_loss_percent / 100)
-    else:
-        signal = "Hold"
-
-    return signal, round(target_price, 2), round(stop_loss, 2)
-
-def longterm_strategy(data, target_profit_percent=5.0, stop_loss_percent=2.0):
-    data['EMA_200'] = data['Close'].ewm(span=200, adjust=False).mean()
-    data['RSI'] = compute_rsi(data['Close'], period=14)
-    data['ATR'] = compute_atr(data, period=14)
-
-    latest_price = float(data['Close'].iloc[-1])
-    ema_200 = float(data['EMA_200'].iloc[-1])
-    rsi = float(data['RSI'].iloc[-1])
-    atr = float(data['ATR'].iloc[-1])
-    signal = "Hold"
-    target_price = latest_price
-    stop_loss = latest_price
-
-    if latest_price > ema_200 and rsi > 50:
-        signal = "Buy"
-        target_price = latest_price * (1 + target_profit_percent / 100)
-        stop_loss = latest_price * (1 - stop_loss_percent / 100)
-    elif latest_price < ema_200 and rsi < 50:
-        signal = "Sell"
-        target_price = latest_price * (1 - target_profit_percent / 100)
-        stop_loss = latest_price * (1 + stop_loss_percent / 100)
-
-    return signal, round(target_price, 2), round(stop_loss, 2)
-
-
+from data import get_live_price, get_price_data
+from strategies import gold_intraday_strategy as intraday_strategy
+from strategies import gold_longterm_strategy as longterm_strategy
+from strategies import PROFILES
+from scheduler import scheduler
+from memo import memoize
+import metrics
+import chart
+import forecast
+import sentiment
+
+# Reruns on unchanged bars reuse the previous result (process-wide LRU)
+intraday_strategy = memoize(intraday_strategy)
+longterm_strategy = memoize(longterm_strategy)
 
 # --- Streamlit Interface ---
 st.set_page_config(page_title="Smart Profit Predictor", layout="wide")
@@ -161,38 +49,56 @@ print(data)
 if data.empty:
     st.error("No data found for this asset.")
 else:
-    st.line_chart(data['Close'])
-
-    # Live price
-    live_price = get_live_price("bitcoin" if "BTC-USD" in symbol else "ethereum")
-    if live_price:
-        st.subheader(f"Live Price: ${live_price}")
-
     # Strategy result
     if strategy_type == "Intraday":
         signal, target_price, stop_loss = intraday_strategy(data)
     elif strategy_type == "Long-term":
         signal, target_price, stop_loss = longterm_strategy(data)
 
+    # Price with target / stop-loss, downsampled to the chart width
+    chart.line_chart(symbol, data, target_price, stop_loss)
+
+    # Live price
+    live_price = get_live_price("bitcoin" if "BTC-USD" in symbol else "ethereum")
+    if live_price:
+        st.subheader(f"Live Price: ${live_price}")
+
     st.subheader(f"📊 {strategy_type} Strategy Results")
     st.metric("Signal", signal)
     st.metric("Target Price", f"${target_price:.2f}")
     st.metric("Stop Loss", f"${stop_loss:.2f}")
 
+    # Headline sentiment from the local news feeds (MARKET_NEWS_DIR), aligned to the bars
+    news_sentiment = sentiment.latest_sentiment(symbol, data)
+    if news_sentiment is not None:
+        st.metric("News Sentiment", f"{news_sentiment:+.2f}")
+
     if signal in ["Buy", "Sell"]:
         st.success(f"Action: {signal} | Target: {target_price} | Stop-Loss: {stop_loss}")
 
-# --- Background Task for Continuous Monitoring ---
-def run_continuous():
-    while True:
-        data = get_price_data(symbol, start=start_date, end=end_date)
-        if strategy_type == "Intraday":
-            signal,buy, target_price, stop_loss = intraday_strategy(data)
-        elif strategy_type == "Long-term":
-            signal,target_price, stop_loss = longterm_strategy(data)
-
-        # Add alert or logging here if needed
-        time.sleep(30)
-
-thread = threading.Thread(target=run_continuous, daemon=True)
-thread.start()
+    # ARIMA forecast next to the rule-based levels (fits cached per symbol and interval, see forecast.py)
+    if strategy_type == "Long-term" and st.sidebar.checkbox("ARIMA forecast"):
+        forecast_result = forecast.forecast_levels(symbol, data)
+        if forecast_result:
+            forecast_signal, forecast_target, forecast_stop = forecast_result
+            st.subheader("🔮 ARIMA Forecast (5 bars)")
+            st.metric("Forecast Signal", forecast_signal)
+            st.metric("Forecast Target", f"${forecast_target:.2f}")
+            st.metric("Forecast Stop Loss", f"${forecast_stop:.2f}")
+        else:
+            st.info("Not enough bars for a forecast.")
+
+# Optional timing panel for fetch / indicator / strategy / chart stages
+show_timing = st.sidebar.checkbox("Show timing panel")
+metrics.request(st.session_state.setdefault('metrics_caller', uuid.uuid4().hex), show_timing)
+if show_timing:
+    metrics.render_debug_panel()
+
+# --- Background Monitoring (shared scheduler) ---
+# One process-wide thread polls each symbol once per tick for all sessions;
+# email / webhook alerts on signal changes are sent by alerts.bus (ALERT_* env vars).
+# Subscriptions are keyed by the registered strategy, not the sidebar label
+strategy_funcs = {"Intraday": intraday_strategy, "Long-term": longterm_strategy}
+st.session_state['subscription'] = scheduler.subscribe(
+    symbol, PROFILES["gold"][strategy_type], strategy_funcs[strategy_type],
+    days=days, subscriber=st.session_state.get('subscription'))
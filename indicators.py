@@ -0,0 +1,265 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from metrics import timed
+
+# --- Indicator Kernels ---
+# Shared by the Streamlit scripts, the backtester and the batch tools.
+# Series versions take/return pandas objects; *_array / *_into versions work
+# on plain NumPy arrays for the vectorized engines. Both give the same numbers.
+
+
+# EMA with pandas `adjust=False` semantics
+def ema(series, span):
+    return series.ewm(span=span, adjust=False).mean()
+
+
+# Compute RSI (Relative Strength Index); smoothing "sma" (rolling mean, as
+# before) or "wilder". Gaps (NaN) are skipped: SMA through the pandas
+# version, Wilder by smoothing the valid bars only.
+@timed("indicator.compute_rsi")
+def compute_rsi(series, period=14, smoothing="sma"):
+    values = series.to_numpy(dtype=float)
+    if np.isnan(values).any():
+        if smoothing == "sma":
+            return compute_rsi_pandas(series, period)
+        valid = series.dropna()
+        return pd.Series(rsi_array(valid.to_numpy(dtype=float), period, smoothing),
+                         index=valid.index).reindex(series.index)
+    return pd.Series(rsi_array(values, period, smoothing), index=series.index)
+
+
+# Compute ATR (Average True Range), same smoothing options as compute_rsi
+@timed("indicator.compute_atr")
+def compute_atr(data, period=14, smoothing="sma"):
+    ohlc = data[["High", "Low", "Close"]]
+    if ohlc.isna().to_numpy().any():
+        if smoothing == "sma":
+            return compute_atr_pandas(data, period)
+        ohlc = ohlc.dropna()
+    high, low, close = (ohlc[column].to_numpy(dtype=float) for column in ("High", "Low", "Close"))
+    return pd.Series(atr_array(high, low, close, period, smoothing), index=ohlc.index).reindex(data.index)
+
+
+# Original pandas implementations, kept as the reference (and for inputs with NaN)
+def compute_rsi_pandas(series, period=14):
+    delta = series.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+
+    # Handling NaN values during rolling mean calculation
+    avg_gain = gain.rolling(window=period, min_periods=1).mean()
+    avg_loss = loss.rolling(window=period, min_periods=1).mean()
+
+    rs = avg_gain / avg_loss
+    rsi = 100 - (100 / (1 + rs))
+
+    return rsi
+
+
+def compute_atr_pandas(data, period=14):
+    high = data['High']
+    low = data['Low']
+    close = data['Close']
+
+    # Calculate True Range (TR)
+    tr1 = high - low
+    tr2 = (high - close.shift()).abs()
+    tr3 = (low - close.shift()).abs()
+
+    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
+    # ATR with a rolling window
+    atr = tr.rolling(window=period, min_periods=1).mean()
+
+    return atr
+
+
+# --- NumPy kernels ---
+# A span of 1 is the input itself
+def ema_array(close, span):
+    if span <= 1:
+        return close
+    return pd.Series(close).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+# Trailing mean over up to `period` values, like rolling(period, min_periods=1).mean()
+def rolling_mean(values, period):
+    csum = np.cumsum(values)
+    out = csum.copy()
+    out[period:] = csum[period:] - csum[:-period]
+    counts = np.minimum(np.arange(1, len(values) + 1), period)
+    return out / counts
+
+
+# RSI as compute_rsi (first bar has no delta)
+def rsi_array(close, period=14, smoothing="sma"):
+    close = np.asarray(close, dtype=float)
+    return rsi_into(close, period, np.empty(len(close)), np.empty((3, len(close))), smoothing)
+
+
+# ATR as compute_atr
+def atr_array(high, low, close, period=14, smoothing="sma"):
+    close = np.asarray(close, dtype=float)
+    return atr_into(np.asarray(high, dtype=float), np.asarray(low, dtype=float), close, period,
+                    np.empty(len(close)), np.empty((3, len(close))), smoothing)
+
+
+# --- In-place kernels ---
+# Write into caller-provided `out` / `work` arrays (e.g. reusable scratch
+# buffers), so evaluating many symbols does not allocate a full-length array
+# per indicator. smoothing="sma" is the trailing mean of up to `period`
+# values (the original gold.py behaviour); "wilder" is Wilder's average,
+# seeded with the plain mean of the first `period` values, so RSI and ATR
+# start at bar `period` as in TA-Lib. A window without any movement has RSI 50.
+
+_local = threading.local()
+_STEPS = np.arange(1, 4097, dtype=float)
+
+
+# Blocks of the closed-form EMA are kept short enough that decay**-block stays finite
+def _ema_block(alpha, limit=4096):
+    decay = 1.0 - alpha
+    return int(max(1, min(limit, 500 / -np.log(decay))))
+
+
+# Per-thread (3, block) buffer for the EMA recursion
+def _ewm_work(block):
+    work = getattr(_local, "ewm", None)
+    if work is None or work.shape[1] < block:
+        work = _local.ewm = np.empty((3, block))
+    return work
+
+
+# y[0] = first (or values[0]); y[t] = y[t-1] + alpha * (values[t] - y[t-1]), computed
+# block by block as y = decay**(k+1) * (prev + alpha * cumsum(x * decay**-(j+1))).
+# `values` and `out` may be the same array.
+def _ewm_into(values, alpha, out, work=None, first=None):
+    n = len(values)
+    if n == 0:
+        return out[:0]
+    if alpha >= 1.0:
+        np.copyto(out[:n], values)
+        if first is not None:
+            out[0] = first
+        return out[:n]
+    block = _ema_block(alpha)
+    if work is None:
+        work = _ewm_work(block)
+    steps = _STEPS[:block]
+    growth = np.power(1.0 - alpha, -steps, out=work[0, :block])
+    decay = np.power(1.0 - alpha, steps, out=work[1, :block])
+    terms = work[2]
+
+    out[0] = values[0] if first is None else first
+    prev = out[0]
+    for start in range(1, n, block):
+        size = min(block, n - start)
+        chunk = terms[:size]
+        np.multiply(values[start:start + size], growth[:size], out=chunk)
+        np.cumsum(chunk, out=chunk)
+        chunk *= alpha
+        chunk += prev
+        np.multiply(chunk, decay[:size], out=out[start:start + size])
+        prev = out[start + size - 1]
+    return out[:n]
+
+
+# EMA with pandas `adjust=False` semantics
+def ema_into(values, span, out, work=None):
+    n = len(values)
+    if span <= 1:
+        np.copyto(out[:n], values)
+        return out[:n]
+    return _ewm_into(values, 2.0 / (span + 1), out, work)
+
+
+# Trailing mean over up to `period` values; `work` holds the running sum
+def rolling_mean_into(values, period, out, work):
+    n = len(values)
+    csum = np.cumsum(values, out=work[:n])
+    head = min(period, n)
+    out[:head] = csum[:head]
+    if n > period:
+        np.subtract(csum[period:], csum[:-period], out=out[period:n])
+    out[:head] /= np.arange(1, head + 1)
+    out[head:n] /= period
+    return out[:n]
+
+
+# Wilder's average: NaN for the first period - 1 values, then their mean, then alpha = 1 / period
+def wilder_mean_into(values, period, out):
+    n = len(values)
+    if n < period:
+        out[:n] = np.nan
+        return out[:n]
+    seed = values[:period].sum() / period
+    out[:period - 1] = np.nan
+    _ewm_into(values[period - 1:], 1.0 / period, out[period - 1:n], first=seed)
+    return out[:n]
+
+
+def _smooth_into(values, period, out, work, smoothing):
+    if period < 1:
+        raise ValueError(f"Period must be at least 1, got {period}")
+    if smoothing == "sma":
+        return rolling_mean_into(values, period, out, work)
+    if smoothing == "wilder":
+        return wilder_mean_into(values, period, out)
+    raise ValueError(f"Unknown smoothing: {smoothing}")
+
+
+# RSI = 100 * avg_gain / (avg_gain + avg_loss); `work` is (3, n) scratch
+def rsi_into(close, period, out, work, smoothing="sma"):
+    n = len(close)
+    if n == 0:
+        return out[:0]
+    out[0] = np.nan
+    if n < 2:
+        return out[:n]
+    delta, gain, loss = work[0, :n - 1], work[1, :n - 1], work[2, :n - 1]
+    np.subtract(close[1:], close[:-1], out=delta)
+    np.maximum(delta, 0.0, out=gain)
+    _smooth_into(gain, period, gain, out[1:n], smoothing)
+    np.negative(delta, out=delta)
+    np.maximum(delta, 0.0, out=loss)
+    _smooth_into(loss, period, loss, out[1:n], smoothing)
+
+    rsi = out[1:n]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.add(gain, loss, out=delta)
+        np.divide(gain, delta, out=rsi)
+    rsi *= 100.0
+    # No movement in the window (0 / 0) is neutral
+    np.copyto(rsi, 50.0, where=delta == 0)
+    return out[:n]
+
+
+# High - low, widened to the previous close (first bar: high - low)
+def true_range_into(high, low, close, out, work):
+    n = len(close)
+    np.subtract(high[:n], low[:n], out=out[:n])
+    if n > 1:
+        gap = work[:n - 1]
+        np.subtract(high[1:n], close[:n - 1], out=gap)
+        np.abs(gap, out=gap)
+        np.fmax(out[1:n], gap, out=out[1:n])
+        np.subtract(low[1:n], close[:n - 1], out=gap)
+        np.abs(gap, out=gap)
+        np.fmax(out[1:n], gap, out=out[1:n])
+    return out[:n]
+
+
+# ATR; `work` is (3, n) scratch. Wilder skips the first bar, which has no previous close.
+def atr_into(high, low, close, period, out, work, smoothing="sma"):
+    n = len(close)
+    if n == 0:
+        return out[:0]
+    tr = true_range_into(high, low, close, work[0, :n], work[1])
+    if smoothing == "wilder":
+        out[0] = np.nan
+        _smooth_into(tr[1:], period, out[1:n], work[1], smoothing)
+        return out[:n]
+    return _smooth_into(tr, period, out, work[1], smoothing)
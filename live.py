@@ -0,0 +1,204 @@
+import argparse
+import csv
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from memo import fingerprint
+from resample import INTERVALS
+from streaming import StreamingIndicators
+from strategies import STRATEGY_PARAMS, signal_from_values
+
+# --- Live Tick Pipeline ---
+# Merges live quotes into the in-progress bar (1m ... 1d) and re-evaluates a
+# registered strategy on every quote. Closed bars are committed to the
+# streaming indicators once; the open bar is only peeked at, so each quote
+# costs O(1) however long the history is. Results match running the frame
+# strategy on history + closed bars + the current partial bar.
+#   python live.py --replay quotes.jsonl --history BTC-USD.csv --interval 1m
+#   python live.py --coin bitcoin --record quotes.jsonl --poll 5
+
+class BarAggregator:
+    def __init__(self, interval="1m"):
+        self.freq = INTERVALS.get(interval, interval)
+        self.bar = None  # {"Start", "Open", "High", "Low", "Close"}
+
+    def start(self, start, open_, high, low, close):
+        self.bar = {"Start": pd.Timestamp(start), "Open": open_, "High": high, "Low": low, "Close": close}
+
+    # Add a quote; returns the bar it closed, if any. Quotes older than the open bar are ignored.
+    def update(self, ts, price):
+        bucket = pd.Timestamp(ts).floor(self.freq)
+        bar = self.bar
+        if bar is not None and bucket < bar["Start"]:
+            return None
+        if bar is not None and bucket == bar["Start"]:
+            bar["High"] = max(bar["High"], price)
+            bar["Low"] = min(bar["Low"], price)
+            bar["Close"] = price
+            return None
+        self.start(bucket, price, price, price, price)
+        return bar
+
+
+class LivePipeline:
+    def __init__(self, strategy="intraday", interval="1m", history=None, on_signal=None):
+        self.strategy = strategy
+        params = STRATEGY_PARAMS[strategy]
+        self.fast, self.slow = params["fast"], params["slow"]
+        self.indicators = StreamingIndicators(
+            ema_spans=tuple(span for span in (self.fast, self.slow) if span > 1),
+            rsi_period=params.get("rsi_period") or 14,
+            atr_period=params.get("atr_period", 14))
+        self.aggregator = BarAggregator(interval)
+        self.on_signal = on_signal
+        self.last_signal = None
+        self.closed_bars = []
+        # Quotes from different sessions / threads update the same streaming state
+        self._lock = threading.Lock()
+        if history is not None and not history.empty:
+            self.seed(history)
+
+    # All but the last history bar are final; the last one may still be forming
+    def seed(self, history):
+        history = history.copy()
+        for column in ("High", "Low"):
+            if column not in history:
+                history[column] = history["Close"]
+        last = history.iloc[-1]
+        open_ = float(last["Open"]) if "Open" in history else float(last["Close"])
+        with self._lock:
+            self.indicators.update_frame(history.iloc[:-1])
+            self.aggregator.start(history.index[-1], open_, float(last["High"]), float(last["Low"]),
+                                  float(last["Close"]))
+
+    def _line(self, values, span):
+        return values["Close"] if span <= 1 else values[f"EMA_{span}"]
+
+    def on_quote(self, ts, price):
+        price = float(price)
+        with self._lock:
+            closed = self.aggregator.update(ts, price)
+            if closed is not None:
+                self.indicators.update(closed["High"], closed["Low"], closed["Close"])
+                self.closed_bars.append(closed)
+
+            bar = self.aggregator.bar
+            values = self.indicators.peek(bar["High"], bar["Low"], bar["Close"])
+            signal, target_price, stop_loss = signal_from_values(
+                self.strategy, values["Close"], self._line(values, self.fast), self._line(values, self.slow),
+                values["RSI"], values["ATR"])
+
+            result = {
+                "Time": pd.Timestamp(ts), "Bar": bar["Start"], "Price": price, "Signal": signal,
+                "Target Price": target_price, "Stop Loss": stop_loss, "Changed": signal != self.last_signal,
+            }
+            self.last_signal = signal
+        if self.on_signal is not None:
+            self.on_signal(result)
+        return result
+
+
+# Process-wide pipelines so Streamlit reruns keep their streaming state
+_pipelines = {}  # (symbol, strategy, interval) -> (fingerprint of the seed history, pipeline)
+_pipelines_lock = threading.Lock()
+
+
+# A pipeline is rebuilt when `history` is not what it was seeded with: another
+# days window, or bars the cache has added or revised since
+def pipeline_for(symbol, strategy="intraday", interval="1d", history=None):
+    key = (symbol, strategy, interval)
+    seeded = None if history is None or history.empty else fingerprint(history)
+    with _pipelines_lock:
+        entry = _pipelines.get(key)
+        if entry is None or entry[0] != seeded:
+            entry = _pipelines[key] = (seeded, LivePipeline(strategy, interval, history))
+        return entry[1]
+
+
+# --- Recorded quote streams ---
+# JSONL lines {"time": ..., "price": ...} or CSV with time/timestamp and price columns
+def read_quotes(path):
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                yield pd.Timestamp(row.get("time") or row["timestamp"]), float(row["price"])
+    else:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    quote = json.loads(line)
+                    yield pd.Timestamp(quote.get("time") or quote["timestamp"]), float(quote["price"])
+
+
+def replay(path, pipeline):
+    return pd.DataFrame([pipeline.on_quote(ts, price) for ts, price in read_quotes(path)])
+
+
+# Poll the quote gateway; optionally append every quote to a JSONL recording
+def run_live(coin_id, pipeline, poll_seconds=5, record=None, limit=None):
+    from data import get_live_price
+
+    out = open(record, "a") if record else None
+    try:
+        count = 0
+        while limit is None or count < limit:
+            price = get_live_price(coin_id)
+            if price is not None:
+                now = datetime.now()
+                if out is not None:
+                    out.write(json.dumps({"time": now.isoformat(), "price": price}) + "\n")
+                    out.flush()
+                result = pipeline.on_quote(now, price)
+                if result["Changed"]:
+                    print(f"{now:%H:%M:%S} {result['Signal']} @ {price} | "
+                          f"Target: {result['Target Price']} | Stop-Loss: {result['Stop Loss']}", flush=True)
+            count += 1
+            time.sleep(poll_seconds)
+    finally:
+        if out is not None:
+            out.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge live quotes into bars and re-evaluate a strategy per quote.")
+    parser.add_argument("--strategy", default="intraday", choices=sorted(STRATEGY_PARAMS))
+    parser.add_argument("--interval", default="1m", choices=sorted(INTERVALS))
+    parser.add_argument("--history", help="CSV/Parquet bars to seed the indicators with")
+    parser.add_argument("--replay", help="Recorded quotes (.jsonl or .csv) to feed instead of polling")
+    parser.add_argument("--coin", default="bitcoin", help="CoinGecko id to poll")
+    parser.add_argument("--poll", type=float, default=5, help="Seconds between live quotes")
+    parser.add_argument("--record", help="Append polled quotes to this JSONL file")
+    parser.add_argument("-o", "--output", help="Write replay results to this CSV")
+    parser.add_argument("--alerts", action="store_true", help="Publish signal changes to the alert sinks (ALERT_* env)")
+    args = parser.parse_args(argv)
+
+    history = None
+    if args.history:
+        history = (pd.read_parquet(args.history) if args.history.endswith(".parquet")
+                   else pd.read_csv(args.history, index_col=0, parse_dates=True))
+    pipeline = LivePipeline(args.strategy, args.interval, history)
+    if args.alerts:
+        import alerts
+
+        pipeline.on_signal = lambda result: alerts.bus.publish(
+            args.coin, args.strategy, args.interval, (result["Signal"], result["Target Price"], result["Stop Loss"]))
+
+    try:
+        if args.replay:
+            results = replay(args.replay, pipeline)
+            results.to_csv(args.output or sys.stdout, index=False)
+        else:
+            run_live(args.coin, pipeline, args.poll, args.record)
+    finally:
+        if args.alerts:
+            alerts.bus.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+# --- Strategy Result Memoization ---
+# Streamlit reruns the whole script on every widget change and the scheduler
+# re-evaluates every tick, usually on the same bars. Results are kept in a
+# bounded, process-wide LRU keyed by (strategy, parameters, data fingerprint).
+# The fingerprint covers the length, the first timestamp and the last `tail`
+# bars, so a new or updated bar (or a different window) is a new key and
+# stale entries simply age out. Plain module state: works the same in
+# Streamlit, the CLI and workers.
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def fingerprint(data, tail=256):
+    digest = hashlib.blake2b(digest_size=16)
+    index = data.index
+    columns = data.columns.tolist()
+    # Only OHLCV: strategies add indicator columns to the frames they are given
+    positions = [i for i, column in enumerate(columns) if column in COLUMNS]
+    if isinstance(index, pd.DatetimeIndex):
+        head, times = index.asi8[0], index.asi8[-tail:].tobytes()
+    else:
+        head, times = index[0], pd.util.hash_pandas_object(index[-tail:]).to_numpy().tobytes()
+    digest.update(repr((len(data), head, index.dtype, [columns[i] for i in positions])).encode())
+    digest.update(times)
+    block = data.iloc[-tail:].to_numpy()[:, positions]
+    digest.update(np.ascontiguousarray(block, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class StrategyCache:
+    def __init__(self, maxsize=512, tail=256):
+        self.maxsize = maxsize
+        self.tail = tail
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, name, func, data, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        key = (name, args, tuple(sorted(kwargs.items())), fingerprint(data, self.tail))
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                metrics.count("memo.hit")
+                return self.entries[key]
+        metrics.count("memo.miss")
+        result = func(data, *args, **kwargs)
+        with self._lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+# Process-wide cache shared by every memoized strategy
+cache = StrategyCache()
+
+
+# Same call signature as `func`; on a hit `data` is not touched (no indicator columns added)
+def memoize(func, name=None, store=None):
+    name = name or func.__name__
+
+    @wraps(func)
+    def wrapper(data, *args, **kwargs):
+        if data is None or len(data) == 0:
+            return func(data, *args, **kwargs)
+        return (store or cache).get_or_compute(name, func, data, args, kwargs)
+
+    wrapper.uncached = func
+    return wrapper
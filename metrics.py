@@ -0,0 +1,177 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# --- Hot-path Instrumentation ---
+# Timing spans and counters for fetch, indicator, strategy and chart stages.
+# Off by default: a disabled span/decorator is one flag check. Turn it on
+# with MARKET_METRICS=1, metrics.enable(), or per session with
+# metrics.request(), a lease each rerun renews. Data can be shown with render_debug_panel() or exported
+# with prometheus_text().
+
+_enabled = os.environ.get("MARKET_METRICS", "") not in ("", "0")
+_forced = _enabled
+_requests = {}  # caller -> lease expiry (time.monotonic())
+_next_expiry = math.inf
+# Seconds a request stays on without being renewed, like the scheduler's subscriptions
+REQUEST_LEASE = float(os.environ.get("MARKET_METRICS_LEASE", "900"))
+_lock = threading.Lock()
+spans = {}     # name -> [count, total seconds, max seconds]
+counters = {}  # name -> count
+
+
+# Drop lapsed requests and recompute the flag; caller holds _lock
+def _expire(now):
+    global _enabled, _next_expiry
+    for caller in [c for c, expires in _requests.items() if expires <= now]:
+        del _requests[caller]
+    _next_expiry = min(_requests.values(), default=math.inf)
+    _enabled = _forced or bool(_requests)
+
+
+def enable(on=True):
+    global _forced
+    with _lock:
+        _forced = on
+        _expire(time.monotonic())
+
+
+# Recording on behalf of one caller (e.g. a Streamlit session's checkbox): it
+# stays on while any caller wants it, so one session can't switch it off for
+# another. Each call renews the caller's lease; a session that closes without
+# unticking the box stops counting once its lease runs out.
+def request(caller, on=True):
+    with _lock:
+        if on:
+            _requests[caller] = time.monotonic() + REQUEST_LEASE
+        else:
+            _requests.pop(caller, None)
+        _expire(time.monotonic())
+
+
+# Checked only while recording, so the last lapsed lease turns recording off
+def _active():
+    if _forced or time.monotonic() < _next_expiry:
+        return True
+    with _lock:
+        _expire(time.monotonic())
+    return _enabled
+
+
+def enabled():
+    return _enabled and _active()
+
+
+def reset():
+    with _lock:
+        spans.clear()
+        counters.clear()
+
+
+def record(name, seconds):
+    with _lock:
+        stat = spans.get(name)
+        if stat is None:
+            spans[name] = [1, seconds, seconds]
+        else:
+            stat[0] += 1
+            stat[1] += seconds
+            if seconds > stat[2]:
+                stat[2] = seconds
+
+
+def count(name, n=1):
+    if not (_enabled and _active()):
+        return
+    with _lock:
+        counters[name] = counters.get(name, 0) + n
+
+
+@contextmanager
+def span(name):
+    if not (_enabled and _active()):
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+# Decorator form of span()
+def timed(name):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (_enabled and _active()):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    with _lock:
+        rows = [{"Span": name, "Calls": c, "Total (s)": total, "Mean (ms)": total / c * 1000, "Max (ms)": peak * 1000}
+                for name, (c, total, peak) in sorted(spans.items())]
+        return rows, dict(counters), threading.active_count()
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Prometheus text exposition format
+def prometheus_text():
+    rows, counts, threads = snapshot()
+    lines = [
+        "# HELP market_span_seconds Time spent in instrumented stages.",
+        "# TYPE market_span_seconds summary",
+    ]
+    for row in rows:
+        label = _label(row["Span"])
+        lines.append(f'market_span_seconds_count{{span="{label}"}} {row["Calls"]}')
+        lines.append(f'market_span_seconds_sum{{span="{label}"}} {row["Total (s)"]:.9f}')
+    lines += [
+        "# HELP market_span_max_seconds Slowest call per stage.",
+        "# TYPE market_span_max_seconds gauge",
+    ]
+    for row in rows:
+        lines.append(f'market_span_max_seconds{{span="{_label(row["Span"])}"}} {row["Max (ms)"] / 1000:.9f}')
+    lines += [
+        "# HELP market_events_total Cache hits/misses and other events.",
+        "# TYPE market_events_total counter",
+    ]
+    for name, value in sorted(counts.items()):
+        lines.append(f'market_events_total{{event="{_label(name)}"}} {value}')
+    lines += [
+        "# HELP market_threads Live threads in the process.",
+        "# TYPE market_threads gauge",
+        f"market_threads {threads}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# Optional Streamlit debug panel (Streamlit is only imported here)
+def render_debug_panel():
+    import pandas as pd
+    import streamlit as st
+
+    rows, counts, threads = snapshot()
+    with st.expander("⏱️ Timing / debug", expanded=False):
+        if not enabled():
+            st.info("Instrumentation is off. Set MARKET_METRICS=1 or tick the sidebar option to record.")
+        st.write(f"Threads: {threads}")
+        if rows:
+            st.dataframe(pd.DataFrame(rows).set_index("Span"))
+        if counts:
+            st.dataframe(pd.Series(counts, name="Count"))
+        st.download_button("Export (Prometheus)", prometheus_text(), file_name="metrics.prom")
@@ -0,0 +1,100 @@
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import backtest
+from strategies import STRATEGY_PARAMS
+
+# --- Parameter Sweep Optimizer ---
+# Grid or random search over strategy parameters, evaluated with the
+# vectorized backtester across a process pool. Close/High/Low are placed in
+# one shared-memory block that workers map once at start-up, so only the
+# small parameter dicts and result rows cross process boundaries.
+
+# Lower is better for these metrics; everything else is ranked descending
+ASCENDING_METRICS = {"max_drawdown"}
+
+
+# Every combination of the given value lists
+def param_grid(**ranges):
+    names = list(ranges)
+    for values in itertools.product(*(ranges[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+# `n` random draws; each range is a list to choose from or a (low, high) float tuple
+def random_params(n, seed=None, **ranges):
+    rng = random.Random(seed)
+    for _ in range(n):
+        params = {}
+        for name, space in ranges.items():
+            if isinstance(space, tuple):
+                params[name] = rng.uniform(*space)
+            else:
+                params[name] = rng.choice(list(space))
+        yield params
+
+
+def _valid(params):
+    return params["fast"] < params["slow"]
+
+
+# --- Worker side ---
+_worker = {}
+
+
+def _init_worker(shm_name, length):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = np.ndarray((3, length), dtype=np.float64, buffer=shm.buf)
+    _worker["shm"] = shm  # keep the mapping alive for the worker's lifetime
+    _worker["close"], _worker["high"], _worker["low"] = arrays
+    _worker["cache"] = {}
+
+
+def _evaluate_chunk(chunk, max_holding):
+    close, high, low = _worker["close"], _worker["high"], _worker["low"]
+    rows = []
+    for params in chunk:
+        direction, target_price, stop_loss = backtest.signal_arrays(
+            close, high, low, cache=_worker["cache"], **params)
+        _, _, pnl, _ = backtest.run_backtest(close, high, low, direction, target_price, stop_loss, max_holding)
+        rows.append({**params, **backtest.summarize(pnl)})
+    return rows
+
+
+# --- Driver ---
+def optimize(data, param_sets, strategy="intraday", metric="total_return", workers=None,
+             chunk_size=64, max_holding=250, min_trades=1):
+    close, high, low = backtest.ohlc_arrays(data)
+    base = STRATEGY_PARAMS[strategy]
+    candidates = [p for p in ({**base, **params} for params in param_sets) if _valid(p)]
+    # Group by spans so each worker's indicator cache gets reused across its chunk
+    candidates.sort(key=lambda p: (p["fast"], p["slow"], p.get("rsi_period") or 0))
+    workers = workers or os.cpu_count()
+    # Several chunks per worker keeps the pool balanced on small sweeps
+    chunk_size = max(1, min(chunk_size, -(-len(candidates) // (workers * 4))))
+    chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+
+    shm = shared_memory.SharedMemory(create=True, size=3 * len(close) * 8)
+    try:
+        arrays = np.ndarray((3, len(close)), dtype=np.float64, buffer=shm.buf)
+        arrays[0], arrays[1], arrays[2] = close, high, low
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker, initargs=(shm.name, len(close))) as pool:
+            rows = [row for chunk_rows in pool.map(_evaluate_chunk, chunks, itertools.repeat(max_holding))
+                    for row in chunk_rows]
+        del arrays
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results = pd.DataFrame(rows)
+    if results.empty:
+        return results
+    results = results[results["trades"] >= min_trades]
+    return results.sort_values(metric, ascending=metric in ASCENDING_METRICS).reset_index(drop=True)
@@ -0,0 +1,323 @@
+import hashlib
+import os
+import pickle
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import pandas as pd
+
+import metrics
+
+# --- Provider Layer ---
+# Every external call (Yahoo bars, CoinGecko quotes, Alpha Vantage series and
+# rates) goes through a Source with its own timeout, retries with
+# exponential backoff limited by a retry budget, and a circuit breaker that
+# stops calling a provider that keeps failing. Requests list alternatives in
+# order, e.g. gold history from Alpha Vantage XAUUSD=X and then Yahoo GC=F,
+# and the first source that returns data wins.
+# MARKET_PROVIDER_MODE=record saves every response under MARKET_TAPE_DIR and
+# MARKET_PROVIDER_MODE=replay serves them back without touching the network.
+
+MODE = os.environ.get("MARKET_PROVIDER_MODE", "live")
+TAPE_DIR = os.environ.get(
+    "MARKET_TAPE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".provider_tape"),
+)
+
+# Other tickers carrying the same market. Only callers that accept a stand-in
+# try them (xau_usd_history, cross-rate legs); fetch_history never does, so the
+# bar cache never stores one ticker's bars under another's name.
+ALTERNATES = {
+    "XAUUSD=X": ["GC=F"],
+    "GC=F": ["XAUUSD=X"],
+    "XAGUSD=X": ["SI=F"],
+    "SI=F": ["XAGUSD=X"],
+}
+
+# CoinGecko id -> currency code for the Alpha Vantage fallback
+COIN_CODES = {"bitcoin": "BTC", "ethereum": "ETH", "litecoin": "LTC", "ripple": "XRP", "solana": "SOL"}
+
+
+class ProviderError(Exception):
+    pass
+
+
+# Opens after `failures` consecutive failed calls; lets one trial call through after `reset_seconds`
+class CircuitBreaker:
+    def __init__(self, failures=3, reset_seconds=60, clock=time.monotonic):
+        self.threshold = failures
+        self.reset = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened is None:
+                return True
+            if self.clock() - self.opened >= self.reset:
+                # Half-open: the next call decides
+                self.opened = self.clock()
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened = None
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened = self.clock()
+
+
+# Retries may add at most `ratio` extra calls per call made (plus a small reserve),
+# so a struggling provider is not hit with a retry storm
+class RetryBudget:
+    def __init__(self, ratio=0.2, reserve=5):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.reserve, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+# --- Record / Replay ---
+class Tape:
+    def __init__(self, root=TAPE_DIR):
+        self.root = root
+
+    def _path(self, source, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return os.path.join(self.root, source, digest + ".pkl")
+
+    def load(self, source, key):
+        path = self._path(source, key)
+        if not os.path.exists(path):
+            raise ProviderError(f"No recorded {source} response for {key!r}")
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    # Frames are merged with what was recorded before, so tail refreshes extend the tape.
+    # Same per-file lock and unique temp files as the bar cache.
+    def save(self, source, key, value):
+        from bar_cache import _lock_for, _replace
+
+        path = self._path(source, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _lock_for(path):
+            if isinstance(value, pd.DataFrame) and os.path.exists(path):
+                with open(path, "rb") as f:
+                    old = pickle.load(f)
+                if isinstance(old, pd.DataFrame) and not old.empty:
+                    value = pd.concat([old, value])
+                    value = value[~value.index.duplicated(keep="last")].sort_index()
+
+            def write(tmp):
+                with open(tmp, "wb") as f:
+                    pickle.dump(value, f)
+
+            _replace(path, write)
+
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="provider")
+
+# A call that timed out keeps its worker thread until the provider answers, so
+# each source holds at most this many threads, stuck or not
+MAX_IN_FLIGHT = 4
+
+
+def _empty(value):
+    return value is None or (isinstance(value, pd.DataFrame) and value.empty)
+
+
+class Source:
+    # `scope(args)` picks the circuit breaker, e.g. one per ticker so a delisted
+    # symbol does not take the whole provider out
+    def __init__(self, name, fetch, timeout=15, retries=2, backoff=0.5, failures=3, reset_seconds=60,
+                 budget_ratio=0.2, scope=None, mode=None, tape=None, max_in_flight=MAX_IN_FLIGHT):
+        self.name = name
+        self.fetch = fetch
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self.scope = scope
+        self.breakers = {}
+        self.budget = RetryBudget(budget_ratio)
+        self.mode = mode
+        self.tape = tape or Tape()
+        self.max_in_flight = max_in_flight
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+
+    def breaker(self, args):
+        scope = self.scope(args) if self.scope else None
+        if scope not in self.breakers:
+            self.breakers[scope] = CircuitBreaker(self.failures, self.reset_seconds)
+        return self.breakers[scope]
+
+    # `key` identifies the response on tape (defaults to the arguments)
+    def __call__(self, *args, key=None):
+        key = args if key is None else key
+        mode = self.mode or MODE
+        if mode == "replay":
+            metrics.count(f"provider.{self.name}.replay")
+            return self.tape.load(self.name, key)
+
+        breaker = self.breaker(args)
+        if not breaker.allow():
+            metrics.count(f"provider.{self.name}.circuit_open")
+            raise ProviderError(f"{self.name}: circuit open after repeated failures")
+
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                with metrics.span(f"provider.{self.name}"):
+                    value = self._submit(args).result(self.timeout)
+                break
+            except Exception as e:
+                timed_out = isinstance(e, FutureTimeout)
+                reason = f"no response within {self.timeout}s" if timed_out else e
+                metrics.count(f"provider.{self.name}.error")
+                # A timed-out call is still running; retrying would only queue a duplicate behind it
+                if timed_out or attempt >= self.retries or not self.budget.withdraw():
+                    breaker.failure()
+                    raise ProviderError(f"{self.name}: {reason}") from e
+                attempt += 1
+                metrics.count(f"provider.{self.name}.retry")
+                time.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+        breaker.success()
+        if mode == "record" and not _empty(value):
+            self.tape.save(self.name, key, value)
+        return value
+
+    # Run one fetch on the shared executor once this source has a free slot
+    def _submit(self, args):
+        if not self.slots.acquire(timeout=self.timeout):
+            metrics.count(f"provider.{self.name}.saturated")
+            raise ProviderError(f"{self.name}: {self.max_in_flight} calls still in flight")
+        try:
+            future = _executor.submit(self.fetch, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+
+# Try (source, args, key) attempts in order; the first non-empty result wins.
+# If every source answered but none had data, that (empty) answer is returned;
+# ProviderError only when a source failed and no other one had data.
+def failover(attempts):
+    errors = []
+    empty = None
+    for i, (source, args, key) in enumerate(attempts):
+        try:
+            value = source(*args, key=key)
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        if not _empty(value):
+            if i:
+                metrics.count("provider.failover")
+            return value
+        empty = value
+    if errors:
+        raise ProviderError("; ".join(errors))
+    return empty
+
+
+# --- Sources ---
+def _yahoo_history(symbol, start, end, interval):
+    from bar_cache import fetch_yahoo, flatten_columns
+
+    frame = fetch_yahoo(symbol, start, end, interval)
+    return None if frame is None else flatten_columns(frame)
+
+
+def _alpha_vantage_series(function, symbol):
+    import quotes
+
+    return quotes.run_sync(quotes.gateway.alpha_vantage_series(function, symbol), timeout=None)
+
+
+def _coingecko_price(coin_id):
+    import quotes
+
+    return quotes.run_sync(quotes.gateway.get_price(coin_id), timeout=None)
+
+
+def _alpha_vantage_rate(from_currency, to_currency):
+    import quotes
+
+    return quotes.run_sync(quotes.gateway.get_exchange_rate(from_currency, to_currency), timeout=None)
+
+
+yahoo = Source("yahoo", _yahoo_history, timeout=30, scope=lambda args: args[0])
+alpha_vantage_series = Source("alpha_vantage_series", _alpha_vantage_series, timeout=60, retries=1)
+coingecko = Source("coingecko", _coingecko_price, timeout=10)
+alpha_vantage_rate = Source("alpha_vantage_rate", _alpha_vantage_rate, timeout=10, retries=1)
+
+
+# Recorded bars are keyed without dates and sliced on replay, so restarts on a later day still hit
+def _history_attempt(symbol, start, end, interval):
+    return yahoo, (symbol, start, end, interval), ("history", symbol, interval)
+
+
+def _window(frame, start, end):
+    from bar_cache import _align
+
+    if start is not None:
+        frame = frame.loc[_align(start, frame.index):]
+    if end is not None:
+        frame = frame.loc[:_align(end, frame.index)]
+    return frame
+
+
+# OHLCV bars of `symbol` itself (signature of bar_cache.fetch_yahoo); an empty
+# frame means the window has no bars, e.g. a weekend or before the listing date
+def fetch_history(symbol, start, end, interval="1d"):
+    source, args, key = _history_attempt(symbol, start, end, interval)
+    frame = source(*args, key=key)
+    if frame is None or (source.mode or MODE) != "replay":
+        return frame
+    return _window(frame, start, end)
+
+
+# Daily XAU/USD: Alpha Vantage full series first, Yahoo gold futures second
+def xau_usd_history(start, end):
+    attempts = [(alpha_vantage_series, ("TIME_SERIES_DAILY", "XAUUSD=X"), None)]
+    attempts += [_history_attempt(s, start, end, "1d") for s in ALTERNATES["XAUUSD=X"]]
+    frame = failover(attempts)
+    return None if _empty(frame) else _window(frame, start, end)
+
+
+# Spot price: CoinGecko first, Alpha Vantage exchange rate second
+def live_price(coin_id):
+    attempts = [(coingecko, (coin_id,), None)]
+    code = COIN_CODES.get(coin_id.lower())
+    if code:
+        attempts.append((alpha_vantage_rate, (code, "USD"), None))
+    return failover(attempts)
+
+
+def exchange_rate(from_currency, to_currency):
+    return failover([(alpha_vantage_rate, (from_currency, to_currency), None)])
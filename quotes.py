@@ -0,0 +1,275 @@
+import os
+import time
+import asyncio
+import threading
+import concurrent.futures
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# --- Live Quote Gateway ---
+# Async front for CoinGecko and Alpha Vantage quotes. Each provider keeps one
+# pooled keep-alive session, calls are spaced by a per-provider rate limit,
+# concurrent requests for the same id share a single in-flight call and
+# fresh answers are reused for `ttl` seconds. Blocking HTTP runs in worker
+# threads so the Streamlit scripts can use the sync helpers at the bottom.
+
+COINGECKO_URL = os.environ.get("COINGECKO_URL", "https://api.coingecko.com/api/v3")
+ALPHA_VANTAGE_URL = os.environ.get("ALPHA_VANTAGE_URL", "https://www.alphavantage.co/query")
+ALPHA_VANTAGE_API_KEY = os.environ.get("ALPHA_VANTAGE_API_KEY")
+
+# Default wait of the sync helpers below; a call queued behind the rate limit
+# for longer than this minus its HTTP timeout is refused instead
+SYNC_TIMEOUT = 30
+
+
+class RateLimited(Exception):
+    pass
+
+
+# Keeps calls to one provider at least `60 / per_minute` seconds apart. Each
+# caller reserves its slot under the lock and sleeps after releasing it; a
+# slot more than `max_wait` seconds away raises RateLimited.
+class RateLimiter:
+    def __init__(self, per_minute, max_wait=None):
+        self.interval = 60.0 / per_minute
+        self.max_wait = max_wait
+        self.next_time = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_time)
+            if self.max_wait is not None and slot - now > self.max_wait:
+                metrics.count("quotes.rate_limited")
+                raise RateLimited(f"next request slot is {slot - now:.0f}s away")
+            self.next_time = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class Provider:
+    def __init__(self, base_url, per_minute, timeout=10, pool_size=10, max_wait=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        if max_wait is None:
+            max_wait = max(0.0, SYNC_TIMEOUT - timeout)
+        self.limiter = RateLimiter(per_minute, max_wait)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    async def get_json(self, path="", params=None):
+        await self.limiter.wait()
+        metrics.count("quotes.http_request")
+        response = await asyncio.to_thread(
+            self.session.get, self.base_url + path, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    # Stream the body through `consume(chunks)` in a worker thread
+    async def get_stream(self, consume, path="", params=None, chunk_size=65536):
+        await self.limiter.wait()
+        metrics.count("quotes.http_request")
+
+        def fetch():
+            with self.session.get(self.base_url + path, params=params, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                return consume(response.iter_content(chunk_size))
+
+        return await asyncio.to_thread(fetch)
+
+    def close(self):
+        self.session.close()
+
+
+# Settle a shared future with its owner's failure; a cancelled owner cancels it
+def _fail(future, error):
+    if future.done():
+        return
+    if isinstance(error, asyncio.CancelledError):
+        future.cancel()
+        return
+    future.set_exception(error)
+    # Mark retrieved so an exception nobody else awaited is not logged
+    future.exception()
+
+
+class QuoteGateway:
+    def __init__(self, coingecko_url=COINGECKO_URL, alpha_vantage_url=ALPHA_VANTAGE_URL,
+                 api_key=ALPHA_VANTAGE_API_KEY, ttl=30, coingecko_per_minute=30, alpha_vantage_per_minute=5):
+        self.coingecko = Provider(coingecko_url, coingecko_per_minute)
+        self.alpha_vantage = Provider(alpha_vantage_url, alpha_vantage_per_minute)
+        self.api_key = api_key
+        self.ttl = ttl
+        self.cache = {}
+        self.in_flight = {}
+
+    def _cached(self, key):
+        hit = self.cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < self.ttl:
+            metrics.count("quotes.hit")
+            return True, hit[1]
+        metrics.count("quotes.miss")
+        return False, None
+
+    # Run `fetch` once per key; concurrent callers await the same future
+    async def _coalesce(self, key, fetch):
+        found, value = self._cached(key)
+        if found:
+            return value
+        if key in self.in_flight:
+            metrics.count("quotes.coalesced")
+            return await self._follow(self.in_flight[key], lambda: self._coalesce(key, fetch))
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            value = await fetch()
+            self.cache[key] = (time.monotonic(), value)
+            future.set_result(value)
+        except BaseException as e:
+            _fail(future, e)
+            raise
+        finally:
+            del self.in_flight[key]
+        return value
+
+    # Await another caller's future; if that caller was cancelled, start over with `retry()`
+    async def _follow(self, future, retry):
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled() or asyncio.current_task().cancelling():
+                raise
+        return await retry()
+
+    # Batch of CoinGecko ids in one /simple/price call; ids already in flight are shared
+    async def get_prices(self, coin_ids, vs_currency="usd"):
+        coin_ids = [coin_id.lower() for coin_id in coin_ids]
+        prices = {}
+        missing = []
+        waiting = {}
+        for coin_id in coin_ids:
+            key = ("coingecko", coin_id, vs_currency)
+            found, value = self._cached(key)
+            if found:
+                prices[coin_id] = value
+            elif key in self.in_flight:
+                metrics.count("quotes.coalesced")
+                waiting[coin_id] = self.in_flight[key]
+            elif coin_id not in missing:
+                missing.append(coin_id)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {}
+            for coin_id in missing:
+                futures[coin_id] = self.in_flight[("coingecko", coin_id, vs_currency)] = loop.create_future()
+            try:
+                data = await self.coingecko.get_json(
+                    "/simple/price", {"ids": ",".join(missing), "vs_currencies": vs_currency})
+                for coin_id, future in futures.items():
+                    value = data.get(coin_id, {}).get(vs_currency)
+                    self.cache[("coingecko", coin_id, vs_currency)] = (time.monotonic(), value)
+                    future.set_result(value)
+                    prices[coin_id] = value
+            except BaseException as e:
+                for future in futures.values():
+                    _fail(future, e)
+                raise
+            finally:
+                for coin_id in missing:
+                    del self.in_flight[("coingecko", coin_id, vs_currency)]
+
+        for coin_id, future in waiting.items():
+            prices[coin_id] = await self._follow(future, lambda: self.get_price(coin_id, vs_currency))
+        return {coin_id: prices[coin_id] for coin_id in coin_ids}
+
+    async def get_price(self, coin_id, vs_currency="usd"):
+        prices = await self.get_prices([coin_id], vs_currency)
+        return prices[coin_id.lower()]
+
+    async def get_exchange_rate(self, from_currency, to_currency):
+        async def fetch():
+            data = await self.alpha_vantage_query(
+                function="CURRENCY_EXCHANGE_RATE", from_currency=from_currency, to_currency=to_currency)
+            if "Realtime Currency Exchange Rate" in data:
+                return float(data["Realtime Currency Exchange Rate"]["5. Exchange Rate"])
+            return None
+
+        return await self._coalesce(("alpha_vantage", from_currency, to_currency), fetch)
+
+    def _require_key(self):
+        if not self.api_key:
+            raise RuntimeError("ALPHA_VANTAGE_API_KEY is not set")
+        return self.api_key
+
+    async def alpha_vantage_query(self, **params):
+        params["apikey"] = self._require_key()
+        return await self.alpha_vantage.get_json(params=params)
+
+    # TIME_SERIES_* as a sorted OHLCV frame, decoded while it downloads
+    async def alpha_vantage_series(self, function, symbol, outputsize="full"):
+        from alpha_vantage import parse_time_series_stream
+
+        params = {"function": function, "symbol": symbol, "outputsize": outputsize, "apikey": self._require_key()}
+        return await self.alpha_vantage.get_stream(parse_time_series_stream, params=params)
+
+    def close(self):
+        self.coingecko.close()
+        self.alpha_vantage.close()
+
+
+# --- Sync Access ---
+# A single event loop thread serves every caller in the process, so requests
+# from different Streamlit sessions are coalesced with each other.
+_loop = None
+_loop_lock = threading.Lock()
+gateway = QuoteGateway()
+
+
+def _get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="quote-gateway", daemon=True).start()
+    return _loop
+
+
+# A call that times out is cancelled on the loop instead of running on unobserved
+def run_sync(coro, timeout=SYNC_TIMEOUT):
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def get_live_price(coin_id):
+    try:
+        return run_sync(gateway.get_price(coin_id))
+    except Exception as e:
+        print(f"Error fetching live price from CoinGecko: {e}")
+        return None
+
+
+def get_live_prices(coin_ids):
+    try:
+        return run_sync(gateway.get_prices(coin_ids))
+    except Exception as e:
+        print(f"Error fetching live prices from CoinGecko: {e}")
+        return {coin_id.lower(): None for coin_id in coin_ids}
+
+
+def get_alpha_vantage_price(from_currency, to_currency):
+    try:
+        return run_sync(gateway.get_exchange_rate(from_currency, to_currency))
+    except Exception as e:
+        print(f"Error fetching exchange rate from Alpha Vantage: {e}")
+        return None
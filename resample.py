@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+# --- Multi-Timeframe Resampling ---
+# One fine-grained base series (e.g. 1m) is downloaded once and every coarser
+# timeframe (5m / 15m / 1h / 1d) is derived from it, so intraday and
+# long-term views of a symbol share a single provider call. Bars are bucketed
+# by flooring their timestamps and each column is reduced with one
+# ufunc.reduceat call. New base bars only re-aggregate the buckets they fall in.
+
+# Yahoo-style interval names -> pandas frequencies
+INTERVALS = {"1m": "1min", "2m": "2min", "5m": "5min", "15m": "15min", "30m": "30min",
+             "1h": "1h", "60m": "1h", "1d": "1D"}
+
+# How far back Yahoo serves each base interval; the finest that covers a span is used
+BASE_LIMIT_DAYS = {"1m": 7, "5m": 60, "1h": 730}
+
+# Column -> reduction; anything else keeps the last value of the bucket
+AGGREGATIONS = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def interval_length(interval):
+    return pd.Timedelta(INTERVALS.get(interval, interval))
+
+
+# Finest base interval whose history limit still covers start..end
+def base_interval_for(start, end):
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days
+    for interval, limit in BASE_LIMIT_DAYS.items():
+        if days <= limit:
+            return interval
+    return "1d"
+
+
+# Longest span, in days, that `interval` bars can be built for: the history limit
+# of the coarsest base interval still fine enough for it (None for daily and up)
+def max_days(interval):
+    length = interval_length(interval)
+    limits = [limit for base, limit in BASE_LIMIT_DAYS.items() if interval_length(base) <= length]
+    if length >= pd.Timedelta(days=1) or not limits:
+        return None
+    return max(limits)
+
+
+# Bucket start of each timestamp. Intraday buckets are taken back from the
+# timestamp itself so the repeated hour when clocks fall back stays two buckets;
+# daily buckets start at local midnight
+def _floor(index, freq):
+    if getattr(index, "tz", None) is None or pd.Timedelta(freq) >= pd.Timedelta(days=1):
+        return index.floor(freq, ambiguous=True, nonexistent="shift_forward")
+    wall = index.tz_localize(None)
+    return index - (wall - wall.floor(freq))
+
+
+# Sorted OHLCV bars -> bars of `interval`, labelled by bucket start
+def resample_ohlcv(bars, interval):
+    freq = INTERVALS.get(interval, interval)
+    bars = bars[bars["Close"].notna()] if "Close" in bars else bars
+    if bars.empty:
+        return bars.iloc[:0].copy()
+
+    buckets = _floor(bars.index, freq)
+    keys = buckets.asi8
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    ends = np.concatenate((starts[1:], [len(keys)])) - 1
+
+    columns = {}
+    for column in bars.columns:
+        values = bars[column].to_numpy(dtype=float)
+        how = AGGREGATIONS.get(column, "last")
+        if how == "first":
+            columns[column] = values[starts]
+        elif how == "max":
+            columns[column] = np.fmax.reduceat(values, starts)
+        elif how == "min":
+            columns[column] = np.fmin.reduceat(values, starts)
+        elif how == "sum":
+            columns[column] = np.add.reduceat(np.nan_to_num(values), starts)
+        else:
+            columns[column] = values[ends]
+    return pd.DataFrame(columns, index=buckets[starts].rename(bars.index.name))
+
+
+class MultiTimeframe:
+    def __init__(self, base_interval="1m", intervals=("5m", "15m", "1h", "1d")):
+        self.base_interval = base_interval
+        self.base = None
+        self.frames = {interval: None for interval in intervals if interval != base_interval}
+
+    # Merge base bars; only bars from the last known one on are taken from a
+    # window that extends the series, and only their buckets are recomputed
+    def update(self, bars):
+        if bars is None or bars.empty:
+            return
+        if self.base is None or bars.index[0] < self.base.index[0]:
+            self.base = bars.copy()
+            for interval in self.frames:
+                self.frames[interval] = resample_ohlcv(self.base, interval)
+            return
+
+        bars = bars.iloc[bars.index.searchsorted(self.base.index[-1]):]
+        if bars.empty:
+            return
+        first = bars.index[0]
+        keep = self.base.iloc[:self.base.index.searchsorted(first)]
+        self.base = pd.concat([keep, bars])
+
+        for interval, frame in self.frames.items():
+            if frame is None:
+                self.frames[interval] = resample_ohlcv(self.base, interval)
+                continue
+            bucket = _floor(pd.DatetimeIndex([first]), INTERVALS.get(interval, interval))[0]
+            tail = resample_ohlcv(self.base.iloc[self.base.index.searchsorted(bucket):], interval)
+            self.frames[interval] = pd.concat([frame.iloc[:frame.index.searchsorted(bucket)], tail])
+
+    # Copy of one timeframe between start and end; new timeframes are tracked from now on
+    def get(self, interval, start=None, end=None):
+        if self.base is None:
+            return None
+        if interval == self.base_interval:
+            frame = self.base
+        else:
+            if self.frames.get(interval) is None:
+                self.frames[interval] = resample_ohlcv(self.base, interval)
+            frame = self.frames[interval]
+        return _window(frame, start, end).copy()
+
+
+def _window(frame, start, end):
+    tz = getattr(frame.index, "tz", None)
+
+    def align(ts):
+        if ts is None:
+            return None
+        ts = pd.Timestamp(ts)
+        if tz is not None and ts.tzinfo is None:
+            return ts.tz_localize(tz)
+        if tz is None and ts.tzinfo is not None:
+            return ts.tz_convert(None)
+        return ts
+
+    return frame.loc[align(start):align(end)]
@@ -0,0 +1,131 @@
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+
+import alerts
+from data import get_resampled_data
+
+# --- Shared Monitoring Scheduler ---
+# One background thread per process replaces the per-rerun run_continuous
+# threads. Subscriptions are grouped by (symbol, strategy, interval), keyed by
+# the registered strategy name (strategies.PROFILES) rather than the page's
+# "Intraday" / "Long-term" label, which means different rules on each page: each
+# symbol is fetched once per tick, each strategy evaluated once, and the
+# result fanned out to every subscriber of that key. Subscribers hold a lease
+# that they renew by subscribing again (every Streamlit rerun does), so
+# abandoned sessions drop out on their own; the thread exits when nobody is left.
+# Each key's result is also passed once to `on_result` (the alert bus), however
+# many sessions watch it.
+
+
+class Scheduler:
+    def __init__(self, fetch=None, period=60, lease_seconds=900, on_result=None):
+        self.fetch = fetch or get_resampled_data
+        self.on_result = on_result
+        self.period = period
+        self.lease = lease_seconds
+        self.subscribers = {}
+        self.latest = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # Add or renew a subscription to `strategy`, registered as `strategy_name`;
+    # pass the previous id back to replace it
+    def subscribe(self, symbol, strategy_name, strategy, callback=None, interval="1d", days=30, subscriber=None):
+        with self._lock:
+            if subscriber is None or subscriber not in self.subscribers:
+                subscriber = next(self._ids)
+            self.subscribers[subscriber] = {
+                "key": (symbol, strategy_name, interval),
+                "strategy": strategy,
+                "callback": callback,
+                "days": days,
+                "expires": time.monotonic() + self.lease,
+            }
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="market-scheduler", daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self.subscribers.pop(subscriber, None)
+            if not self.subscribers:
+                self._wake.set()
+
+    def stop(self):
+        with self._lock:
+            self.subscribers.clear()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def get_latest(self, symbol, strategy_name, interval="1d"):
+        return self.latest.get((symbol, strategy_name, interval))
+
+    # Group live subscriptions by symbol/interval, dropping expired leases
+    def _plan(self):
+        now = time.monotonic()
+        with self._lock:
+            for subscriber in [s for s, sub in self.subscribers.items() if sub["expires"] < now]:
+                del self.subscribers[subscriber]
+            plan = {}
+            for sub in self.subscribers.values():
+                symbol, strategy_name, interval = sub["key"]
+                group = plan.setdefault((symbol, interval), {"days": 0, "strategies": {}})
+                group["days"] = max(group["days"], sub["days"])
+                entry = group["strategies"].setdefault(strategy_name, {"strategy": sub["strategy"], "callbacks": []})
+                # Latest registration wins so a rerun's fresh function object is used
+                entry["strategy"] = sub["strategy"]
+                if sub["callback"] is not None:
+                    entry["callbacks"].append(sub["callback"])
+            return plan
+
+    def tick(self):
+        plan = self._plan()
+        end_date = datetime.now()
+        for (symbol, interval), group in plan.items():
+            try:
+                data = self.fetch(symbol, end_date - timedelta(days=group["days"]), end_date, interval)
+            except Exception as e:
+                print(f"Error fetching {symbol} in scheduler: {e}")
+                continue
+            if data is None or data.empty:
+                continue
+
+            for strategy_name, entry in group["strategies"].items():
+                try:
+                    result = entry["strategy"](data.copy())
+                except Exception as e:
+                    print(f"Error running {strategy_name} strategy for {symbol}: {e}")
+                    continue
+                self.latest[(symbol, strategy_name, interval)] = result
+                if self.on_result is not None:
+                    try:
+                        self.on_result(symbol, strategy_name, interval, result)
+                    except Exception as e:
+                        print(f"Error publishing {strategy_name} result for {symbol}: {e}")
+                for callback in entry["callbacks"]:
+                    try:
+                        callback(symbol, strategy_name, interval, result)
+                    except Exception as e:
+                        print(f"Error in scheduler callback for {symbol}: {e}")
+        return plan
+
+    def _run(self):
+        while True:
+            self.tick()
+            with self._lock:
+                if not self.subscribers:
+                    self._thread = None
+                    return
+            self._wake.wait(self.period)
+            self._wake.clear()
+
+
+# Process-wide instance shared by every session of a script
+scheduler = Scheduler(on_result=alerts.bus.publish)
@@ -1,86 +1,19 @@
+import uuid
 import streamlit as st
-import pandas as pd
-import yfinance as yf
-import pandas_ta as ta
 from datetime import datetime, timedelta
-from pycoingecko import CoinGeckoAPI
-import time
-import threading
-
-# --- Functions ---
-# Fetch live price from CoinGecko
-def get_live_price(symbol):
-    cg = CoinGeckoAPI()
-    coin_id = symbol.lower()
-    try:
-        data = cg.get_price(ids=coin_id, vs_currencies='usd')
-        return data[coin_id]['usd'] if coin_id in data else None
-    except Exception as e:
-        print(f"Error fetching live price from CoinGecko: {e}")
-        return None
-
-# Get historical data
-def get_price_data(symbol, start, end):
-    historical_data = yf.download(symbol, start=start, end=end, auto_adjust=True)
-    return historical_data
-
-# Intraday Strategy (EMA 7 & EMA 21)
-def intraday_strategy(data):
-    # Calculate short-term EMAs (for fast trading)
-    data['EMA_3'] = data['Close'].ewm(span=3, adjust=False).mean()
-    data['EMA_5'] = data['Close'].ewm(span=5, adjust=False).mean()
-
-    latest_price = float(data['Close'].iloc[-1])
-    ema_3 = float(data['EMA_3'].iloc[-1])
-    ema_5 = float(data['EMA_5'].iloc[-1])
-
-    signal = ""
-    stop_loss_pct = 0.01  # 1% loss for intraday
-    profit_pct = stop_loss_pct * 1.5  # 1.5% profit for intraday
-
-    if ema_3 > ema_5:
-        signal = "Buy"
-        target_price = latest_price * (1 + profit_pct)
-        stop_loss = latest_price * (1 - stop_loss_pct)
-    elif ema_3 < ema_5:
-        signal = "Sell"
-        target_price = latest_price * (1 - profit_pct)
-        stop_loss = latest_price * (1 + stop_loss_pct)
-    else:
-        signal = "Hold"
-        target_price = latest_price
-        stop_loss = latest_price
-
-    return signal, round(target_price, 2), round(stop_loss, 2)
-
-
-
-
-# Long-term Strategy (Trend Following with EMA 200)
-def longterm_strategy(data):
-    latest_price = float(data['Close'].iloc[-1])
-    ema_200_series = data['Close'].ewm(span=200, adjust=False).mean()
-    ema_200 = float(ema_200_series.iloc[-1])
-
-    stop_loss_pct = 0.03  # 3% loss for long-term
-    profit_pct = stop_loss_pct * 3  # 9% profit for long-term
-
-    if latest_price > ema_200:
-        signal = "Buy"
-        target_price = latest_price * (1 + profit_pct)
-        stop_loss = latest_price * (1 - stop_loss_pct)
-    elif latest_price < ema_200:
-        signal = "Sell"
-        target_price = latest_price * (1 - profit_pct)
-        stop_loss = latest_price * (1 + stop_loss_pct)
-    else:
-        signal = "Hold"
-        target_price = latest_price
-        stop_loss = latest_price
-
-    return signal, round(target_price, 2), round(stop_loss, 2)
-
-
+from data import get_live_price, get_resampled_data
+from strategies import intraday_strategy, longterm_strategy, PROFILES
+from scheduler import scheduler
+from memo import memoize
+import metrics
+import chart
+import forecast
+import sentiment
+import resample
+
+# Reruns on unchanged bars reuse the previous result (process-wide LRU)
+intraday_strategy = memoize(intraday_strategy)
+longterm_strategy = memoize(longterm_strategy)
 
 # --- Streamlit Interface ---
 st.set_page_config(page_title="Smart Profit Predictor", layout="wide")
@@ -109,60 +42,74 @@ symbol = symbol_map[asset_choice]
 # Choose between Intraday and Long-term
 strategy_type = st.sidebar.selectbox("Choose Strategy Type:", ("Intraday", "Long-term"))
 
-# Define date range
-days = st.sidebar.slider("Select number of days:", 7, 90, 30)
+# Bar size; intraday sizes are derived from one shared fine-grained download
+interval = st.sidebar.selectbox("Bar interval:", ("1d", "1h", "15m", "5m"))
+
+# Define date range, limited to the history Yahoo serves for the bar size
+max_days = min(90, resample.max_days(interval) or 90)
+days = st.sidebar.slider("Select number of days:", 7, max_days, min(30, max_days))
 end_date = datetime.now()
 start_date = end_date - timedelta(days=days)
 
 # Fetch data
-data = get_price_data(symbol, start=start_date, end=end_date)
+data = get_resampled_data(symbol, start_date, end_date, interval)
 
-if data.empty:
+if data is None or data.empty:
     st.error("No data found for this asset.")
 else:
-    st.line_chart(data['Close'])
-
-    # Get live price
-    live_price = get_live_price("bitcoin" if "BTC-USD" in symbol else "ethereum")
-    if live_price:
-        st.subheader(f"Live Price: ${live_price}")
-
     # Choose Strategy Logic
     if strategy_type == "Intraday":
         signal, target_price, stop_loss = intraday_strategy(data)
     elif strategy_type == "Long-term":
         signal, target_price, stop_loss = longterm_strategy(data)
 
+    # Price with target / stop-loss, downsampled to the chart width
+    chart.line_chart(symbol, data, target_price, stop_loss)
+
+    # Get live price
+    live_price = get_live_price("bitcoin" if "BTC-USD" in symbol else "ethereum")
+    if live_price:
+        st.subheader(f"Live Price: ${live_price}")
+
     # Display results
     st.subheader(f"📊 {strategy_type} Strategy Results")
     st.metric("Signal", signal)
     st.metric("Target Price", f"${target_price:.2f}")
     st.metric("Stop Loss", f"${stop_loss:.2f}")
 
+    # Headline sentiment from the local news feeds (MARKET_NEWS_DIR), aligned to the bars
+    news_sentiment = sentiment.latest_sentiment(symbol, data, interval)
+    if news_sentiment is not None:
+        st.metric("News Sentiment", f"{news_sentiment:+.2f}")
+
     # Sending email alert for actions
     if signal in ["Buy", "Sell"]:
         st.success(f"Action: {signal} | Target: {target_price} | Stop-Loss: {stop_loss}")
         # Placeholder for email alert function (set it up with your own function)
 
-# --- Continuous Run with Threading ---
-def run_continuous():
-    while True:
-        # Fetch the data and apply strategy every minute (for intraday) or daily (for long-term)
-        data = get_price_data(symbol, start=start_date, end=end_date)
-        if strategy_type == "Intraday":
-            signal, target_price, stop_loss = intraday_strategy(data)
-        elif strategy_type == "Long-term":
-            signal, target_price, stop_loss = longterm_strategy(data)
-        
-        # Placeholder for email alert
-        if signal in ["Buy", "Sell"]:
-            # Placeholder email alert
-            pass
-        
-        # Sleep for 60 seconds (for intraday) or set for longer intervals for long-term strategies
-        time.sleep(60)  # Adjust time for long-term strategies
-
-# Run continuous process in a separate thread
-thread = threading.Thread(target=run_continuous, daemon=True)
-thread.start()
-
+    # ARIMA forecast next to the rule-based levels (fits cached per symbol and interval, see forecast.py)
+    if strategy_type == "Long-term" and st.sidebar.checkbox("ARIMA forecast"):
+        forecast_result = forecast.forecast_levels(symbol, data, interval=interval)
+        if forecast_result:
+            forecast_signal, forecast_target, forecast_stop = forecast_result
+            st.subheader("🔮 ARIMA Forecast (5 bars)")
+            st.metric("Forecast Signal", forecast_signal)
+            st.metric("Forecast Target", f"${forecast_target:.2f}")
+            st.metric("Forecast Stop Loss", f"${forecast_stop:.2f}")
+        else:
+            st.info("Not enough bars for a forecast.")
+
+# Optional timing panel for fetch / indicator / strategy / chart stages
+show_timing = st.sidebar.checkbox("Show timing panel")
+metrics.request(st.session_state.setdefault('metrics_caller', uuid.uuid4().hex), show_timing)
+if show_timing:
+    metrics.render_debug_panel()
+
+# --- Background Monitoring (shared scheduler) ---
+# One process-wide thread polls each symbol once per tick for all sessions;
+# email / webhook alerts on signal changes are sent by alerts.bus (ALERT_* env vars).
+# Subscriptions are keyed by the registered strategy, not the sidebar label
+strategy_funcs = {"Intraday": intraday_strategy, "Long-term": longterm_strategy}
+st.session_state['subscription'] = scheduler.subscribe(
+    symbol, PROFILES["default"][strategy_type], strategy_funcs[strategy_type],
+    interval=interval, days=days, subscriber=st.session_state.get('subscription'))
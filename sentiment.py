@@ -0,0 +1,362 @@
+import argparse
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from resample import interval_length
+
+# --- News Sentiment ---
+# Headlines from local JSONL / CSV feeds under MARKET_NEWS_DIR are read as a
+# stream: each file is followed from the byte offset reached last time, so
+# only lines appended since are parsed. New headlines are scored in batches
+# (VADER compound or TextBlob polarity, -1 .. +1), optionally across worker
+# processes, and every score is memoized on disk by a hash of the analyzer
+# and the text, so re-runs and repeated wire stories are never scored twice.
+# Scores become a per-symbol series aligned to a frame's bars, next to RSI/ATR:
+#   {"time": "2024-05-01T13:05:00Z", "symbol": "BTC-USD", "headline": "..."}
+#   time,symbols,headline        (symbols may be "BTC-USD ETH-USD" or empty;
+#                                 times without a zone are UTC)
+#   python sentiment.py --workers 4 --symbol BTC-USD
+
+NEWS_DIR = os.environ.get(
+    "MARKET_NEWS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "news"),
+)
+SCORE_DIR = os.environ.get(
+    "MARKET_SENTIMENT_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sentiment_cache"),
+)
+
+# Headlines without a symbol field are assigned by keyword (lower-case word match)
+KEYWORDS = {
+    "BTC-USD": ("bitcoin", "btc", "crypto"),
+    "ETH-USD": ("ethereum", "ether", "eth"),
+    "GC=F": ("gold", "bullion", "xau"),
+    "XAUUSD=X": ("gold", "bullion", "xau"),
+    "SI=F": ("silver", "xag"),
+    "CL=F": ("oil", "crude", "opec", "wti", "brent"),
+    "EURUSD=X": ("euro", "ecb", "eurozone"),
+}
+
+TIME_FIELDS = ("time", "timestamp", "published", "date")
+TEXT_FIELDS = ("headline", "title", "text")
+SYMBOL_FIELDS = ("symbols", "symbol", "tickers", "ticker")
+
+
+# --- Scoring ---
+_analyzers = {}
+
+
+def _analyzer(name):
+    if name not in _analyzers:
+        if name == "vader":
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+            _analyzers[name] = SentimentIntensityAnalyzer().polarity_scores
+        elif name == "textblob":
+            from textblob import TextBlob
+
+            _analyzers[name] = lambda text: {"compound": TextBlob(text).sentiment.polarity}
+        else:
+            raise ValueError(f"Unknown sentiment analyzer: {name}")
+    return _analyzers[name]
+
+
+# Scores of a list of texts in -1 .. +1 (runs in worker processes; the analyzer is built once per process)
+def score_batch(texts, analyzer="vader"):
+    score = _analyzer(analyzer)
+    return [round(float(score(text)["compound"]), 4) for text in texts]
+
+
+def text_key(text, analyzer="vader"):
+    return hashlib.blake2b(f"{analyzer}\0{text}".encode(), digest_size=12).hexdigest()
+
+
+# Append-only "key score" lines per analyzer, loaded once; a torn last line is ignored
+class ScoreCache:
+    def __init__(self, root=SCORE_DIR, analyzer="vader"):
+        self.path = os.path.join(root, f"{analyzer}.scores")
+        self.scores = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    key, _, score = line.partition(" ")
+                    try:
+                        self.scores[key] = float(score)
+                    except ValueError:
+                        continue
+
+    def __len__(self):
+        return len(self.scores)
+
+    def get(self, key):
+        return self.scores.get(key)
+
+    def put_many(self, scores):
+        if not scores:
+            return
+        with self._lock:
+            self.scores.update(scores)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write("".join(f"{key} {score}\n" for key, score in scores.items()))
+
+
+# Texts -> scores, looked up in `cache` first; misses are de-duplicated and
+# scored in `batch_size` chunks, spread over `pool` when one is given
+def score_texts(texts, analyzer="vader", cache=None, pool=None, batch_size=256):
+    keys = [text_key(text, analyzer) for text in texts]
+    known = {} if cache is None else {key: cache.get(key) for key in keys}
+    missing = {}
+    for key, text in zip(keys, texts):
+        if known.get(key) is None and key not in missing:
+            missing[key] = text
+    metrics.count("sentiment.hit", len(keys) - len(missing))
+    metrics.count("sentiment.scored", len(missing))
+
+    if missing:
+        chunks = list(missing.values())
+        chunks = [chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size)]
+        with metrics.span("sentiment.score"):
+            if pool is not None:
+                scored = pool.map(score_batch, chunks, [analyzer] * len(chunks))
+            else:
+                scored = (score_batch(chunk, analyzer) for chunk in chunks)
+            fresh = dict(zip(missing, (score for batch in scored for score in batch)))
+        known.update(fresh)
+        if cache is not None:
+            cache.put_many(fresh)
+    return [known[key] for key in keys]
+
+
+# --- Feeds ---
+def _field(record, names):
+    for name in names:
+        value = record.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _symbols(record, text):
+    value = _field(record, SYMBOL_FIELDS)
+    if isinstance(value, str):
+        value = value.replace(",", " ").split()
+    if value:
+        return [str(symbol) for symbol in value]
+    words = set(text.lower().replace(",", " ").replace(".", " ").split())
+    return [symbol for symbol, keywords in KEYWORDS.items() if words.intersection(keywords)]
+
+
+# Raw JSONL / CSV record -> (time string, text, symbols), or None if unusable
+def parse_record(record):
+    time, text = _field(record, TIME_FIELDS), _field(record, TEXT_FIELDS)
+    if time is None or text is None:
+        return None
+    text = str(text).strip()
+    symbols = _symbols(record, text)
+    return (str(time), text, symbols) if symbols else None
+
+
+# Follows every *.jsonl / *.csv under `root`; read() returns the records of
+# complete lines appended since the previous call (a truncated or replaced
+# file is read again from the start)
+class FeedReader:
+    def __init__(self, root=NEWS_DIR):
+        self.root = root
+        self.positions = {}  # path -> (inode, offset, csv header)
+
+    def paths(self):
+        return sorted(glob.glob(os.path.join(self.root, "*.jsonl")) + glob.glob(os.path.join(self.root, "*.csv")))
+
+    def _read_new(self, path):
+        stat = os.stat(path)
+        inode, offset, header = self.positions.get(path, (None, 0, None))
+        if inode != stat.st_ino or stat.st_size < offset:
+            offset, header = 0, None
+        if stat.st_size == offset:
+            return []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        lines = chunk[:end].decode("utf-8", errors="replace").splitlines()
+
+        records = []
+        if path.endswith(".csv"):
+            rows = csv.reader(io.StringIO("\n".join(lines)))
+            for row in rows:
+                if header is None:
+                    header = [name.strip().lower() for name in row]
+                elif row:
+                    records.append(dict(zip(header, row)))
+        else:
+            for line in lines:
+                if line.strip():
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        self.positions[path] = (stat.st_ino, offset + end, header)
+        return records
+
+    def read(self):
+        records = []
+        for path in self.paths():
+            try:
+                records += self._read_new(path)
+            except OSError as e:
+                print(f"Error reading news feed {path}: {e}")
+        return records
+
+
+# Scored headlines of every feed, one row per (headline, symbol); refresh()
+# scores only what was appended to the feeds since the last refresh
+class NewsStore:
+    def __init__(self, root=NEWS_DIR, analyzer="vader", workers=1, batch_size=256, cache=None):
+        self.reader = FeedReader(root)
+        self.analyzer = analyzer
+        self.workers = workers
+        self.batch_size = batch_size
+        self.cache = cache if cache is not None else ScoreCache(analyzer=analyzer)
+        self.frames = []
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        with self._lock:
+            items = [item for item in map(parse_record, self.reader.read()) if item is not None]
+            if not items:
+                return 0
+            times, texts, symbols = zip(*items)
+            if self.workers > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    scores = score_texts(list(texts), self.analyzer, self.cache, pool, self.batch_size)
+            else:
+                scores = score_texts(list(texts), self.analyzer, self.cache, None, self.batch_size)
+
+            counts = [len(s) for s in symbols]
+            frame = pd.DataFrame({
+                "Time": pd.to_datetime(np.repeat(np.array(times, dtype=object), counts), utc=True,
+                                       format="mixed", errors="coerce"),
+                "Symbol": [symbol for s in symbols for symbol in s],
+                "Score": np.repeat(scores, counts),
+            }).dropna(subset=["Time"])
+            self.frames.append(frame)
+            self._frame = None
+            return len(items)
+
+    @property
+    def frame(self):
+        with self._lock:
+            if self._frame is None:
+                self._frame = (pd.concat(self.frames, ignore_index=True).sort_values("Time", kind="stable")
+                               if self.frames else pd.DataFrame({"Time": pd.to_datetime([], utc=True),
+                                                                 "Symbol": [], "Score": []}))
+            return self._frame
+
+
+# Process-wide store shared by every session
+store = NewsStore()
+
+
+# --- Alignment ---
+# Per-bar sentiment for `symbol` on `index` (bar start times of `interval`).
+# A headline counts for the first bar that closes after it (news over a
+# weekend goes to Monday's bar, never an earlier one); headlines from before
+# the first bar are left out. "Sentiment" is the EMA over bars of the mean
+# score, carried forward through bars without news.
+def sentiment_series(scored, symbol, index, interval="1d", span=3):
+    index = pd.DatetimeIndex(index)
+    rows = scored[scored["Symbol"] == symbol]
+    times = rows["Time"]
+    if index.tz is None:
+        times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+    else:
+        times = times.dt.tz_convert(index.tz)
+
+    ends = (index + interval_length(interval)).as_unit("ns").asi8
+    times = pd.DatetimeIndex(times).as_unit("ns").asi8
+    position = np.searchsorted(ends, times, side="right")
+    inside = position < len(index)
+    if len(index):
+        # Older headlines are outside the window, not news for its first bar
+        inside &= times >= index.as_unit("ns").asi8[0]
+    position, score = position[inside], rows["Score"].to_numpy(dtype=float)[inside]
+
+    count = np.bincount(position, minlength=len(index))
+    with np.errstate(invalid="ignore"):
+        mean = np.bincount(position, weights=score, minlength=len(index)) / count
+    mean = pd.Series(mean, index=index)
+    return pd.DataFrame({
+        "Sentiment": mean.ewm(span=span, adjust=False, ignore_na=True).mean().ffill(),
+        "Headlines": count,
+    }, index=index)
+
+
+# Add Sentiment / Headlines columns to `data`, like the RSI / ATR columns
+def add_sentiment(data, symbol, interval="1d", news=None):
+    news = news or store
+    news.refresh()
+    series = sentiment_series(news.frame, symbol, data.index, interval)
+    data["Sentiment"] = series["Sentiment"].to_numpy()
+    data["Headlines"] = series["Headlines"].to_numpy()
+    return data
+
+
+# Sentiment at the last bar of `data`, or None without any news for `symbol`
+def latest_sentiment(symbol, data, interval="1d", news=None):
+    news = news or store
+    try:
+        news.refresh()
+        series = sentiment_series(news.frame, symbol, data.index, interval)
+    except Exception as e:
+        print(f"Error scoring news for {symbol}: {e}")
+        return None
+    value = series["Sentiment"].iloc[-1]
+    return None if np.isnan(value) else round(float(value), 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score local news feeds and print per-symbol sentiment.")
+    parser.add_argument("--root", default=NEWS_DIR, help="Directory of *.jsonl / *.csv headline feeds")
+    parser.add_argument("--analyzer", default="vader", choices=("vader", "textblob"))
+    parser.add_argument("--workers", type=int, default=1, help="Scoring processes")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--symbol", help="Print the daily series of this symbol")
+    parser.add_argument("--interval", default="1d")
+    args = parser.parse_args(argv)
+
+    news = NewsStore(args.root, args.analyzer, args.workers, args.batch_size)
+    cached = len(news.cache)
+    read = news.refresh()
+    frame = news.frame
+    print(f"{read} headlines, {len(news.cache) - cached} newly scored, {len(news.cache)} in the score cache")
+    if frame.empty:
+        return 0
+    if args.symbol:
+        times = frame.loc[frame["Symbol"] == args.symbol, "Time"]
+        if times.empty:
+            print(f"No headlines for {args.symbol}")
+            return 0
+        index = pd.date_range(times.min().floor("D"), times.max().floor("D"), freq=interval_length(args.interval))
+        print(sentiment_series(frame, args.symbol, index, args.interval).round(3).to_string())
+    else:
+        summary = frame.groupby("Symbol")["Score"].agg(["count", "mean", "min", "max"]).round(3)
+        print(summary.to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
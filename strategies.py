@@ -0,0 +1,176 @@
+from indicators import ema, compute_rsi, compute_atr
+from metrics import timed
+
+# --- Strategy Registry ---
+# Every rule set the scripts use, registered by name together with the
+# parameters the vectorized engines (backtest, optimizer) need to reproduce it.
+# A fast span of 1 means the Close itself.
+
+STRATEGIES = {}
+STRATEGY_PARAMS = {}
+
+# Which registered strategy each script shows as "Intraday" / "Long-term"
+PROFILES = {
+    "default": {"Intraday": "intraday", "Long-term": "longterm"},
+    "gold": {"Intraday": "gold_intraday", "Long-term": "gold_longterm"},
+}
+
+
+def register(name, **params):
+    def decorator(func):
+        func = timed(f"strategy.{name}")(func)
+        STRATEGIES[name] = func
+        STRATEGY_PARAMS[name] = params
+        return func
+    return decorator
+
+
+def get_strategy(strategy_type, profile="default"):
+    return STRATEGIES[PROFILES[profile][strategy_type]]
+
+
+# Same rules as the registered functions, from already computed latest values
+# (used by streaming callers that keep indicator state between bars)
+def signal_from_values(name, close, fast, slow, rsi=None, atr=None):
+    params = STRATEGY_PARAMS[name]
+    if params.get("atr_threshold") and atr < close * params["atr_threshold"]:
+        return "Hold", round(close, 2), round(close, 2)
+
+    buy = fast > slow
+    sell = fast < slow
+    if params.get("rsi_period"):
+        buy = buy and rsi > 50
+        sell = sell and rsi < 50
+
+    if buy:
+        return "Buy", round(close * (1 + params["profit_pct"]), 2), round(close * (1 - params["stop_loss_pct"]), 2)
+    if sell:
+        return "Sell", round(close * (1 - params["profit_pct"]), 2), round(close * (1 + params["stop_loss_pct"]), 2)
+    return "Hold", round(close, 2), round(close, 2)
+
+
+# Intraday Strategy (EMA 3 & EMA 5) - app.py, sec.py, us_forex.py
+@register("intraday", fast=3, slow=5, stop_loss_pct=0.01, profit_pct=0.015)
+def intraday_strategy(data):
+    data['EMA_3'] = ema(data['Close'], 3)
+    data['EMA_5'] = ema(data['Close'], 5)
+
+    latest_price = float(data['Close'].iloc[-1])
+    ema_3 = float(data['EMA_3'].iloc[-1])
+    ema_5 = float(data['EMA_5'].iloc[-1])
+
+    signal = ""
+    stop_loss_pct = 0.01  # 1% loss for intraday
+    profit_pct = stop_loss_pct * 1.5  # 1.5% profit for intraday
+
+    if ema_3 > ema_5:
+        signal = "Buy"
+        target_price = latest_price * (1 + profit_pct)
+        stop_loss = latest_price * (1 - stop_loss_pct)
+    elif ema_3 < ema_5:
+        signal = "Sell"
+        target_price = latest_price * (1 - profit_pct)
+        stop_loss = latest_price * (1 + stop_loss_pct)
+    else:
+        signal = "Hold"
+        target_price = latest_price
+        stop_loss = latest_price
+
+    return signal, round(target_price, 2), round(stop_loss, 2)
+
+
+# Long-term Strategy (Trend Following with EMA 200) - app.py, sec.py, us_forex.py
+@register("longterm", fast=1, slow=200, stop_loss_pct=0.03, profit_pct=0.09)
+def longterm_strategy(data):
+    data['EMA_200'] = ema(data['Close'], 200)
+
+    latest_price = float(data['Close'].iloc[-1])
+    ema_200 = float(data['EMA_200'].iloc[-1])
+
+    stop_loss_pct = 0.03  # 3% loss for long-term
+    profit_pct = stop_loss_pct * 3  # 9% profit for long-term
+
+    if latest_price > ema_200:
+        signal = "Buy"
+        target_price = latest_price * (1 + profit_pct)
+        stop_loss = latest_price * (1 - stop_loss_pct)
+    elif latest_price < ema_200:
+        signal = "Sell"
+        target_price = latest_price * (1 - profit_pct)
+        stop_loss = latest_price * (1 + stop_loss_pct)
+    else:
+        signal = "Hold"
+        target_price = latest_price
+        stop_loss = latest_price
+
+    return signal, round(target_price, 2), round(stop_loss, 2)
+
+
+# Intraday Strategy (EMA 10 & EMA 30 with RSI and ATR) - gold.py
+@register("gold_intraday", fast=10, slow=30, rsi_period=14, atr_period=14, atr_threshold=0.0003,
+          stop_loss_pct=0.03 / 100, profit_pct=0.05 / 100)
+def gold_intraday_strategy(data, target_profit_percent=0.05, stop_loss_percent=0.03):
+    # Calculate indicators
+    data['EMA_10'] = ema(data['Close'], 10)
+    data['EMA_30'] = ema(data['Close'], 30)
+    data['RSI'] = compute_rsi(data['Close'], period=14)
+    data['ATR'] = compute_atr(data, period=14)
+
+    # Get latest values
+    latest_price = float(data['Close'].iloc[-1])
+    ema_10 = float(data['EMA_10'].iloc[-1])
+    ema_30 = float(data['EMA_30'].iloc[-1])
+    rsi = float(data['RSI'].iloc[-1])
+    atr = float(data['ATR'].iloc[-1])
+
+    # Signal logic
+    signal = ""
+    target_price = latest_price
+    stop_loss = latest_price
+
+    # Adjusted ATR threshold for small intraday moves
+    min_atr_threshold = latest_price * 0.0003  # e.g., 0.03%
+    if atr < min_atr_threshold:
+        return "Hold", round(latest_price, 2), round(latest_price, 2)
+
+    # Buy Signal
+    if ema_10 > ema_30 and rsi > 50:
+        signal = "Buy"
+        target_price = latest_price * (1 + target_profit_percent / 100)
+        stop_loss = latest_price * (1 - stop_loss_percent / 100)
+
+    # Sell Signal
+    elif ema_10 < ema_30 and rsi < 50:
+        signal = "Sell"
+        target_price = latest_price * (1 - target_profit_percent / 100)
+        stop_loss = latest_price * (1 + stop_loss_percent / 100)
+    else:
+        signal = "Hold"
+
+    return signal, round(target_price, 2), round(stop_loss, 2)
+
+
+# Long-term Strategy (EMA 200 with RSI) - gold.py
+@register("gold_longterm", fast=1, slow=200, rsi_period=14, stop_loss_pct=2.0 / 100, profit_pct=5.0 / 100)
+def gold_longterm_strategy(data, target_profit_percent=5.0, stop_loss_percent=2.0):
+    data['EMA_200'] = ema(data['Close'], 200)
+    data['RSI'] = compute_rsi(data['Close'], period=14)
+    data['ATR'] = compute_atr(data, period=14)
+
+    latest_price = float(data['Close'].iloc[-1])
+    ema_200 = float(data['EMA_200'].iloc[-1])
+    rsi = float(data['RSI'].iloc[-1])
+    signal = "Hold"
+    target_price = latest_price
+    stop_loss = latest_price
+
+    if latest_price > ema_200 and rsi > 50:
+        signal = "Buy"
+        target_price = latest_price * (1 + target_profit_percent / 100)
+        stop_loss = latest_price * (1 - stop_loss_percent / 100)
+    elif latest_price < ema_200 and rsi < 50:
+        signal = "Sell"
+        target_price = latest_price * (1 - target_profit_percent / 100)
+        stop_loss = latest_price * (1 + stop_loss_percent / 100)
+
+    return signal, round(target_price, 2), round(stop_loss, 2)
@@ -0,0 +1,204 @@
+import math
+from collections import deque
+
+# --- Streaming Indicators ---
+# Stateful EMA / RSI / ATR that take one bar at a time in O(1) and can be
+# seeded from history. Results match the pandas versions in indicators.py
+# (ema, compute_rsi, compute_atr).
+
+
+# Exponential average with pandas `adjust=False` semantics
+class EMA:
+    def __init__(self, span=None, alpha=None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.value = math.nan
+
+    def update(self, x):
+        if math.isnan(self.value):
+            self.value = float(x)
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    # Value update(x) would give, without changing state
+    def peek(self, x):
+        if math.isnan(self.value):
+            return float(x)
+        return self.value + self.alpha * (x - self.value)
+
+    def seed(self, values):
+        for x in values:
+            self.update(x)
+        return self.value
+
+
+# Mean of the last `period` values, same as rolling(period, min_periods=1).mean()
+class RollingMean:
+    def __init__(self, period):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.count = 0
+        self.value = math.nan
+
+    def update(self, x):
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        # Re-sum once per full window so rounding error never builds up
+        self.count += 1
+        if self.count % self.period == 0:
+            self.total = math.fsum(self.window)
+        self.value = self.total / len(self.window)
+        return self.value
+
+    def peek(self, x):
+        if len(self.window) == self.period:
+            return (self.total - self.window[0] + x) / self.period
+        return (self.total + x) / (len(self.window) + 1)
+
+
+# Wilder's average: mean of the first `period` values, then alpha = 1 / period
+class WilderMean:
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.total = 0.0
+        self.value = math.nan
+
+    def update(self, x):
+        self.value = self.peek(x)
+        if self.count < self.period:
+            self.total += x
+            self.count += 1
+        return self.value
+
+    def peek(self, x):
+        if self.count < self.period - 1:
+            return math.nan
+        if self.count == self.period - 1:
+            return (self.total + x) / self.period
+        return self.value + (x - self.value) / self.period
+
+
+def _smoother(period, smoothing):
+    if smoothing == "sma":
+        return RollingMean(period)
+    if smoothing == "wilder":
+        return WilderMean(period)
+    raise ValueError(f"Unknown smoothing: {smoothing}")
+
+
+# No movement in the window (0 / 0) is neutral, as in indicators.rsi_into
+def _rsi(gain, loss):
+    if gain + loss == 0:
+        return 50.0
+    return 100 * gain / (gain + loss)
+
+
+# Relative Strength Index, SMA (as compute_rsi) or Wilder smoothing
+class RSI:
+    def __init__(self, period=14, smoothing="sma"):
+        self.avg_gain = _smoother(period, smoothing)
+        self.avg_loss = _smoother(period, smoothing)
+        self.prev_close = None
+        self.value = math.nan
+
+    def update(self, close):
+        if self.prev_close is None:
+            self.prev_close = close
+            return self.value
+        delta = close - self.prev_close
+        self.prev_close = close
+        self.value = _rsi(self.avg_gain.update(max(delta, 0.0)), self.avg_loss.update(max(-delta, 0.0)))
+        return self.value
+
+    def peek(self, close):
+        if self.prev_close is None:
+            return self.value
+        delta = close - self.prev_close
+        return _rsi(self.avg_gain.peek(max(delta, 0.0)), self.avg_loss.peek(max(-delta, 0.0)))
+
+    def seed(self, closes):
+        for close in closes:
+            self.update(close)
+        return self.value
+
+
+# Average True Range, SMA (as compute_atr) or Wilder smoothing
+class ATR:
+    def __init__(self, period=14, smoothing="sma"):
+        self.avg = _smoother(period, smoothing)
+        # Wilder's ATR starts from the first bar that has a previous close
+        self.skip_first = smoothing == "wilder"
+        self.prev_close = None
+        self.value = math.nan
+
+    def _true_range(self, high, low):
+        tr = high - low
+        if self.prev_close is not None:
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        return tr
+
+    def update(self, high, low, close):
+        if not (self.skip_first and self.prev_close is None):
+            self.value = self.avg.update(self._true_range(high, low))
+        self.prev_close = close
+        return self.value
+
+    def peek(self, high, low, close):
+        if self.skip_first and self.prev_close is None:
+            return self.value
+        return self.avg.peek(self._true_range(high, low))
+
+    def seed(self, highs, lows, closes):
+        for high, low, close in zip(highs, lows, closes):
+            self.update(high, low, close)
+        return self.value
+
+
+# Bundle of indicators fed from an OHLC frame; only bars newer than the last seen one are processed
+class StreamingIndicators:
+    def __init__(self, ema_spans=(3, 5, 10, 30, 200), rsi_period=14, atr_period=14, smoothing="sma"):
+        self.emas = {f"EMA_{span}": EMA(span) for span in ema_spans}
+        self.rsi = RSI(rsi_period, smoothing)
+        self.atr = ATR(atr_period, smoothing)
+        self.last_index = None
+        self.close = math.nan
+
+    def update(self, high, low, close):
+        self.close = float(close)
+        for ema in self.emas.values():
+            ema.update(self.close)
+        self.rsi.update(self.close)
+        self.atr.update(float(high), float(low), self.close)
+        return self.values()
+
+    def update_frame(self, data):
+        if self.last_index is not None:
+            data = data.iloc[data.index.searchsorted(self.last_index, side="right"):]
+        if data.empty:
+            return self.values()
+        for high, low, close in zip(data["High"].to_numpy(dtype=float).ravel(),
+                                    data["Low"].to_numpy(dtype=float).ravel(),
+                                    data["Close"].to_numpy(dtype=float).ravel()):
+            self.update(high, low, close)
+        self.last_index = data.index[-1]
+        return self.values()
+
+    def values(self):
+        values = {name: ema.value for name, ema in self.emas.items()}
+        values["RSI"] = self.rsi.value
+        values["ATR"] = self.atr.value
+        values["Close"] = self.close
+        return values
+
+    # Values as if (high, low, close) were the next bar, leaving state untouched
+    def peek(self, high, low, close):
+        close = float(close)
+        values = {name: ema.peek(close) for name, ema in self.emas.items()}
+        values["RSI"] = self.rsi.peek(close)
+        values["ATR"] = self.atr.peek(float(high), float(low), close)
+        values["Close"] = close
+        return values
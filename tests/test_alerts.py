@@ -0,0 +1,153 @@
+import json
+import socketserver
+import threading
+import time
+from email import message_from_bytes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from alerts import AlertBus, Debouncer, SMTPSink, WebhookSink, sinks_from_env
+
+
+# Webhook stand-in collecting every JSON body it is posted
+@pytest.fixture
+def webhook():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/hook", received
+    server.shutdown()
+    server.server_close()
+
+
+# SMTP stand-in: just enough of RFC 5321 for smtplib.send_message, keeping each DATA body
+@pytest.fixture
+def smtp_server():
+    messages = []
+
+    class Handler(socketserver.StreamRequestHandler):
+        def reply(self, line):
+            self.wfile.write(line.encode() + b"\r\n")
+
+        def handle(self):
+            self.reply("220 localhost stand-in")
+            envelope = {"to": []}
+            while True:
+                line = self.rfile.readline().decode().strip()
+                command = line.split(" ", 1)[0].upper()
+                if command in ("EHLO", "HELO"):
+                    self.reply("250 localhost")
+                elif command == "MAIL":
+                    envelope["from"] = line
+                    self.reply("250 OK")
+                elif command == "RCPT":
+                    envelope["to"].append(line)
+                    self.reply("250 OK")
+                elif command == "DATA":
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        data = self.rfile.readline()
+                        if data in (b".\r\n", b""):
+                            break
+                        lines.append(data[1:] if data.startswith(b"..") else data)
+                    messages.append((envelope, message_from_bytes(b"".join(lines))))
+                    envelope = {"to": []}
+                    self.reply("250 OK")
+                elif command == "QUIT":
+                    self.reply("221 Bye")
+                    return
+                else:
+                    self.reply("250 OK")
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], messages
+    server.shutdown()
+    server.server_close()
+
+
+def test_debouncer_absorbs_flapping_and_applies_cooldown():
+    now = [0.0]
+    debouncer = Debouncer(confirm=2, cooldown=60, clock=lambda: now[0])
+    key = ("BTC-USD", "Intraday", "1d")
+    assert debouncer.observe(key, "Buy") is None          # baseline
+    assert debouncer.observe(key, "Sell") is None         # seen once
+    assert debouncer.observe(key, "Buy") is None          # flapped back
+    assert debouncer.observe(key, "Sell") is None
+    assert debouncer.observe(key, "Sell") == ("Buy", "Sell")
+    now[0] = 30.0
+    debouncer.observe(key, "Buy")
+    assert debouncer.observe(key, "Buy") is None          # confirmed, but within the cooldown
+    now[0] = 90.0
+    assert debouncer.observe(key, "Buy") == ("Sell", "Buy")
+
+
+def test_webhook_receives_changes_in_one_batch(webhook):
+    url, received = webhook
+    bus = AlertBus([WebhookSink(url)], confirm=1, flush_seconds=0.2)
+    try:
+        for symbol in ("BTC-USD", "ETH-USD"):
+            bus.publish(symbol, "Intraday", "1d", ("Buy", 110.0, 95.0))
+            bus.publish(symbol, "Intraday", "1d", ("Sell", 90.0, 105.0))
+        bus.flush()
+    finally:
+        bus.close()
+    assert len(received) == 1
+    events = received[0]["events"]
+    assert [(e["Symbol"], e["From"], e["To"]) for e in events] == [
+        ("BTC-USD", "Buy", "Sell"), ("ETH-USD", "Buy", "Sell")]
+    assert events[0]["Target Price"] == 90.0
+
+
+def test_email_is_sent_through_smtp(smtp_server):
+    port, messages = smtp_server
+    sinks = sinks_from_env({"ALERT_SMTP_HOST": "127.0.0.1", "ALERT_SMTP_PORT": str(port),
+                            "ALERT_EMAIL_TO": "desk@example.com, risk@example.com",
+                            "ALERT_EMAIL_FROM": "signals@example.com"})
+    assert [type(sink) for sink in sinks] == [SMTPSink]
+    bus = AlertBus(sinks, confirm=1, flush_seconds=0.05)
+    try:
+        bus.publish("GC=F", "Long-term", "1d", ("Hold", 2300.0, 2300.0))
+        bus.publish("GC=F", "Long-term", "1d", ("Buy", 2400.0, 2250.0))
+        bus.flush()
+    finally:
+        bus.close()
+    assert len(messages) == 1
+    envelope, message = messages[0]
+    assert len(envelope["to"]) == 2
+    assert message["Subject"] == "GC=F: Hold -> Buy"
+    assert "Target: 2400.0 | Stop-Loss: 2250.0" in message.get_payload(decode=True).decode()
+
+
+def test_slow_sink_does_not_block_publishing():
+    release = threading.Event()
+    delivered = []
+
+    def slow(events):
+        release.wait(5)
+        delivered.extend(events)
+
+    bus = AlertBus([slow], confirm=1, flush_seconds=0)
+    try:
+        start = time.monotonic()
+        for i in range(20):
+            bus.publish("BTC-USD", "Intraday", "1d", ("Buy" if i % 2 else "Sell", 1.0, 1.0))
+        assert time.monotonic() - start < 0.5
+        release.set()
+        bus.flush()
+    finally:
+        bus.close()
+    assert len(delivered) == 19
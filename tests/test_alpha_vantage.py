@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from alpha_vantage import parse_time_series, parse_time_series_stream, slice_range
+
+
+# TIME_SERIES_DAILY as Alpha Vantage sends it: newest first, numbers as strings,
+# and a non-ASCII note in the metadata so byte chunks can split a character
+def _payload(days=120):
+    dates = pd.date_range("2024-01-01", periods=days, freq="D")[::-1]
+    rng = np.random.default_rng(12)
+    series = {}
+    for date in dates:
+        close = 2000 + rng.random() * 100
+        series[date.strftime("%Y-%m-%d")] = {
+            "1. open": f"{close - 1:.4f}", "2. high": f"{close + 5:.4f}", "3. low": f"{close - 5:.4f}",
+            "4. close": f"{close:.4f}", "5. volume": str(int(rng.integers(1000, 5000))),
+        }
+    return {
+        "Meta Data": {"1. Information": "Daily Prices — Gold (XAU) in € and ¥, 日足", "2. Symbol": "XAUUSD"},
+        "Time Series (Daily)": series,
+    }
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.fixture(scope="module")
+def payload():
+    return _payload()
+
+
+@pytest.fixture(scope="module")
+def expected(payload):
+    return parse_time_series(payload)
+
+
+def test_dict_parser_is_typed_and_ascending(expected):
+    assert list(expected.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert expected.index.is_monotonic_increasing and expected.index.is_unique
+    assert expected.dtypes.eq(float).all()
+    assert expected.index[0] == pd.Timestamp("2024-01-01")
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1000, 1 << 20])
+def test_stream_matches_dict_parser_for_any_byte_chunking(payload, expected, size):
+    body = json.dumps(payload, ensure_ascii=False, indent=4).encode("utf-8")
+    frame = parse_time_series_stream(_chunks(body, size))
+    pd.testing.assert_frame_equal(frame, expected)
+
+
+@pytest.mark.parametrize("size", [1, 5, 333])
+def test_stream_accepts_text_chunks(payload, expected, size):
+    text = json.dumps(payload, ensure_ascii=False)
+    pd.testing.assert_frame_equal(parse_time_series_stream(_chunks(text, size)), expected)
+
+
+def test_date_slice_on_ascending_index(expected):
+    window = slice_range(expected, "2024-02-01", "2024-02-10")
+    assert len(window) == 10
+    assert window.index[0] == pd.Timestamp("2024-02-01")
+    assert window.index[-1] == pd.Timestamp("2024-02-10")
+
+
+def test_error_responses_have_no_series():
+    note = {"Note": "Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day."}
+    assert parse_time_series(note) is None
+    assert parse_time_series_stream([json.dumps(note).encode()]) is None
+
+
+def test_truncated_stream_is_an_error(payload):
+    body = json.dumps(payload).encode()
+    with pytest.raises(ValueError):
+        parse_time_series_stream(_chunks(body[:len(body) // 2], 100))
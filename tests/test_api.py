@@ -0,0 +1,38 @@
+import asyncio
+import threading
+
+import pandas as pd
+
+from api import BarFeed
+
+
+def _bars():
+    index = pd.date_range("2024-01-01", periods=40, freq="D", name="Date")
+    return pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1.0}, index=index)
+
+
+def test_cancelled_caller_does_not_strand_the_others():
+    release = threading.Event()
+    calls = []
+
+    def fetch(symbol, start, end, interval):
+        calls.append(symbol)
+        release.wait(5)
+        return _bars()
+
+    feed = BarFeed(fetch, ttl=60)
+
+    async def run():
+        leader = asyncio.ensure_future(feed.get("BTC-USD"))
+        await asyncio.sleep(0.05)
+        followers = asyncio.gather(*[feed.get("BTC-USD") for _ in range(3)])
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.wait_for(followers, 5)
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(version == results[0][0] and len(bars) == 40 for version, bars in results)
+    assert not feed.in_flight
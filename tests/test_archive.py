@@ -0,0 +1,66 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+from archive import Archive, update_archive
+
+
+# Run in a zone that is neither UTC nor the exchange's, where mixed-up bounds show
+@pytest.fixture
+def tokyo(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def _bars(start, periods, tz="America/New_York"):
+    index = pd.date_range(start, periods=periods, freq="h", tz=tz, name="Date")
+    close = np.arange(periods, dtype=float) + 100
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0}, index=index)
+
+
+def test_naive_bounds_are_local_time(tmp_path, tokyo):
+    archive = Archive(str(tmp_path))
+    archive.append("GC=F", _bars("2024-03-04 09:00", 8), "1h")
+
+    # 23:00-02:00 in Tokyo is 09:00-12:00 in New York
+    frame = archive.read("GC=F", pd.Timestamp("2024-03-04 23:00"), pd.Timestamp("2024-03-05 02:00"), "1h")
+    assert frame.index[0] == pd.Timestamp("2024-03-04 09:00", tz="America/New_York")
+    assert frame.index[-1] == pd.Timestamp("2024-03-04 12:00", tz="America/New_York")
+    assert len(frame) == 4
+
+    # Aware bounds keep their instant
+    frame = archive.read("GC=F", pd.Timestamp("2024-03-04 15:00", tz="UTC"), None, "1h")
+    assert frame.index[0] == pd.Timestamp("2024-03-04 10:00", tz="America/New_York")
+
+
+def test_naive_until_is_local_time(tmp_path, tokyo):
+    archive = Archive(str(tmp_path))
+    # 01:00 in Tokyo is 11:00 in New York: the 11:00 bar is still forming
+    added = archive.append("GC=F", _bars("2024-03-04 09:00", 8), "1h", until=pd.Timestamp("2024-03-05 01:00"))
+    assert added == 2
+
+
+def test_update_resumes_at_the_last_archived_bar(tmp_path, tokyo, monkeypatch):
+    archive = Archive(str(tmp_path))
+    archive.append("GC=F", _bars("2024-03-04 09:00", 8), "1h")
+    requests = []
+
+    def get_price_data(symbol, start, end, interval="1d"):
+        requests.append(pd.Timestamp(start))
+        return _bars("2024-03-04 09:00", 12)
+
+    monkeypatch.setattr(data, "get_price_data", get_price_data)
+    added = update_archive(archive, "GC=F", pd.Timestamp("2024-03-01"), pd.Timestamp("2024-03-06"), "1h")
+    # Naive in the bars' zone, as the bar cache reads naive bounds
+    assert requests == [pd.Timestamp("2024-03-04 16:00")]
+    assert added == 4
+    times = archive.read("GC=F", interval="1h").index
+    assert times.is_unique and len(times) == 12
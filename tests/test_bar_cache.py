@@ -0,0 +1,98 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from bar_cache import BarCache
+
+
+# Provider stand-in: daily bars for any window, every call recorded
+class FakeProvider:
+    def __init__(self, listed=None):
+        self.calls = []
+        self.listed = pd.Timestamp(listed) if listed else None
+
+    def __call__(self, symbol, start, end, interval="1d"):
+        self.calls.append((symbol, pd.Timestamp(start), pd.Timestamp(end), interval))
+        index = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end), freq="D", name="Date")
+        if self.listed is not None:
+            index = index[index >= self.listed]
+        close = np.arange(len(index), dtype=float) + index.day.to_numpy()
+        return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1,
+                             "Close": close, "Volume": 100.0}, index=index)
+
+
+def test_second_request_fetches_only_the_tail(tmp_path):
+    provider = FakeProvider()
+    cache = BarCache(provider, root=str(tmp_path))
+
+    first = cache.get("BTC-USD", "2024-01-01", "2024-01-31")
+    assert len(provider.calls) == 1
+    assert first.index[-1] == pd.Timestamp("2024-01-31")
+
+    later = cache.get("BTC-USD", "2024-01-01", "2024-02-15")
+    assert len(provider.calls) == 2
+    _, start, end, _ = provider.calls[-1]
+    # Only the tail, restarting at the last stored bar in case it was still forming
+    assert start == pd.Timestamp("2024-01-31")
+    assert end == pd.Timestamp("2024-02-15")
+    assert later.index[0] == pd.Timestamp("2024-01-01")
+    assert later.index[-1] == pd.Timestamp("2024-02-15")
+    assert later.index.is_unique
+
+
+def test_covered_window_is_served_from_disk(tmp_path):
+    provider = FakeProvider()
+    BarCache(provider, root=str(tmp_path)).get("BTC-USD", "2024-01-01", "2024-01-31")
+
+    # A new instance, as on every Streamlit rerun
+    bars = BarCache(provider, root=str(tmp_path)).get("BTC-USD", "2024-01-10", "2024-01-20")
+    assert len(provider.calls) == 1
+    assert bars.index[0] == pd.Timestamp("2024-01-10")
+    assert bars.index[-1] == pd.Timestamp("2024-01-20")
+
+
+def test_empty_head_window_is_marked_covered(tmp_path):
+    provider = FakeProvider(listed="2024-01-01")
+    cache = BarCache(provider, root=str(tmp_path))
+    cache.get("NEW", "2024-01-01", "2024-01-31")
+
+    # Nothing exists before the listing date: fetched once, then known to be empty
+    cache.get("NEW", "2023-12-01", "2024-01-31")
+    cache.get("NEW", "2023-12-01", "2024-01-31")
+    assert len(provider.calls) == 2
+
+
+def test_failed_head_window_is_retried(tmp_path):
+    provider = FakeProvider()
+    cache = BarCache(provider, root=str(tmp_path))
+    cache.get("BTC-USD", "2024-01-10", "2024-01-31")
+
+    def failing(symbol, start, end, interval="1d"):
+        raise ConnectionError("provider down")
+
+    bars = BarCache(failing, root=str(tmp_path)).get("BTC-USD", "2024-01-01", "2024-01-31")
+    assert bars.index[0] == pd.Timestamp("2024-01-10")
+
+    cache.get("BTC-USD", "2024-01-01", "2024-01-31")
+    assert provider.calls[-1][1] == pd.Timestamp("2024-01-01")
+
+
+def test_concurrent_writers_merge_and_leave_no_temp_files(tmp_path):
+    provider = FakeProvider()
+    BarCache(provider, root=str(tmp_path)).get("BTC-USD", "2024-01-01", "2024-01-31")
+
+    ends = ["2024-02-10", "2024-02-20", "2024-03-01", "2024-03-10"]
+    threads = [threading.Thread(target=BarCache(provider, root=str(tmp_path)).get,
+                                args=("BTC-USD", "2024-01-01", end)) for end in ends]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    bars, meta = BarCache(provider, root=str(tmp_path)).load("BTC-USD")
+    assert pd.Timestamp(meta["end"]) == pd.Timestamp("2024-03-10")
+    assert bars.index[-1] == pd.Timestamp("2024-03-10")
+    assert bars.index.is_unique and bars.index.is_monotonic_increasing
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compact import CompactBars, Scratch, compact_strategy, evaluate
+from strategies import STRATEGIES
+
+
+def _frame(n=400, seed=16):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum() * 0.5
+    spread = rng.random(n) * 0.5 + 0.05
+    return pd.DataFrame({"Open": close, "High": close + spread, "Low": close - spread, "Close": close,
+                         "Volume": 1000.0}, index=pd.date_range("2024-01-01", periods=n, freq="h"))
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_matches_the_frame_strategy(name):
+    frame = _frame()
+    bars = CompactBars.from_frame(frame, dtype=np.float64)
+    assert compact_strategy(name, bars) == STRATEGIES[name](frame.copy())
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_matches_the_frame_strategy_across_a_gap(name):
+    frame = _frame()
+    frame.iloc[[120, 300, 395], frame.columns.get_loc("Close")] = np.nan
+    frame.iloc[[200], frame.columns.get_loc("High")] = np.nan
+    bars = CompactBars.from_frame(frame, dtype=np.float64)
+    expected = STRATEGIES[name](frame.copy())
+    assert compact_strategy(name, bars) == expected
+
+
+def test_evaluate_reuses_one_scratch_across_symbols():
+    universe = {f"S{i}": CompactBars.from_frame(_frame(300 + i, seed=i), dtype=np.float64) for i in range(5)}
+    results = evaluate(universe, "gold_intraday", Scratch())
+    for symbol, bars in universe.items():
+        assert results[symbol] == STRATEGIES["gold_intraday"](bars.to_frame())
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crosses import CrossMatrix, align, cross_bars, cross_ohlc, parse_pair
+
+
+def _ohlc(index, close, spread=1.0):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({"Open": close - spread / 2, "High": close + spread, "Low": close - spread,
+                         "Close": close}, index=index)
+
+
+def test_parse_pair():
+    assert parse_pair("btc/xau") == ("BTC", "XAU")
+    with pytest.raises(ValueError):
+        parse_pair("BTC/DOGE")
+
+
+def test_inverted_leg_swaps_high_and_low():
+    index = pd.date_range("2024-01-02", periods=3, freq="D")
+    eur = _ohlc(index, [1.10, 1.11, 1.12], spread=0.01)
+    jpy = _ohlc(index, [150.0, 151.0, 152.0])
+    bars = cross_bars("EUR/JPY", {"EURUSD=X": eur, "JPY=X": jpy}.get)
+
+    # EUR/JPY = EURUSD * USDJPY
+    np.testing.assert_allclose(bars["Open"], eur["Open"] * jpy["Open"])
+    np.testing.assert_allclose(bars["Close"], eur["Close"] * jpy["Close"])
+    # A JPY unit is worth most in USD when USDJPY is at its low
+    high_high, low_low = eur["High"] * jpy["Low"], eur["Low"] * jpy["High"]
+    np.testing.assert_allclose(bars["High"], np.maximum.reduce([
+        bars["Open"], high_high, low_low, bars["Close"]]))
+    np.testing.assert_allclose(bars["Low"], np.minimum.reduce([
+        bars["Open"], high_high, low_low, bars["Close"]]))
+    assert (bars["Low"] <= bars[["Open", "Close"]].min(axis=1)).all()
+    assert (bars["High"] >= bars[["Open", "Close"]].max(axis=1)).all()
+
+
+def test_usd_quote_of_inverted_leg():
+    index = pd.date_range("2024-01-02", periods=2, freq="D")
+    jpy = _ohlc(index, [150.0, 160.0])
+    bars = cross_bars("JPY/USD", {"JPY=X": jpy}.get)
+    np.testing.assert_allclose(bars["Close"], 1.0 / jpy["Close"])
+    np.testing.assert_allclose(bars["High"], 1.0 / jpy["Low"])
+    np.testing.assert_allclose(bars["Low"], 1.0 / jpy["High"])
+
+
+def test_leg_without_a_bar_carries_forward():
+    # BTC trades at the weekend, gold does not
+    btc = _ohlc(pd.date_range("2024-01-05", "2024-01-08", freq="D"), [40000, 41000, 42000, 43000])
+    xau = _ohlc(pd.DatetimeIndex(["2024-01-05", "2024-01-08"]), [2000, 2050])
+    bars = cross_ohlc(btc, xau)
+
+    assert list(bars.index) == list(btc.index)
+    np.testing.assert_allclose(bars["Close"], [20.0, 20.5, 21.0, 43000 / 2050])
+
+
+def test_starts_where_both_legs_have_started():
+    first = _ohlc(pd.date_range("2024-01-01", periods=5, freq="D"), [1, 2, 3, 4, 5])
+    second = _ohlc(pd.date_range("2024-01-03", periods=3, freq="D"), [10, 20, 30])
+    a, b = align(first, second)
+    assert a.index[0] == pd.Timestamp("2024-01-03")
+    assert list(a["Close"]) == [3, 4, 5]
+    assert list(b["Close"]) == [10, 20, 30]
+
+
+def test_daily_bars_keep_their_date():
+    # Exchange-local daily bars meet UTC daily bars on the same calendar date
+    dates = ["2024-01-02", "2024-01-03"]
+    local = _ohlc(pd.DatetimeIndex(dates).tz_localize("America/New_York"), [2000, 2010])
+    utc = _ohlc(pd.DatetimeIndex(dates).tz_localize("UTC"), [40000, 40200])
+    bars = cross_ohlc(utc, local)
+    assert list(bars.index) == list(pd.DatetimeIndex(dates))
+    np.testing.assert_allclose(bars["Close"], [20.0, 20.0])
+
+
+def test_intraday_bars_meet_in_utc():
+    local = _ohlc(pd.date_range("2024-07-01 09:30", periods=3, freq="h", tz="America/New_York"), [1, 2, 4])
+    utc = _ohlc(pd.date_range("2024-07-01 13:30", periods=3, freq="h", tz="UTC"), [10, 20, 40])
+    bars = cross_ohlc(utc, local)
+    assert list(bars.index) == list(pd.date_range("2024-07-01 13:30", periods=3, freq="h"))
+    np.testing.assert_allclose(bars["Close"], [10.0, 10.0, 10.0])
+
+
+def test_missing_leg_raises():
+    with pytest.raises(ValueError):
+        cross_bars("BTC/XAU", {"BTC-USD": _ohlc(pd.date_range("2024-01-01", periods=2), [1, 2])}.get)
+
+
+def test_matrix_tick_rewrites_one_row_and_column():
+    matrix = CrossMatrix(["BTC", "XAU", "EUR", "JPY"])
+    matrix.seed({"BTC-USD": _ohlc(pd.date_range("2024-01-01", periods=1), [40000]),
+                 "XAUUSD=X": _ohlc(pd.date_range("2024-01-01", periods=1), [2000]),
+                 "EURUSD=X": _ohlc(pd.date_range("2024-01-01", periods=1), [1.1])})
+    assert matrix.on_quote("JPY=X", 150.0)
+    assert matrix.rate("USD", "JPY") == pytest.approx(150.0)
+    assert matrix.rate("EUR", "JPY") == pytest.approx(165.0)
+    assert matrix.rate("BTC", "XAU") == pytest.approx(20.0)
+
+    before = matrix.frame()
+    assert matrix.on_quote("XAUUSD=X", 2500.0)
+    after = matrix.frame()
+    changed = (after != before).to_numpy()
+    i = matrix.codes.index("XAU")
+    others = [j for j in range(len(matrix.codes)) if j != i]
+    assert not changed[np.ix_(others, others)].any()
+    assert changed[i, others].all() and changed[others, i].all()
+    assert matrix.rate("BTC", "XAU") == pytest.approx(16.0)
+    assert matrix.rate("XAU", "BTC") == pytest.approx(1 / 16.0)
+    np.testing.assert_allclose(after.to_numpy() * after.to_numpy().T, 1.0)
+
+
+def test_matrix_ignores_unknown_tickers():
+    matrix = CrossMatrix(["BTC"])
+    assert not matrix.on_quote("XAUUSD=X", 2000.0)
+    assert not matrix.on_quote("AAPL", 200.0)
+    assert np.isnan(matrix.rate("BTC", "USD"))
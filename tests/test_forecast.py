@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("statsmodels")
+
+import metrics
+from forecast import ForecastModels
+
+
+def _closes(n, freq, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(rng.standard_normal(n).cumsum() * 0.01)
+    return pd.DataFrame({"Close": close}, index=pd.date_range("2024-01-01", periods=n, freq=freq, name="Date"))
+
+
+def test_models_are_kept_per_symbol_and_interval(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    metrics.reset()
+    daily, hourly = _closes(200, "D", 1), _closes(300, "h", 2)
+    models = ForecastModels()
+
+    for _ in range(2):
+        models.results_for("BTC-USD", daily, "1d")
+        models.results_for("BTC-USD", hourly, "1h")
+    assert list(models.states) == [("BTC-USD", "1d"), ("BTC-USD", "1h")]
+    _, counts, _ = metrics.snapshot()
+    # Switching interval and back reuses each fit instead of refitting
+    assert counts["forecast.fit"] == 2
+    assert counts["forecast.hit"] == 2
+
+    # A new daily bar is appended to the daily model only
+    models.results_for("BTC-USD", _closes(201, "D", 1), "1d")
+    assert metrics.snapshot()[1]["forecast.append"] == 1
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import compute_atr, compute_atr_pandas, compute_rsi, compute_rsi_pandas
+
+# Wilder's 14-period RSI worked example (StockCharts ChartSchool, "Relative Strength Index")
+RSI_CLOSES = [
+    44.3389, 44.0902, 44.1497, 43.6124, 44.3278, 44.8264, 45.0955, 45.4245, 45.8433, 46.0826, 45.8931,
+    46.0328, 45.6140, 46.2820, 46.2820, 46.0028, 46.0328, 46.4116, 46.2222, 45.6439, 46.2122, 46.2521,
+    45.7137, 46.4515, 45.7835, 45.3548, 44.0288, 44.1783, 44.2181, 44.5672, 43.4205, 42.6628, 43.1314,
+]
+RSI_EXPECTED = [
+    70.53, 66.32, 66.55, 69.41, 66.36, 57.97, 62.93, 63.26, 56.06, 62.38,
+    54.71, 50.42, 39.99, 41.46, 41.87, 45.46, 37.30, 33.08, 37.77,
+]
+
+# Bars of the StockCharts "Average True Range" worked example
+ATR_BARS = pd.DataFrame({
+    "High": [48.70, 48.72, 48.90, 48.87, 48.82, 49.05, 49.20, 49.35, 49.92, 50.19, 50.12, 49.66, 49.88, 50.19,
+             50.36, 50.57, 50.65, 50.43, 49.63, 50.33, 50.29, 50.17, 49.32, 48.50, 48.32, 46.80, 47.80, 48.39,
+             48.66, 48.79],
+    "Low": [47.79, 48.14, 48.39, 48.37, 48.24, 48.64, 48.94, 48.86, 49.50, 49.87, 49.20, 48.90, 49.43, 49.73,
+            49.26, 50.09, 50.30, 49.21, 48.98, 49.61, 49.20, 49.43, 48.08, 47.64, 41.55, 44.28, 47.31, 47.20,
+            47.90, 47.73],
+    "Close": [48.16, 48.61, 48.75, 48.63, 48.74, 49.03, 49.07, 49.32, 49.91, 50.13, 49.53, 49.50, 49.75, 50.03,
+              50.31, 50.52, 50.41, 49.34, 49.37, 50.23, 49.24, 49.93, 48.43, 48.18, 46.57, 45.41, 47.77, 47.72,
+              48.62, 47.85],
+})
+
+
+# Wilder's definition written out bar by bar: true ranges from the second bar
+# (each needs the previous close), seeded with their plain mean, then
+# ATR = (previous ATR * (n - 1) + TR) / n
+def wilder_atr_reference(data, period):
+    high, low, close = (data[column].tolist() for column in ("High", "Low", "Close"))
+    ranges = [max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+              for i in range(1, len(close))]
+    out = [np.nan] * len(close)
+    atr = sum(ranges[:period]) / period
+    out[period] = atr
+    for i in range(period + 1, len(close)):
+        atr = (atr * (period - 1) + ranges[i - 1]) / period
+        out[i] = atr
+    return out
+
+
+def test_wilder_rsi_matches_the_published_example():
+    rsi = compute_rsi(pd.Series(RSI_CLOSES), 14, "wilder")
+    assert rsi.iloc[:14].isna().all()
+    np.testing.assert_allclose(rsi.iloc[14:].to_numpy(), RSI_EXPECTED, atol=0.005)
+
+
+def test_wilder_atr_matches_the_definition():
+    atr = compute_atr(ATR_BARS, 14, "wilder")
+    expected = wilder_atr_reference(ATR_BARS, 14)
+    np.testing.assert_allclose(atr.to_numpy(), expected, rtol=1e-12, equal_nan=True)
+    assert atr.iloc[:14].isna().all()
+
+
+def test_wilder_skips_gaps():
+    closes = pd.Series(RSI_CLOSES)
+    gapped = closes.copy()
+    gapped.iloc[[5, 20]] = np.nan
+    rsi = compute_rsi(gapped, 14, "wilder")
+    expected = compute_rsi(gapped.dropna(), 14, "wilder")
+    pd.testing.assert_series_equal(rsi.dropna(), expected.dropna())
+    assert rsi.iloc[[5, 20]].isna().all()
+
+
+@pytest.mark.parametrize("period", [5, 14])
+def test_sma_kernels_match_the_pandas_reference(period):
+    rng = np.random.default_rng(19)
+    close = 100 + rng.standard_normal(500).cumsum()
+    data = pd.DataFrame({"High": close + rng.random(500), "Low": close - rng.random(500), "Close": close})
+    np.testing.assert_allclose(compute_rsi(data["Close"], period).to_numpy(),
+                               compute_rsi_pandas(data["Close"], period).to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(compute_atr(data, period).to_numpy(),
+                               compute_atr_pandas(data, period).to_numpy(), rtol=1e-9, equal_nan=True)
@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import live
+from live import BarAggregator, LivePipeline, pipeline_for, read_quotes, replay
+from strategies import STRATEGIES
+
+
+def _history(n=300, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum() * 0.05
+    index = pd.date_range("2024-01-01", periods=n, freq="min", name="Date")
+    return pd.DataFrame({"Open": close, "High": close + 0.03, "Low": close - 0.03, "Close": close}, index=index)
+
+
+# Recorded stream: quotes every 1-20 s after the last history bar, as `live.py --record` writes them
+@pytest.fixture
+def recording(tmp_path):
+    history = _history()
+    rng = np.random.default_rng(7)
+    ts, price = history.index[-1] + pd.Timedelta("10s"), float(history["Close"].iloc[-1])
+    path = tmp_path / "quotes.jsonl"
+    with open(path, "w") as f:
+        for _ in range(300):
+            ts += pd.Timedelta(seconds=int(rng.integers(1, 20)))
+            price += float(rng.standard_normal()) * 0.02
+            f.write(json.dumps({"time": ts.isoformat(), "price": price}) + "\n")
+    return history, str(path)
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_replay_matches_the_frame_strategy(recording, strategy):
+    history, path = recording
+    results = replay(path, LivePipeline(strategy, "1m", history))
+    assert len(results) == 300
+
+    # Reference: the frame strategy on history + closed bars + the forming bar
+    aggregator = BarAggregator("1m")
+    last = history.iloc[-1]
+    aggregator.start(history.index[-1], last["Open"], last["High"], last["Low"], last["Close"])
+    closed = []
+    for i, (ts, price) in enumerate(read_quotes(path)):
+        bar = aggregator.update(ts, price)
+        if bar is not None:
+            closed.append(bar)
+        if i % 29:
+            continue
+        bars = pd.DataFrame(closed + [aggregator.bar]).set_index("Start")
+        frame = pd.concat([history.iloc[:-1], bars[["Open", "High", "Low", "Close"]]])
+        expected = STRATEGIES[strategy](frame.copy())
+        assert tuple(results.iloc[i][["Signal", "Target Price", "Stop Loss"]]) == expected
+
+
+def test_pipeline_is_reseeded_when_the_history_changes(monkeypatch):
+    monkeypatch.setattr(live, "_pipelines", {})
+    history = _history()
+
+    first = pipeline_for("BTC-USD", "intraday", "1m", history)
+    assert pipeline_for("BTC-USD", "intraday", "1m", history.copy()) is first
+    # Another days window
+    assert pipeline_for("BTC-USD", "intraday", "1m", history.iloc[60:]) is not first
+    # A new bar from the cache
+    longer = _history(301)
+    reseeded = pipeline_for("BTC-USD", "intraday", "1m", longer)
+    assert reseeded.aggregator.bar["Start"] == longer.index[-1]
@@ -0,0 +1,72 @@
+import pytest
+
+import metrics
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(metrics.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(metrics, "REQUEST_LEASE", 60.0)
+    monkeypatch.setattr(metrics, "_requests", {})
+    monkeypatch.setattr(metrics, "_forced", False)
+    monkeypatch.setattr(metrics, "_enabled", False)
+    monkeypatch.setattr(metrics, "_next_expiry", float("inf"))
+    metrics.reset()
+    return now
+
+
+def test_request_is_shared_between_callers(clock):
+    metrics.request("a")
+    metrics.request("b")
+    metrics.request("a", False)
+    assert metrics.enabled()
+    metrics.request("b", False)
+    assert not metrics.enabled()
+
+
+def test_request_lapses_without_renewal(clock):
+    metrics.request("a")
+    metrics.count("event")
+    clock[0] += 61
+    metrics.count("event")
+    with metrics.span("stage"):
+        pass
+    assert not metrics.enabled()
+    rows, counts, _ = metrics.snapshot()
+    assert counts == {"event": 1} and rows == []
+
+
+def test_rerun_renews_the_lease(clock):
+    metrics.request("a")
+    for _ in range(5):
+        clock[0] += 50
+        metrics.request("a")
+    metrics.count("event")
+    assert metrics.snapshot()[1] == {"event": 1}
+
+
+def test_lapsed_caller_does_not_hold_another_on(clock):
+    metrics.request("closed")
+    clock[0] += 30
+    metrics.request("open")
+    clock[0] += 40
+    assert metrics.enabled()
+    assert list(metrics._requests) == ["open"]
+    metrics.request("open", False)
+    assert not metrics.enabled()
+
+
+def test_enable_outlasts_leases(clock):
+    metrics.enable()
+    metrics.request("a")
+    clock[0] += 120
+
+    @metrics.timed("stage")
+    def stage():
+        return 1
+
+    assert stage() == 1
+    assert metrics.snapshot()[0][0]["Calls"] == 1
+    metrics.enable(False)
+    assert not metrics.enabled()
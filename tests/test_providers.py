@@ -0,0 +1,75 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import providers
+from providers import ProviderError, Source, failover
+
+
+def _bars(close):
+    return pd.DataFrame({"Close": [close]}, index=pd.DatetimeIndex(["2024-01-02"], name="Date"))
+
+
+def test_fetch_history_never_substitutes_another_ticker(monkeypatch):
+    calls = []
+
+    def fetch(symbol, start, end, interval):
+        calls.append(symbol)
+        return pd.DataFrame() if symbol == "GC=F" else _bars(2000.0)
+
+    monkeypatch.setattr(providers, "yahoo", Source("yahoo", fetch, retries=0, mode="live"))
+    frame = providers.fetch_history("GC=F", "2024-01-01", "2024-01-03")
+    assert frame.empty
+    assert calls == ["GC=F"]
+
+
+def test_failover_returns_empty_answer_when_no_source_failed():
+    empty = Source("empty", lambda: pd.DataFrame(), mode="live")
+    assert failover([(empty, (), None), (empty, (), None)]).empty
+
+
+def test_failover_raises_when_a_source_failed_and_none_had_data():
+    def broken():
+        raise ConnectionError("down")
+
+    empty = Source("empty", lambda: pd.DataFrame(), mode="live")
+    failing = Source("broken", broken, retries=0, mode="live")
+    with pytest.raises(ProviderError):
+        failover([(failing, (), None), (empty, (), None)])
+
+
+def test_timed_out_call_is_not_retried_and_in_flight_calls_are_capped():
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return _bars(1.0)
+
+    source = Source("slow", slow, timeout=0.05, retries=3, backoff=0, mode="live", max_in_flight=2)
+    try:
+        for _ in range(3):
+            with pytest.raises(ProviderError):
+                source()
+        # Two calls hold both slots; the third is refused rather than queued
+        assert len(calls) == 2
+    finally:
+        release.set()
+
+
+def test_concurrent_recordings_merge_into_one_tape(tmp_path):
+    tape = providers.Tape(str(tmp_path))
+    index = pd.date_range("2024-01-01", periods=40, freq="D", name="Date")
+    frames = [pd.DataFrame({"Close": float(i)}, index=index[i * 5:(i + 1) * 5]) for i in range(8)]
+    threads = [threading.Thread(target=tape.save, args=("yahoo", ("history", "GC=F", "1d"), frame))
+               for frame in frames]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    recorded = tape.load("yahoo", ("history", "GC=F", "1d"))
+    assert recorded.index.equals(index)
+    assert not [path for path in tmp_path.rglob("*.tmp")]
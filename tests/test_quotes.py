@@ -0,0 +1,132 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from quotes import QuoteGateway, RateLimited, RateLimiter
+
+PRICES = {"bitcoin": 65000.0, "ethereum": 3200.0}
+
+
+# Local CoinGecko / Alpha Vantage stand-in; `delay` slows every response down
+class StubServer:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                stub.requests.append((url.path, query))
+                time.sleep(stub.delay)
+                if url.path.endswith("/simple/price"):
+                    ids = query["ids"].split(",")
+                    body = {coin_id: {"usd": PRICES[coin_id]} for coin_id in ids if coin_id in PRICES}
+                else:
+                    body = {"Realtime Currency Exchange Rate": {"5. Exchange Rate": "2350.5"}}
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server():
+    stub = StubServer()
+    yield stub
+    stub.close()
+
+
+def _gateway(server, **kwargs):
+    kwargs.setdefault("coingecko_per_minute", 6000)
+    kwargs.setdefault("alpha_vantage_per_minute", 6000)
+    return QuoteGateway(coingecko_url=server.url, alpha_vantage_url=server.url + "/query", **kwargs)
+
+
+def test_concurrent_requests_share_one_call_and_the_cache(server):
+    gateway = _gateway(server, api_key="demo")
+
+    async def run():
+        first = await asyncio.gather(*[gateway.get_price("bitcoin") for _ in range(10)])
+        again = await gateway.get_price("BITCOIN")
+        return first, again
+
+    server.delay = 0.1
+    first, again = asyncio.run(run())
+    assert first == [65000.0] * 10
+    assert again == 65000.0
+    assert len(server.requests) == 1
+
+
+def test_batch_asks_only_for_ids_not_cached(server):
+    gateway = _gateway(server)
+
+    async def run():
+        await gateway.get_price("bitcoin")
+        return await gateway.get_prices(["bitcoin", "ethereum", "dogecoin"])
+
+    assert asyncio.run(run()) == {"bitcoin": 65000.0, "ethereum": 3200.0, "dogecoin": None}
+    assert server.requests[-1][1]["ids"] == "ethereum,dogecoin"
+
+
+def test_cancelled_owner_does_not_strand_waiting_callers(server):
+    gateway = _gateway(server, api_key="demo")
+    server.delay = 0.2
+
+    async def run():
+        owner = asyncio.ensure_future(gateway.get_price("bitcoin"))
+        owner_rate = asyncio.ensure_future(gateway.get_exchange_rate("XAU", "USD"))
+        await asyncio.sleep(0.05)
+        followers = asyncio.gather(gateway.get_price("bitcoin"), gateway.get_exchange_rate("XAU", "USD"))
+        await asyncio.sleep(0.05)
+        owner.cancel()
+        owner_rate.cancel()
+        return await asyncio.wait_for(followers, 5)
+
+    assert asyncio.run(run()) == [65000.0, 2350.5]
+    assert not gateway.in_flight
+
+
+def test_alpha_vantage_key_comes_from_the_environment(server):
+    gateway = _gateway(server, api_key=None)
+    with pytest.raises(RuntimeError, match="ALPHA_VANTAGE_API_KEY"):
+        asyncio.run(gateway.get_exchange_rate("XAU", "USD"))
+    assert not server.requests
+
+    gateway = _gateway(server, api_key="demo")
+    assert asyncio.run(gateway.get_exchange_rate("XAU", "USD")) == 2350.5
+    assert server.requests[-1][1]["apikey"] == "demo"
+
+
+def test_rate_limiter_refuses_slots_beyond_max_wait():
+    limiter = RateLimiter(per_minute=60, max_wait=1.5)
+
+    async def run():
+        start = time.monotonic()
+        results = await asyncio.gather(*[limiter.wait() for _ in range(3)], return_exceptions=True)
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(run())
+    assert results[:2] == [None, None]
+    assert isinstance(results[2], RateLimited)
+    # The refused caller failed at once instead of sleeping first
+    assert elapsed < 1.5
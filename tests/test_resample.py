@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from resample import MultiTimeframe, max_days, resample_ohlcv
+
+
+def _bars(start, periods, freq="5min", tz="America/New_York", seed=15):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(periods).cumsum()
+    spread = rng.random(periods) + 0.1
+    index = pd.date_range(start, periods=periods, freq=freq, tz=tz)
+    return pd.DataFrame({"Open": close + rng.standard_normal(periods) * 0.1, "High": close + spread,
+                         "Low": close - spread, "Close": close,
+                         "Volume": rng.integers(1, 1000, periods).astype(float)}, index=index)
+
+
+def _pandas(bars, interval):
+    freq = {"15m": "15min", "1h": "1h", "1d": "1D"}[interval]
+    frame = bars.resample(freq).agg({"Open": "first", "High": "max", "Low": "min",
+                                     "Close": "last", "Volume": "sum"})
+    return frame[frame["Close"].notna()]
+
+
+# Spring forward (no 02:00 hour) and fall back (01:00 twice) in New York
+@pytest.mark.parametrize("start", ["2024-03-09 20:00", "2024-11-02 20:00"])
+@pytest.mark.parametrize("interval", ["15m", "1h", "1d"])
+def test_matches_pandas_across_dst(start, interval):
+    bars = _bars(start, 12 * 30)
+    pd.testing.assert_frame_equal(resample_ohlcv(bars, interval), _pandas(bars, interval), check_freq=False)
+
+
+def test_fall_back_keeps_the_repeated_hour_apart():
+    hourly = resample_ohlcv(_bars("2024-11-03 00:00", 12 * 4), "1h")
+    assert len(hourly) == 4
+    assert list(hourly["Volume"].index.hour) == [0, 1, 1, 2]
+
+
+@pytest.mark.parametrize("start", ["2024-03-09 20:00", "2024-11-02 20:00"])
+def test_incremental_updates_match_a_full_resample(start):
+    bars = _bars(start, 12 * 30)
+    # Overlapping windows; each ends mid-hour so its last buckets are partial,
+    # and the next revises the last bar it already had
+    stops = [7, 50, 51, 133, 200, 287, len(bars)]
+    frames = MultiTimeframe("5m", ("15m", "1h", "1d"))
+    begin = 0
+    for stop in stops:
+        window = bars.iloc[begin:stop].copy()
+        if begin:
+            window.iloc[0, window.columns.get_loc("Close")] += 0.5
+            bars.iloc[begin, bars.columns.get_loc("Close")] += 0.5
+        frames.update(window)
+        for interval in ("15m", "1h", "1d"):
+            pd.testing.assert_frame_equal(frames.get(interval), resample_ohlcv(bars.iloc[:stop], interval))
+        begin = stop - 1
+
+
+def test_partial_last_bucket_is_completed():
+    bars = _bars("2024-03-11 09:30", 20, tz=None)
+    frames = MultiTimeframe("5m", ("1h",))
+    frames.update(bars.iloc[:8])
+    partial = frames.get("1h")
+    assert partial["Volume"].iloc[-1] == bars["Volume"].iloc[6:8].sum()
+    frames.update(bars.iloc[7:])
+    hourly = frames.get("1h")
+    assert hourly["Volume"].iloc[1] == bars["Volume"].iloc[6:18].sum()
+    assert hourly["Close"].iloc[1] == bars["Close"].iloc[17]
+    pd.testing.assert_frame_equal(hourly, resample_ohlcv(bars, "1h"))
+
+
+@pytest.mark.parametrize("interval, days", [("1m", 7), ("2m", 7), ("5m", 60), ("15m", 60), ("30m", 60),
+                                             ("1h", 730), ("60m", 730), ("1d", None)])
+def test_max_days(interval, days):
+    assert max_days(interval) == days
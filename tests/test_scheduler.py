@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from alerts import AlertBus
+from scheduler import Scheduler
+from strategies import PROFILES
+
+
+def _bars():
+    return pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1.0},
+                        index=pd.date_range("2024-01-01", periods=3))
+
+
+@pytest.fixture
+def scheduler():
+    fetches = []
+
+    def fetch(symbol, start, end, interval):
+        fetches.append((symbol, interval))
+        return _bars()
+
+    bus = AlertBus(confirm=1)
+    events = []
+    bus.subscribe(events.append)
+    scheduler = Scheduler(fetch=fetch, on_result=bus.publish)
+    # Ticked by hand below rather than from the background thread
+    scheduler._thread = object()
+    return scheduler, fetches, events
+
+
+def _strategy(signals):
+    return lambda data: (signals.pop(0), 1.0, 1.0)
+
+
+# gold.py and app.py both call their first strategy "Intraday", with different rules
+def test_same_label_on_two_pages_stays_apart(scheduler):
+    scheduler, fetches, events = scheduler
+    gold = PROFILES["gold"]["Intraday"]
+    default = PROFILES["default"]["Intraday"]
+    scheduler.subscribe("GC=F", gold, _strategy(["Buy", "Sell"]))
+    scheduler.subscribe("GC=F", default, _strategy(["Hold", "Hold"]))
+
+    scheduler.tick()
+    assert scheduler.get_latest("GC=F", gold)[0] == "Buy"
+    assert scheduler.get_latest("GC=F", default)[0] == "Hold"
+
+    scheduler.tick()
+    assert scheduler.get_latest("GC=F", gold)[0] == "Sell"
+    assert scheduler.get_latest("GC=F", default)[0] == "Hold"
+    # One fetch per symbol and tick; one debounced transition, the gold rule's
+    assert fetches == [("GC=F", "1d")] * 2
+    assert [(e["Strategy"], e["From"], e["To"]) for e in events] == [(gold, "Buy", "Sell")]
+
+
+def test_sessions_on_one_strategy_share_a_result(scheduler):
+    scheduler, fetches, events = scheduler
+    calls = []
+
+    def strategy(data):
+        calls.append(1)
+        return "Buy", 1.0, 1.0
+
+    received = []
+    first = scheduler.subscribe("GC=F", "gold_intraday", strategy, callback=lambda *args: received.append(args))
+    second = scheduler.subscribe("GC=F", "gold_intraday", strategy, callback=lambda *args: received.append(args))
+    assert first != second
+
+    scheduler.tick()
+    assert len(calls) == 1
+    assert [args[:3] for args in received] == [("GC=F", "gold_intraday", "1d")] * 2
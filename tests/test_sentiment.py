@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from sentiment import sentiment_series
+
+
+def _scored(rows):
+    return pd.DataFrame({
+        "Symbol": [symbol for symbol, _, _ in rows],
+        "Time": pd.to_datetime([time for _, time, _ in rows], utc=True),
+        "Score": [score for _, _, score in rows],
+    })
+
+
+def test_headlines_before_the_window_are_left_out():
+    index = pd.date_range("2024-03-01", periods=5, freq="D")
+    scored = _scored([
+        ("GC=F", "2023-06-01 12:00", -0.9),
+        ("GC=F", "2023-12-31 12:00", -0.9),
+        ("GC=F", "2024-03-01 10:00", 0.4),
+        ("GC=F", "2024-03-03 09:00", 0.6),
+        ("GC=F", "2024-03-03 18:00", 0.8),
+        ("BTC-USD", "2024-03-02 10:00", -0.5),
+        ("GC=F", "2024-03-09 10:00", 0.8),
+    ])
+    series = sentiment_series(scored, "GC=F", index)
+    assert series["Headlines"].tolist() == [1, 0, 2, 0, 0]
+    assert series["Sentiment"].iloc[0] == 0.4
+    assert series["Sentiment"].iloc[1] == 0.4
+    # EMA (span 3, alpha 0.5) towards the day's mean 0.7, carried forward after it
+    assert np.isclose(series["Sentiment"].iloc[2], 0.55)
+    assert np.isclose(series["Sentiment"].iloc[-1], 0.55)
+
+
+def test_weekend_headline_goes_to_the_next_bar():
+    index = pd.DatetimeIndex(["2024-03-01", "2024-03-04"])  # Friday, Monday
+    scored = _scored([("GC=F", "2024-03-02 15:00", 0.5), ("GC=F", "2024-02-29 15:00", -0.5)])
+    series = sentiment_series(scored, "GC=F", index)
+    assert series["Headlines"].tolist() == [0, 1]
+    assert np.isnan(series["Sentiment"].iloc[0])
+    assert series["Sentiment"].iloc[1] == 0.5
+
+
+def test_empty_window():
+    series = sentiment_series(_scored([("GC=F", "2024-03-01", 0.5)]), "GC=F", pd.DatetimeIndex([]))
+    assert series.empty
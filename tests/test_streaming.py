@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import compute_atr, compute_rsi, ema
+from streaming import ATR, EMA, RSI, StreamingIndicators
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(3)
+    close = 100 + rng.standard_normal(500).cumsum()
+    spread = rng.random(500) + 0.1
+    return pd.DataFrame({"High": close + spread, "Low": close - spread, "Close": close},
+                        index=pd.date_range("2024-01-01", periods=500, freq="h"))
+
+
+@pytest.mark.parametrize("span", [3, 10, 200])
+def test_ema_matches_pandas(bars, span):
+    stream = EMA(span)
+    values = [stream.update(x) for x in bars["Close"]]
+    np.testing.assert_allclose(values, ema(bars["Close"], span).to_numpy(), rtol=1e-10)
+
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+@pytest.mark.parametrize("period", [5, 14])
+def test_rsi_and_atr_match_indicators(bars, smoothing, period):
+    rsi, atr = RSI(period, smoothing), ATR(period, smoothing)
+    rsi_values = [rsi.update(close) for close in bars["Close"]]
+    atr_values = [atr.update(high, low, close) for high, low, close in bars[["High", "Low", "Close"]].to_numpy()]
+    np.testing.assert_allclose(rsi_values, compute_rsi(bars["Close"], period, smoothing).to_numpy(),
+                               rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(atr_values, compute_atr(bars, period, smoothing).to_numpy(),
+                               rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+def test_peek_is_the_next_update_without_changing_state(bars, smoothing):
+    stream = StreamingIndicators(ema_spans=(3, 30), smoothing=smoothing)
+    stream.update_frame(bars.iloc[:-1])
+    before = stream.values()
+    last = bars.iloc[-1]
+    peeked = stream.peek(last["High"], last["Low"], last["Close"])
+    assert stream.values() == before
+
+    full = bars.copy()
+    expected = {
+        "EMA_3": ema(full["Close"], 3).iloc[-1], "EMA_30": ema(full["Close"], 30).iloc[-1],
+        "RSI": compute_rsi(full["Close"], 14, smoothing).iloc[-1],
+        "ATR": compute_atr(full, 14, smoothing).iloc[-1], "Close": last["Close"],
+    }
+    for name, value in expected.items():
+        assert peeked[name] == pytest.approx(value, rel=1e-9)
+    assert stream.update(last["High"], last["Low"], last["Close"]) == pytest.approx(peeked, rel=1e-12)
+
+
+def test_update_frame_only_processes_new_bars(bars):
+    stream = StreamingIndicators(ema_spans=(10,))
+    stream.update_frame(bars.iloc[:300])
+    # Overlapping refresh: bars already seen are skipped
+    values = stream.update_frame(bars.iloc[250:])
+    assert values["EMA_10"] == pytest.approx(ema(bars["Close"], 10).iloc[-1], rel=1e-10)
+    assert values["RSI"] == pytest.approx(compute_rsi(bars["Close"], 14).iloc[-1], rel=1e-9)